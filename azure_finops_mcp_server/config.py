@@ -4,14 +4,55 @@ import json
 import logging
 import os
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from functools import cached_property, lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+def _csv_list(value: str) -> Optional[List[str]]:
+    """Parse a comma-separated environment value; empty means unset."""
+    return [item.strip() for item in value.split(",")] if value else None
+
+
+def _env_bool(value: str) -> bool:
+    """Parse a boolean environment value."""
+    return value.lower() == "true"
+
+
+# (environment variable, config attribute, parser); unset variables keep the dataclass default
+_ENV_SPEC: Tuple[Tuple[str, str, Callable[[str], Any]], ...] = (
+    # Azure settings
+    ("AZURE_SUBSCRIPTION_ID", "subscription_id", str),
+    ("AZURE_SUBSCRIPTION_IDS", "subscription_ids", _csv_list),
+    ("AZURE_RESOURCE_GROUP_PATTERNS", "resource_group_patterns", _csv_list),
+    ("AZURE_DEFAULT_REGIONS", "default_regions", _csv_list),
+    # Performance settings
+    ("AZURE_MAX_WORKERS", "max_parallel_workers", int),
+    ("AZURE_REQUEST_TIMEOUT", "request_timeout", int),
+    ("AZURE_CACHE_TTL", "cache_ttl_seconds", int),
+    ("AZURE_ENABLE_CACHE", "enable_caching", _env_bool),
+    ("AZURE_FINOPS_SUB_CACHE_TTL", "subscription_cache_ttl_seconds", int),
+    ("AZURE_FINOPS_SUB_CACHE_FILE", "subscription_cache_file", str),
+    # API settings
+    ("AZURE_MANAGEMENT_URL", "azure_management_url", str),
+    ("AZURE_FINOPS_USE_RESOURCE_GRAPH", "use_resource_graph", _env_bool),
+    # Retry settings
+    ("AZURE_MAX_RETRIES", "max_retries", int),
+    # Logging settings
+    ("AZURE_LOG_LEVEL", "log_level", str),
+    ("AZURE_DETAILED_LOGGING", "enable_detailed_logging", _env_bool),
+)
+
+
+@dataclass(frozen=True)
 class AzureFinOpsConfig:
-    """Configuration settings for Azure FinOps MCP Server."""
+    """
+    Configuration settings for Azure FinOps MCP Server.
+
+    Instances are immutable, so the serialized form and the validation
+    result are computed once and cached on the instance.
+    """
 
     # Azure settings
     subscription_id: Optional[str] = None
@@ -24,10 +65,13 @@ class AzureFinOpsConfig:
     request_timeout: int = 30
     cache_ttl_seconds: int = 300
     enable_caching: bool = True
+    subscription_cache_ttl_seconds: int = 3600  # `az account list` output, 0 disables
+    subscription_cache_file: str = "~/.cache/azure_finops_mcp/subscriptions.json"
 
     # API settings
     azure_management_url: str = "https://management.azure.com"
     api_version: str = "2023-03-01"
+    use_resource_graph: bool = True  # Bulk-query audits via Azure Resource Graph when the SDK is installed
 
     # Retry settings
     max_retries: int = 3
@@ -58,71 +102,91 @@ class AzureFinOpsConfig:
     hours_per_month: float = 730  # Standard hours per month
 
     def __post_init__(self):
-        """Initialize default values for complex fields."""
+        """Initialize default values for complex fields (bypassing the frozen ``__setattr__``)."""
         if self.disk_cost_rates is None:
-            self.disk_cost_rates = {
-                "standard_hdd": 0.05,  # per GB/month
-                "standard_ssd": 0.12,  # per GB/month
-                "premium_ssd": 0.18,  # per GB/month
-                "ultra_disk": 0.35,  # per GB/month
-            }
+            object.__setattr__(
+                self,
+                "disk_cost_rates",
+                {
+                    "standard_hdd": 0.05,  # per GB/month
+                    "standard_ssd": 0.12,  # per GB/month
+                    "premium_ssd": 0.18,  # per GB/month
+                    "ultra_disk": 0.35,  # per GB/month
+                },
+            )
 
         if self.public_ip_cost_rates is None:
-            self.public_ip_cost_rates = {
-                "basic_static": 3.65,  # per IP/month
-                "basic_dynamic": 2.88,  # per IP/month
-                "standard_static": 4.38,  # per IP/month
-                "standard_dynamic": 3.65,  # per IP/month
-            }
+            object.__setattr__(
+                self,
+                "public_ip_cost_rates",
+                {
+                    "basic_static": 3.65,  # per IP/month
+                    "basic_dynamic": 2.88,  # per IP/month
+                    "standard_static": 4.38,  # per IP/month
+                    "standard_dynamic": 3.65,  # per IP/month
+                },
+            )
 
         if self.vm_cost_rates is None:
             # Sample VM cost rates (per hour)
-            self.vm_cost_rates = {
-                # B-series (Burstable)
-                "Standard_B1s": 0.0104,
-                "Standard_B1ms": 0.0207,
-                "Standard_B2s": 0.0416,
-                "Standard_B2ms": 0.0832,
-                "Standard_B4ms": 0.166,
-                "Standard_B8ms": 0.333,
-                # D-series (General Purpose)
-                "Standard_D2s_v3": 0.096,
-                "Standard_D4s_v3": 0.192,
-                "Standard_D8s_v3": 0.384,
-                "Standard_D16s_v3": 0.768,
-                "Standard_D32s_v3": 1.536,
-                "Standard_D64s_v3": 3.072,
-                # E-series (Memory Optimized)
-                "Standard_E2s_v3": 0.126,
-                "Standard_E4s_v3": 0.252,
-                "Standard_E8s_v3": 0.504,
-                "Standard_E16s_v3": 1.008,
-                "Standard_E32s_v3": 2.016,
-                "Standard_E64s_v3": 4.032,
-                # F-series (Compute Optimized)
-                "Standard_F2s_v2": 0.085,
-                "Standard_F4s_v2": 0.169,
-                "Standard_F8s_v2": 0.338,
-                "Standard_F16s_v2": 0.677,
-                "Standard_F32s_v2": 1.353,
-                "Standard_F64s_v2": 2.706,
-                # Default for unknown sizes
-                "default": 0.10,
-            }
+            object.__setattr__(
+                self,
+                "vm_cost_rates",
+                {
+                    # B-series (Burstable)
+                    "Standard_B1s": 0.0104,
+                    "Standard_B1ms": 0.0207,
+                    "Standard_B2s": 0.0416,
+                    "Standard_B2ms": 0.0832,
+                    "Standard_B4ms": 0.166,
+                    "Standard_B8ms": 0.333,
+                    # D-series (General Purpose)
+                    "Standard_D2s_v3": 0.096,
+                    "Standard_D4s_v3": 0.192,
+                    "Standard_D8s_v3": 0.384,
+                    "Standard_D16s_v3": 0.768,
+                    "Standard_D32s_v3": 1.536,
+                    "Standard_D64s_v3": 3.072,
+                    # E-series (Memory Optimized)
+                    "Standard_E2s_v3": 0.126,
+                    "Standard_E4s_v3": 0.252,
+                    "Standard_E8s_v3": 0.504,
+                    "Standard_E16s_v3": 1.008,
+                    "Standard_E32s_v3": 2.016,
+                    "Standard_E64s_v3": 4.032,
+                    # F-series (Compute Optimized)
+                    "Standard_F2s_v2": 0.085,
+                    "Standard_F4s_v2": 0.169,
+                    "Standard_F8s_v2": 0.338,
+                    "Standard_F16s_v2": 0.677,
+                    "Standard_F32s_v2": 1.353,
+                    "Standard_F64s_v2": 2.706,
+                    # Default for unknown sizes
+                    "default": 0.10,
+                },
+            )
 
         if self.orphaned_disk_patterns is None:
-            self.orphaned_disk_patterns = [
-                "pvc-",  # Kubernetes Persistent Volume Claims
-                "osdisk-",  # Common orphaned OS disk pattern
-                "datadisk-",  # Common orphaned data disk pattern
-            ]
+            object.__setattr__(
+                self,
+                "orphaned_disk_patterns",
+                [
+                    "pvc-",  # Kubernetes Persistent Volume Claims
+                    "osdisk-",  # Common orphaned OS disk pattern
+                    "datadisk-",  # Common orphaned data disk pattern
+                ],
+            )
 
         if self.managed_resource_group_patterns is None:
-            self.managed_resource_group_patterns = [
-                "MC_",  # AKS managed resource groups
-                "mrg-",  # Managed resource group pattern
-                "databricks-rg-",  # Databricks managed RGs
-            ]
+            object.__setattr__(
+                self,
+                "managed_resource_group_patterns",
+                [
+                    "MC_",  # AKS managed resource groups
+                    "mrg-",  # Managed resource group pattern
+                    "databricks-rg-",  # Databricks managed RGs
+                ],
+            )
 
     @classmethod
     def from_environment(cls) -> "AzureFinOpsConfig":
@@ -138,44 +202,19 @@ class AzureFinOpsConfig:
         - AZURE_REQUEST_TIMEOUT: Request timeout in seconds (default: 30)
         - AZURE_CACHE_TTL: Cache TTL in seconds (default: 300)
         - AZURE_ENABLE_CACHE: Enable caching (default: true)
+        - AZURE_FINOPS_SUB_CACHE_TTL: Subscription list cache TTL in seconds (default: 3600, 0 disables)
+        - AZURE_FINOPS_SUB_CACHE_FILE: Subscription list cache file
         - AZURE_MANAGEMENT_URL: Azure management endpoint
+        - AZURE_FINOPS_USE_RESOURCE_GRAPH: Audit resources with Azure Resource Graph queries (default: true)
         - AZURE_MAX_RETRIES: Maximum retry attempts (default: 3)
         - AZURE_LOG_LEVEL: Logging level (default: INFO)
+        - AZURE_DETAILED_LOGGING: Enable detailed logging (default: false)
         """
-        config = cls()
-
-        # Azure settings
-        config.subscription_id = os.environ.get("AZURE_SUBSCRIPTION_ID")
-
-        subscription_ids_str = os.environ.get("AZURE_SUBSCRIPTION_IDS")
-        if subscription_ids_str:
-            config.subscription_ids = [sid.strip() for sid in subscription_ids_str.split(",")]
-
-        rg_patterns_str = os.environ.get("AZURE_RESOURCE_GROUP_PATTERNS")
-        if rg_patterns_str:
-            config.resource_group_patterns = [pattern.strip() for pattern in rg_patterns_str.split(",")]
-
-        regions_str = os.environ.get("AZURE_DEFAULT_REGIONS")
-        if regions_str:
-            config.default_regions = [region.strip() for region in regions_str.split(",")]
-
-        # Performance settings
-        config.max_parallel_workers = int(os.environ.get("AZURE_MAX_WORKERS", "5"))
-        config.request_timeout = int(os.environ.get("AZURE_REQUEST_TIMEOUT", "30"))
-        config.cache_ttl_seconds = int(os.environ.get("AZURE_CACHE_TTL", "300"))
-        config.enable_caching = os.environ.get("AZURE_ENABLE_CACHE", "true").lower() == "true"
-
-        # API settings
-        config.azure_management_url = os.environ.get("AZURE_MANAGEMENT_URL", "https://management.azure.com")
-
-        # Retry settings
-        config.max_retries = int(os.environ.get("AZURE_MAX_RETRIES", "3"))
-
-        # Logging settings
-        config.log_level = os.environ.get("AZURE_LOG_LEVEL", "INFO")
-        config.enable_detailed_logging = os.environ.get("AZURE_DETAILED_LOGGING", "false").lower() == "true"
-
-        return config
+        # Bound locally and read with a single get() per variable; os.environ
+        # re-encodes the key on every membership test and item access
+        get_env = os.environ.get
+        kwargs = {attr: parser(value) for name, attr, parser in _ENV_SPEC if (value := get_env(name)) is not None}
+        return cls(**kwargs)
 
     @classmethod
     def from_file(cls, config_file: str) -> "AzureFinOpsConfig":
@@ -193,12 +232,13 @@ class AzureFinOpsConfig:
 
         return cls(**config_data)
 
-    def validate(self) -> List[str]:
+    @cached_property
+    def validation_errors(self) -> Tuple[str, ...]:
         """
-        Validate configuration settings.
+        Validation errors for this configuration, computed once per instance.
 
         Returns:
-            List of validation errors (empty if valid)
+            Tuple of validation errors (empty if valid)
         """
         errors = []
 
@@ -216,6 +256,9 @@ class AzureFinOpsConfig:
         if self.cache_ttl_seconds < 0:
             errors.append("cache_ttl_seconds cannot be negative")
 
+        if self.subscription_cache_ttl_seconds < 0:
+            errors.append("subscription_cache_ttl_seconds cannot be negative")
+
         if self.max_retries < 0:
             errors.append("max_retries cannot be negative")
 
@@ -223,10 +266,20 @@ class AzureFinOpsConfig:
         if not self.azure_management_url.startswith("https://"):
             errors.append("azure_management_url must use HTTPS")
 
-        return errors
+        return tuple(errors)
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert configuration to dictionary."""
+    def validate(self) -> List[str]:
+        """
+        Validate configuration settings.
+
+        Returns:
+            List of validation errors (empty if valid)
+        """
+        return list(self.validation_errors)
+
+    @cached_property
+    def as_dict(self) -> Dict[str, Any]:
+        """Dictionary form of the configuration, built once per instance. Treat as read-only."""
         return {
             "subscription_id": self.subscription_id,
             "subscription_ids": self.subscription_ids,
@@ -238,35 +291,51 @@ class AzureFinOpsConfig:
             "enable_caching": self.enable_caching,
             "azure_management_url": self.azure_management_url,
             "api_version": self.api_version,
+            "use_resource_graph": self.use_resource_graph,
             "max_retries": self.max_retries,
             "retry_backoff_factor": self.retry_backoff_factor,
             "log_level": self.log_level,
             "enable_detailed_logging": self.enable_detailed_logging,
         }
 
+    @cached_property
+    def vm_monthly_cost_rates(self) -> Dict[str, float]:
+        """Monthly VM cost per size (hourly rate x hours_per_month, rounded), built once. Treat as read-only."""
+        rates = {size: round(rate * self.hours_per_month, 2) for size, rate in self.vm_cost_rates.items()}
+        rates.setdefault("default", round(0.10 * self.hours_per_month, 2))
+        return rates
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert configuration to dictionary."""
+        return dict(self.as_dict)
+
 
-# Global configuration instance
-_config: Optional[AzureFinOpsConfig] = None
+# Configuration installed via set_config(); takes precedence over the environment
+_config_override: Optional[AzureFinOpsConfig] = None
 
 
+@lru_cache(maxsize=1)
 def get_config() -> AzureFinOpsConfig:
     """
     Get the global configuration instance.
 
+    The result is memoized, so loading and validating the environment happens
+    once; set_config() and reset_config() clear the cache.
+
     Returns:
         AzureFinOpsConfig instance
     """
-    global _config
+    if _config_override is not None:
+        return _config_override
 
-    if _config is None:
-        _config = AzureFinOpsConfig.from_environment()
+    config = AzureFinOpsConfig.from_environment()
 
-        # Validate configuration
-        errors = _config.validate()
-        if errors:
-            logger.warning(f"Configuration validation warnings: {errors}")
+    # Validate configuration
+    errors = config.validation_errors
+    if errors:
+        logger.warning(f"Configuration validation warnings: {list(errors)}")
 
-    return _config
+    return config
 
 
 def set_config(config: AzureFinOpsConfig) -> None:
@@ -276,18 +345,20 @@ def set_config(config: AzureFinOpsConfig) -> None:
     Args:
         config: AzureFinOpsConfig instance to use
     """
-    global _config
+    global _config_override
 
-    errors = config.validate()
+    errors = config.validation_errors
     if errors:
-        raise ValueError(f"Invalid configuration: {errors}")
+        raise ValueError(f"Invalid configuration: {list(errors)}")
 
-    _config = config
+    _config_override = config
+    get_config.cache_clear()
     logger.info("Configuration updated")
 
 
 def reset_config() -> None:
     """Reset configuration to reload from environment."""
-    global _config
-    _config = None
+    global _config_override
+    _config_override = None
+    get_config.cache_clear()
     logger.info("Configuration reset")
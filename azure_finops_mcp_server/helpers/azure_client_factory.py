@@ -1,25 +1,82 @@
 """Azure client factory for dependency injection and better testability."""
 
 import logging
+import threading
 from abc import ABC, abstractmethod
-from typing import Any, Optional, Protocol
+from typing import Any, Dict, Optional, Protocol, Tuple
 
-from azure.identity import DefaultAzureCredential
+import requests
+from azure.core.pipeline.transport import RequestsTransport
 from azure.mgmt.compute import ComputeManagementClient
 from azure.mgmt.consumption import ConsumptionManagementClient
 from azure.mgmt.costmanagement import CostManagementClient
 from azure.mgmt.network import NetworkManagementClient
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from azure_finops_mcp_server.config import get_config
+from azure_finops_mcp_server.helpers.subscription_manager import get_credential
 
 logger = logging.getLogger(__name__)
 
+# Seconds to wait for a TCP/TLS connection to ARM before giving up
+_CONNECTION_TIMEOUT = 10
+
+# Process-wide HTTP transport shared by all management clients
+_transport: Optional[RequestsTransport] = None
+_transport_lock = threading.Lock()
+
+
+def get_shared_transport() -> RequestsTransport:
+    """
+    Get the HTTP transport shared by every Azure management client.
+
+    All clients send through one requests.Session, so connections (and their
+    TLS sessions) to management.azure.com are pooled and kept alive across
+    clients, subscriptions and calls instead of each client opening its own.
+    The transport does not own the session, so closing a client cannot close
+    it for the others.
+
+    Returns:
+        Shared RequestsTransport instance
+    """
+    global _transport
+
+    # Fast path: no lock once the transport exists
+    transport = _transport
+    if transport is not None:
+        return transport
+
+    with _transport_lock:
+        if _transport is None:
+            session = requests.Session()
+            # Same adapter setup as an azure-core owned session: the pipeline's retry policy does the retrying
+            adapter = HTTPAdapter(
+                pool_maxsize=max(10, get_config().max_parallel_workers),
+                max_retries=Retry(total=False, redirect=False, raise_on_status=False),
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _transport = RequestsTransport(session=session, session_owner=False, connection_timeout=_CONNECTION_TIMEOUT)
+
+        return _transport
+
+
+def reset_shared_transport() -> None:
+    """Close and drop the shared transport so the next client gets a fresh one."""
+    global _transport
+
+    with _transport_lock:
+        if _transport is not None:
+            _transport.session.close()
+        _transport = None
+
 
 class ComputeClientProtocol(Protocol):
     """Protocol for compute client operations."""
 
-    def list_all_vms(self) -> Any:
-        """List all virtual machines."""
+    def list_all_vms(self, expand: Optional[str] = None) -> Any:
+        """List all virtual machines, optionally expanded (e.g. with their instance views)."""
         ...
 
     def get_instance_view(self, resource_group: str, vm_name: str) -> Any:
@@ -80,33 +137,86 @@ class AzureClientFactory(ABC):
 
 
 class DefaultAzureClientFactory(AzureClientFactory):
-    """Default implementation of Azure client factory using real Azure SDK."""
+    """
+    Default implementation of Azure client factory using real Azure SDK.
+
+    Clients are cached per (client type, subscription), so the auditors of
+    one subscription share a client and with it one HTTP connection pool
+    instead of each building their own. When the credential changes (the
+    shared get_credential() credential is rebuilt every cache_ttl_seconds),
+    the clients built with the old one are closed and dropped.
+    """
 
     def __init__(self, credential=None):
         """
         Initialize the factory with Azure credentials.
 
         Args:
-            credential: Azure credential object (uses DefaultAzureCredential if not provided)
+            credential: Azure credential object (uses the shared get_credential() credential if not provided)
         """
-        self.credential = credential or DefaultAzureCredential()
+        self._credential = credential
         self.config = get_config()
+        # Maps (client class, args) to (client, credential it was built with)
+        self._clients: Dict[Tuple[type, Tuple[Any, ...]], Tuple[Any, Any]] = {}
+        self._clients_lock = threading.Lock()
+
+    @property
+    def credential(self) -> Any:
+        """
+        Credential used for new clients.
+
+        Without an explicit credential this is the process-wide cached
+        get_credential() credential, so clients share its token cache.
+        """
+        return self._credential if self._credential is not None else get_credential()
+
+    @credential.setter
+    def credential(self, credential: Any) -> None:
+        self._credential = credential
+
+    def _get_client(self, client_class: type, *args: Any, **kwargs: Any) -> Any:
+        """Return the cached client_class(credential, *args, **kwargs) for the current credential."""
+        credential = self.credential
+        key = (client_class, args)
+        stale_clients = []
+        with self._clients_lock:
+            cached = self._clients.get(key)
+            if cached is not None and cached[1] is not credential:
+                # The credential changed, so no client built with an older one will be handed out again
+                for stale_key, (stale_client, stale_credential) in list(self._clients.items()):
+                    if stale_credential is not credential:
+                        del self._clients[stale_key]
+                        stale_clients.append(stale_client)
+                cached = None
+            if cached is None:
+                client = client_class(credential, *args, transport=get_shared_transport(), **kwargs)
+                cached = self._clients[key] = (client, credential)
+
+        # The transport does not own the shared session, so closing cannot disturb calls still in flight
+        for stale_client in stale_clients:
+            stale_client.close()
+        return cached[0]
+
+    def clear_clients(self) -> None:
+        """Drop all cached clients."""
+        with self._clients_lock:
+            self._clients.clear()
 
     def create_compute_client(self, subscription_id: str) -> ComputeManagementClient:
-        """Create a real Azure compute management client."""
-        return ComputeManagementClient(self.credential, subscription_id)
+        """Create (or reuse) a real Azure compute management client."""
+        return self._get_client(ComputeManagementClient, subscription_id)
 
     def create_network_client(self, subscription_id: str) -> NetworkManagementClient:
-        """Create a real Azure network management client."""
-        return NetworkManagementClient(self.credential, subscription_id)
+        """Create (or reuse) a real Azure network management client."""
+        return self._get_client(NetworkManagementClient, subscription_id)
 
     def create_consumption_client(self, subscription_id: str) -> ConsumptionManagementClient:
-        """Create a real Azure consumption management client."""
-        return ConsumptionManagementClient(self.credential, subscription_id)
+        """Create (or reuse) a real Azure consumption management client."""
+        return self._get_client(ConsumptionManagementClient, subscription_id)
 
     def create_cost_client(self) -> CostManagementClient:
-        """Create a real Azure cost management client."""
-        return CostManagementClient(self.credential, base_url=self.config.azure_management_url)
+        """Create (or reuse) a real Azure cost management client."""
+        return self._get_client(CostManagementClient, base_url=self.config.azure_management_url)
 
 
 class ComputeClientAdapter:
@@ -121,9 +231,14 @@ class ComputeClientAdapter:
         """
         self.client = client
 
-    def list_all_vms(self):
-        """List all virtual machines."""
-        return self.client.virtual_machines.list_all()
+    def list_all_vms(self, expand: Optional[str] = None):
+        """
+        List all virtual machines.
+
+        Args:
+            expand: Optional expansion; "instanceView" returns each VM's power state in the listing
+        """
+        return self.client.virtual_machines.list_all(expand=expand)
 
     def get_instance_view(self, resource_group: str, vm_name: str):
         """Get VM instance view."""
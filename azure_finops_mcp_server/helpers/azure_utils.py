@@ -1,6 +1,7 @@
 """Common Azure resource utilities to eliminate code duplication."""
 
-from typing import Dict
+from datetime import date
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
 
 
 def extract_resource_group(resource_id: str) -> str:
@@ -23,7 +24,8 @@ def extract_resource_group(resource_id: str) -> str:
         'myRG'
     """
     try:
-        parts = resource_id.split("/")
+        # Only the leading segments are needed, so stop splitting after the resource group
+        parts = resource_id.split("/", 5)
         # Resource group is always at index 4 in standard Azure resource IDs
         if len(parts) > 4 and parts[3].lower() == "resourcegroups":
             return parts[4]
@@ -47,7 +49,7 @@ def extract_subscription_id(resource_id: str) -> str:
         '123-456'
     """
     try:
-        parts = resource_id.split("/")
+        parts = resource_id.split("/", 3)
         if len(parts) > 2 and parts[1].lower() == "subscriptions":
             return parts[2]
         raise ValueError(f"Invalid Azure resource ID format: {resource_id}")
@@ -70,7 +72,7 @@ def extract_resource_name(resource_id: str) -> str:
         'myVM'
     """
     try:
-        return resource_id.rstrip("/").split("/")[-1]
+        return resource_id.rstrip("/").rpartition("/")[2]
     except (IndexError, AttributeError) as e:
         raise ValueError(f"Failed to parse resource ID: {resource_id}") from e
 
@@ -79,23 +81,64 @@ def parse_resource_id(resource_id: str) -> Dict[str, str]:
     """
     Parse Azure resource ID into its components.
 
+    Splits the ID once for all three fields, with the same rules as the
+    extract_* helpers, instead of calling each of them in turn.
+
     Args:
         resource_id: Full Azure resource ID
 
     Returns:
         Dictionary with subscription_id, resource_group, and resource_name
 
+    Raises:
+        ValueError: If the ID has no subscription or resource group segment
+
     Example:
         >>> parse_resource_id("/subscriptions/123/resourceGroups/myRG/.../virtualMachines/myVM")
         {'subscription_id': '123', 'resource_group': 'myRG', 'resource_name': 'myVM'}
     """
+    try:
+        parts = resource_id.split("/")
+    except AttributeError as e:
+        raise ValueError(f"Failed to parse resource ID: {resource_id}") from e
+
+    if len(parts) <= 4 or parts[1].lower() != "subscriptions" or parts[3].lower() != "resourcegroups":
+        raise ValueError(f"Invalid Azure resource ID format: {resource_id}")
+
     return {
-        "subscription_id": extract_subscription_id(resource_id),
-        "resource_group": extract_resource_group(resource_id),
-        "resource_name": extract_resource_name(resource_id),
+        "subscription_id": parts[2],
+        "resource_group": parts[4],
+        "resource_name": resource_id.rstrip("/").rpartition("/")[2],
     }
 
 
+def parse_iso_date(value: str) -> date:
+    """
+    Parse a YYYY-MM-DD date string.
+
+    Uses the C-level date.fromisoformat instead of the much slower
+    strptime format machinery. The shape is checked first because fromisoformat also
+    accepts other ISO 8601 forms (YYYYMMDD, week dates like 2024-W05-3), which are rejected.
+
+    Args:
+        value: Date string in YYYY-MM-DD format
+
+    Returns:
+        Parsed date object
+
+    Raises:
+        ValueError: If the string is not a valid YYYY-MM-DD date
+
+    Example:
+        >>> parse_iso_date("2024-01-31")
+        datetime.date(2024, 1, 31)
+    """
+    digits = value[:4] + value[5:7] + value[8:]
+    if len(value) != 10 or value[4] != "-" or value[7] != "-" or not (digits.isascii() and digits.isdigit()):
+        raise ValueError(f"Invalid date format: {value!r}. Use YYYY-MM-DD")
+    return date.fromisoformat(value)
+
+
 def format_cost(cost: float, currency: str = "USD") -> str:
     """
     Format cost value for display.
@@ -116,6 +159,34 @@ def format_cost(cost: float, currency: str = "USD") -> str:
     return f"{cost:,.2f} {currency}"
 
 
+def aggregate_cost_rows(rows: Optional[Iterable[Sequence[Any]]]) -> Tuple[float, Dict[str, float]]:
+    """
+    Sum Cost Management query rows by their grouping value.
+
+    Rows have the form [cost, dimension_value, ...]. Rows with fewer than two
+    columns are skipped and empty dimension values are reported as "Unknown".
+
+    Args:
+        rows: Rows from a grouped Cost Management query (may be None)
+
+    Returns:
+        Tuple of (total cost, dictionary mapping dimension value to cost)
+
+    Example:
+        >>> aggregate_cost_rows([[1.5, "Storage"], [2.0, "Storage"], [0.5, None]])
+        (4.0, {'Storage': 3.5, 'Unknown': 0.5})
+    """
+    grouped: Dict[str, float] = {}
+    get = grouped.get
+
+    for row in rows or ():
+        if len(row) >= 2:
+            key = row[1] or "Unknown"
+            grouped[key] = get(key, 0.0) + float(row[0] or 0.0)
+
+    return sum(grouped.values()), grouped
+
+
 def is_orphaned_disk(disk_name: str, resource_group: str) -> bool:
     """
     Check if a disk is likely orphaned based on naming patterns.
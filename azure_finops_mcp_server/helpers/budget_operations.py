@@ -58,10 +58,11 @@ def get_budget_data(credential, subscription_id: str) -> Tuple[Dict[str, Any], A
             }
 
             # Get current spend if available
-            if hasattr(budget, "current_spend") and budget.current_spend:
+            current_spend = budget.current_spend
+            if current_spend:
                 budget_detail["current_spend"] = {
-                    "amount": float(budget.current_spend.amount) if budget.current_spend.amount else 0,
-                    "unit": budget.current_spend.unit,
+                    "amount": float(current_spend.amount) if current_spend.amount else 0,
+                    "unit": current_spend.unit,
                 }
                 budget_detail["percentage_used"] = (
                     round((budget_detail["current_spend"]["amount"] / budget_detail["amount"]) * 100, 2)
@@ -75,10 +76,11 @@ def get_budget_data(credential, subscription_id: str) -> Tuple[Dict[str, Any], A
                 budget_detail["percentage_used"] = 0
 
             # Get forecast if available
-            if hasattr(budget, "forecast_spend") and budget.forecast_spend:
+            forecast_spend = budget.forecast_spend
+            if forecast_spend:
                 budget_detail["forecast_spend"] = {
-                    "amount": float(budget.forecast_spend.amount) if budget.forecast_spend.amount else 0,
-                    "unit": budget.forecast_spend.unit,
+                    "amount": float(forecast_spend.amount) if forecast_spend.amount else 0,
+                    "unit": forecast_spend.unit,
                 }
                 budget_detail["forecast_percentage"] = (
                     round((budget_detail["forecast_spend"]["amount"] / budget_detail["amount"]) * 100, 2)
@@ -91,10 +91,11 @@ def extract_current_spend(budget: Any) -> Dict[str, Any]:
     Returns:
         Dictionary with current spend details
     """
-    if hasattr(budget, "current_spend") and budget.current_spend:
+    current_spend = budget.current_spend
+    if current_spend:
         return {
-            "amount": float(budget.current_spend.amount) if budget.current_spend.amount else 0,
-            "unit": budget.current_spend.unit,
+            "amount": float(current_spend.amount) if current_spend.amount else 0,
+            "unit": current_spend.unit,
         }
     return {"amount": 0, "unit": "USD"}
 
@@ -109,10 +110,11 @@ def extract_forecast_spend(budget: Any) -> Optional[Dict[str, Any]]:
     Returns:
         Dictionary with forecast spend details or None
     """
-    if hasattr(budget, "forecast_spend") and budget.forecast_spend:
+    forecast_spend = budget.forecast_spend
+    if forecast_spend:
         return {
-            "amount": float(budget.forecast_spend.amount) if budget.forecast_spend.amount else 0,
-            "unit": budget.forecast_spend.unit,
+            "amount": float(forecast_spend.amount) if forecast_spend.amount else 0,
+            "unit": forecast_spend.unit,
         }
     return None
 
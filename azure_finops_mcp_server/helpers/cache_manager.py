@@ -29,10 +29,12 @@ class CacheManager:
         self._cache: Dict[str, Dict[str, Any]] = {}
         self._stats = {"hits": 0, "misses": 0, "evictions": 0}
 
-    def _generate_key(self, prefix: str, **kwargs) -> str:
+    def make_key(self, prefix: str, **kwargs) -> str:
         """
         Generate a cache key from prefix and parameters.
 
+        Used by the cached decorator and by callers that cache results by hand.
+
         Args:
             prefix: Cache key prefix
             **kwargs: Parameters to include in key
@@ -213,7 +215,7 @@ def cached(prefix: str, ttl: Optional[int] = None):
                 if not hasattr(arg, "__module__") or "azure" not in arg.__module__:
                     cache_args.append(str(arg))
 
-            cache_key = cache._generate_key(prefix, args=cache_args, **cache_kwargs)
+            cache_key = cache.make_key(prefix, args=cache_args, **cache_kwargs)
 
             # Check cache
             cached_result = cache.get(cache_key)
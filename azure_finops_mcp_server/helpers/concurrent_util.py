@@ -4,7 +4,7 @@ import asyncio
 import logging
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Any, Callable, Dict, List, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -180,3 +180,38 @@ def batch_process_with_retry(
                         time.sleep(retry_delay * retry_count)
 
     return successful, failed
+
+
+def _next_page(pages: Iterator[Iterable[Any]]) -> Optional[Iterable[Any]]:
+    """Fetch the next page, or None once the listing is exhausted."""
+    return next(pages, None)
+
+
+def iter_prefetched(
+    listing: Iterable[Any], fetch_page: Callable[[Iterator[Iterable[Any]]], Optional[Iterable[Any]]] = _next_page
+) -> Iterator[Any]:
+    """
+    Iterate a paged Azure SDK listing, fetching the next page while the current one is consumed.
+
+    Page fetches run one at a time in a background thread, so each network
+    round-trip overlaps with the caller's processing of the previous page.
+
+    Args:
+        listing: Azure SDK ItemPaged result, or any plain iterable
+        fetch_page: Callable taking the page iterator and returning the next page or None
+            (e.g. to wrap each fetch in retry logic)
+
+    Yields:
+        Items from every page, in listing order
+    """
+    if not hasattr(listing, "by_page"):
+        # Already materialized (e.g. a plain list); nothing to page through
+        yield from listing
+        return
+
+    pages = listing.by_page()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        next_page = executor.submit(fetch_page, pages)
+        while (page := next_page.result()) is not None:
+            next_page = executor.submit(fetch_page, pages)
+            yield from page
@@ -1,12 +1,60 @@
 """Cost filtering utilities for Azure FinOps."""
 
 import logging
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional, Tuple
 
 from azure.mgmt.costmanagement.models import QueryComparisonExpression, QueryFilter
 
 logger = logging.getLogger(__name__)
 
+# Map common dimension names to Cost Management column names
+_DIMENSION_MAP = MappingProxyType(
+    {
+        "ResourceLocation": "ResourceLocation",
+        "Location": "ResourceLocation",
+        "ResourceGroup": "ResourceGroupName",
+        "ResourceGroupName": "ResourceGroupName",
+        "Service": "ServiceName",
+        "ServiceName": "ServiceName",
+        "ResourceType": "ResourceType",
+        "Meter": "MeterName",
+        "MeterName": "MeterName",
+    }
+)
+
+# Map AWS-style group_by values to Cost Management dimensions
+_GROUP_BY_MAP = MappingProxyType(
+    {
+        "SERVICE": "ServiceName",
+        "REGION": "ResourceLocation",
+        "INSTANCE_TYPE": "MeterSubcategory",
+        "RESOURCE_ID": "ResourceId",
+        "RESOURCE_GROUP": "ResourceGroupName",
+    }
+)
+
+# Dimension names accepted without a warning: the mapped names plus a few passed through as-is
+_VALID_DIMENSIONS = frozenset(_DIMENSION_MAP) | {"SubscriptionId", "SubscriptionName", "ResourceId"}
+
+
+def map_group_by(group_by: str) -> str:
+    """
+    Translate an AWS-style group_by value to its Cost Management dimension.
+
+    Args:
+        group_by: Grouping such as "SERVICE" or an Azure dimension name
+
+    Returns:
+        Azure dimension name (unknown values are passed through)
+
+    Example:
+        >>> map_group_by("REGION")
+        'ResourceLocation'
+    """
+    return _GROUP_BY_MAP.get(group_by, group_by)
+
 
 def cost_filters(tags: Optional[List[str]] = None, dimensions: Optional[List[str]] = None) -> Optional[QueryFilter]:
     """
@@ -17,47 +65,35 @@ def cost_filters(tags: Optional[List[str]] = None, dimensions: Optional[List[str
         dimensions: List of dimension filters in "key=value" format
 
     Returns:
-        QueryFilter object or None if no filters
+        QueryFilter object or None if no filters. Results are memoized per
+        (tags, dimensions), so identical specs share one QueryFilter; treat it as read-only.
     """
+    return _cost_filters_cached(tuple(tags or ()), tuple(dimensions or ()))
+
+
+@lru_cache(maxsize=256)
+def _cost_filters_cached(tags: Tuple[str, ...], dimensions: Tuple[str, ...]) -> Optional[QueryFilter]:
+    """Build the cost query filter for hashable tag and dimension specs (see cost_filters)."""
     filters = []
 
     # Process tag filters
-    if tags:
-        for tag in tags:
-            if "=" in tag:
-                key, value = tag.split("=", 1)
-                tag_filter = QueryFilter(tags=QueryComparisonExpression(name=key, operator="In", values=[value]))
-                filters.append(tag_filter)
-            else:
-                logger.warning(f"Invalid tag filter format: {tag}. Expected 'key=value'")
+    for tag in tags:
+        key, sep, value = tag.partition("=")
+        if not sep:
+            logger.warning(f"Invalid tag filter format: {tag}. Expected 'key=value'")
+            continue
+        filters.append(QueryFilter(tags=QueryComparisonExpression(name=key, operator="In", values=[value])))
 
     # Process dimension filters
-    if dimensions:
-        for dimension in dimensions:
-            if "=" in dimension:
-                key, value = dimension.split("=", 1)
-
-                # Map common dimension names
-                dimension_map = {
-                    "ResourceLocation": "ResourceLocation",
-                    "Location": "ResourceLocation",
-                    "ResourceGroup": "ResourceGroupName",
-                    "ResourceGroupName": "ResourceGroupName",
-                    "Service": "ServiceName",
-                    "ServiceName": "ServiceName",
-                    "ResourceType": "ResourceType",
-                    "Meter": "MeterName",
-                    "MeterName": "MeterName",
-                }
-
-                mapped_key = dimension_map.get(key, key)
-
-                dimension_filter = QueryFilter(
-                    dimensions=QueryComparisonExpression(name=mapped_key, operator="In", values=[value])
-                )
-                filters.append(dimension_filter)
-            else:
-                logger.warning(f"Invalid dimension filter format: {dimension}. Expected 'key=value'")
+    for dimension in dimensions:
+        key, sep, value = dimension.partition("=")
+        if not sep:
+            logger.warning(f"Invalid dimension filter format: {dimension}. Expected 'key=value'")
+            continue
+        mapped_key = _DIMENSION_MAP.get(key, key)
+        filters.append(
+            QueryFilter(dimensions=QueryComparisonExpression(name=mapped_key, operator="In", values=[value]))
+        )
 
     # Combine filters if multiple exist
     if len(filters) == 0:
@@ -123,21 +159,6 @@ def validate_filters(tags: Optional[List[str]] = None, dimensions: Optional[List
                 validation["warnings"].append(f"Tag '{tag}' contains multiple '=' signs")
 
     # Validate dimensions
-    valid_dimensions = {
-        "ResourceLocation",
-        "Location",
-        "ResourceGroup",
-        "ResourceGroupName",
-        "Service",
-        "ServiceName",
-        "ResourceType",
-        "Meter",
-        "MeterName",
-        "SubscriptionId",
-        "SubscriptionName",
-        "ResourceId",
-    }
-
     if dimensions:
         for dimension in dimensions:
             if "=" not in dimension:
@@ -145,9 +166,9 @@ def validate_filters(tags: Optional[List[str]] = None, dimensions: Optional[List
                 validation["valid"] = False
             else:
                 key = dimension.split("=", 1)[0]
-                if key not in valid_dimensions:
+                if key not in _VALID_DIMENSIONS:
                     validation["warnings"].append(
-                        f"Dimension '{key}' may not be valid. Valid dimensions: {', '.join(valid_dimensions)}"
+                        f"Dimension '{key}' may not be valid. Valid dimensions: {', '.join(sorted(_VALID_DIMENSIONS))}"
                     )
 
     return validation
@@ -1,8 +1,10 @@
 """Disk operations for Azure FinOps."""
 
 import logging
-from collections import defaultdict
-from typing import Any, Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 
 from azure_finops_mcp_server.config import get_config
 from azure_finops_mcp_server.helpers.azure_client_factory import get_client_factory
@@ -11,11 +13,64 @@ from azure_finops_mcp_server.helpers.azure_utils import (
     extract_resource_group,
     format_cost,
 )
+from azure_finops_mcp_server.helpers.concurrent_util import iter_prefetched
+from azure_finops_mcp_server.helpers.retry_handler import get_retry_handler
 
 logger = logging.getLogger(__name__)
 
 ApiErrors = Dict[str, str]
 
+# Map disk SKU names to cost rate keys in config.disk_cost_rates
+_DISK_SKU_RATE_KEYS = MappingProxyType(
+    {
+        "Standard_LRS": "standard_hdd",
+        "StandardSSD_LRS": "standard_ssd",
+        "Premium_LRS": "premium_ssd",
+        "UltraSSD_LRS": "ultra_disk",
+    }
+)
+_DEFAULT_DISK_SKU = "Standard_LRS"
+
+# Name prefixes of Kubernetes PVC disks and of AKS node resource groups, as
+# tuples so a single str.startswith call tests every prefix in C
+_PVC_DISK_PREFIXES = ("pvc-",)
+_AKS_RESOURCE_GROUP_PREFIXES = ("MC_",)
+
+
+class DiskRecord(NamedTuple):
+    """Unattached disk details with their estimated costs (zero until priced)."""
+
+    name: str
+    resource_group: str
+    location: str
+    size_gb: int
+    sku: str
+    id: str
+    created_time: Optional[str]
+    monthly_cost: float = 0.0
+    annual_cost: float = 0.0
+
+
+# Fields reported by fetch_unattached_disks, i.e. a DiskRecord without its costs
+_DISK_DETAIL_FIELDS = DiskRecord._fields[:7]
+
+
+def _iter_disks(compute_client: Any) -> Iterator[Any]:
+    """
+    Iterate all managed disks, fetching them page by page.
+
+    Each page fetch goes through the retry handler, so a throttled or failed
+    page is retried with backoff instead of aborting the whole listing, and the
+    next page is prefetched while the current one is processed.
+
+    Args:
+        compute_client: Azure compute management client
+
+    Yields:
+        Azure disk objects
+    """
+    yield from iter_prefetched(compute_client.disks.list(), get_retry_handler().fetch_next_page)
+
 
 def get_unattached_disks(
     credential,
@@ -42,6 +97,7 @@ def get_unattached_disks(
     api_errors: ApiErrors = {}
     unattached_disks = []
     disk_categories = {"orphaned": [], "pvc": [], "aks_managed": []}
+    included_categories = {"orphaned": True, "pvc": include_pvc_disks, "aks_managed": include_aks_managed_disks}
 
     try:
         # Use factory pattern for better testability
@@ -49,90 +105,152 @@ def get_unattached_disks(
         factory.credential = credential  # Use provided credential
         compute_client = factory.create_compute_client(subscription_id)
 
-        for disk in compute_client.disks.list():
-            # Filter by region if specified
-            if regions and disk.location not in regions:
-                continue
-
-            # Check if disk is unattached
-            if disk.managed_by is None:
-                resource_group = extract_resource_group(disk.id)
-
-                disk_info = {
-                    "name": disk.name,
-                    "resource_group": resource_group,
-                    "location": disk.location,
-                    "size_gb": disk.disk_size_gb,
-                    "sku": disk.sku.name if disk.sku else "Unknown",
-                    "id": disk.id,
-                }
-
-                # Categorize the disk
-                if disk.name.startswith("pvc-"):
-                    disk_categories["pvc"].append(disk_info)
-                    if include_pvc_disks:
-                        unattached_disks.append(disk_info)
-                elif resource_group.startswith("MC_"):
-                    disk_categories["aks_managed"].append(disk_info)
-                    if include_aks_managed_disks:
-                        unattached_disks.append(disk_info)
-                else:
-                    # Truly orphaned disk
-                    disk_categories["orphaned"].append(disk_info)
-                    unattached_disks.append(disk_info)
+        for category, disk_info in _iter_categorized_unattached_disks(compute_client, regions):
+            disk_categories[category].append(disk_info)
+            if included_categories[category]:
+                unattached_disks.append(disk_info)
 
     except Exception as e:
         api_errors["unattached_disks"] = f"Failed to get unattached disks: {str(e)}"
 
+    return unattached_disks_result(unattached_disks, disk_categories), api_errors
+
+
+def unattached_disks_result(
+    unattached_disks: List[Dict[str, Any]], disk_categories: Dict[str, List[Dict[str, Any]]]
+) -> Dict[str, Any]:
+    """
+    Build the get_unattached_disks result from the included disks and every categorized disk.
+
+    The Resource Graph audit builds its disk results with this too, so both report the same shape.
+    """
     return {
         "unattached_disks": unattached_disks,
         "categories": disk_categories,
         "statistics": {
-            "total_unattached": len(disk_categories["orphaned"])
-            + len(disk_categories["pvc"])
-            + len(disk_categories["aks_managed"]),
+            "total_unattached": sum(map(len, disk_categories.values())),
             "orphaned_count": len(disk_categories["orphaned"]),
             "pvc_count": len(disk_categories["pvc"]),
             "aks_managed_count": len(disk_categories["aks_managed"]),
             "included_in_results": len(unattached_disks),
         },
-    }, api_errors
+    }
 
 
-def fetch_unattached_disks(compute_client: Any, regions: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+def unattached_disk_category(
+    name: str, resource_group: str, aks_prefixes: Tuple[str, ...] = _AKS_RESOURCE_GROUP_PREFIXES
+) -> str:
     """
-    Fetch all unattached disks from Azure.
+    Categorize an unattached disk as 'pvc', 'aks_managed' or (truly) 'orphaned'.
+
+    The category doubles as the key of the per-category lists, so callers
+    dispatch on it with a single dict lookup.
+
+    Args:
+        name: Disk name
+        resource_group: Resource group of the disk
+        aks_prefixes: Resource group prefixes of AKS-managed disks, tested in one startswith call
+    """
+    if name.startswith(_PVC_DISK_PREFIXES):
+        return "pvc"
+    if resource_group.startswith(aks_prefixes):
+        return "aks_managed"
+    return "orphaned"
+
+
+def _iter_categorized_unattached_disks(
+    compute_client: Any, regions: Optional[List[str]] = None
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Stream unattached disks with their category, as they are paged in.
 
     Args:
         compute_client: Azure compute management client
         regions: Optional list of regions to filter by
 
-    Returns:
-        List of unattached disk information
+    Yields:
+        Tuple of (category, disk information) where category is 'orphaned', 'pvc' or 'aks_managed'
     """
-    unattached_disks = []
-
-    for disk in compute_client.disks.list():
-        if regions and disk.location not in regions:
+    region_set = frozenset(regions) if regions else None
+    for disk in _iter_disks(compute_client):
+        # Filter by region if specified
+        if region_set and disk.location not in region_set:
             continue
 
+        # Check if disk is unattached
         if disk.managed_by is None:
             resource_group = extract_resource_group(disk.id)
-            size_gb = disk.disk_size_gb or 0
-            sku_name = disk.sku.name if disk.sku else "Standard_LRS"
 
-            disk_detail = {
+            disk_info = {
                 "name": disk.name,
                 "resource_group": resource_group,
                 "location": disk.location,
-                "size_gb": size_gb,
-                "sku": sku_name,
+                "size_gb": disk.disk_size_gb,
+                "sku": disk.sku.name if disk.sku else "Unknown",
                 "id": disk.id,
-                "created_time": disk.time_created.isoformat() if disk.time_created else None,
             }
-            unattached_disks.append(disk_detail)
 
-    return unattached_disks
+            yield unattached_disk_category(disk.name, resource_group), disk_info
+
+
+def _iter_unattached_disk_records(compute_client: Any, regions: Optional[List[str]] = None) -> Iterator[DiskRecord]:
+    """
+    Stream unattached disks from Azure as unpriced records, as they are paged in.
+
+    Args:
+        compute_client: Azure compute management client
+        regions: Optional list of regions to filter by
+
+    Yields:
+        DiskRecord for each unattached disk
+    """
+    region_set = frozenset(regions) if regions else None
+    for disk in _iter_disks(compute_client):
+        if region_set and disk.location not in region_set:
+            continue
+
+        if disk.managed_by is None:
+            # Results are returned as JSON, so the creation time stays an ISO string; it is read
+            # from the model once and only formatted for disks that are actually reported
+            time_created = disk.time_created
+            yield DiskRecord(
+                disk.name,
+                extract_resource_group(disk.id),
+                disk.location,
+                disk.disk_size_gb or 0,
+                disk.sku.name if disk.sku else "Standard_LRS",
+                disk.id,
+                time_created and time_created.isoformat(),
+            )
+
+
+def iter_unattached_disks(compute_client: Any, regions: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Stream unattached disks from Azure as they are paged in.
+
+    Args:
+        compute_client: Azure compute management client
+        regions: Optional list of regions to filter by
+
+    Yields:
+        Unattached disk information dictionaries
+    """
+    for record in _iter_unattached_disk_records(compute_client, regions):
+        yield dict(zip(_DISK_DETAIL_FIELDS, record))
+
+
+def fetch_unattached_disks(compute_client: Any, regions: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Fetch all unattached disks from Azure.
+
+    Args:
+        compute_client: Azure compute management client
+        regions: Optional list of regions to filter by
+
+    Returns:
+        List of unattached disk information
+    """
+    return list(iter_unattached_disks(compute_client, regions))
 
 
 def categorize_disks(disks: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
@@ -147,22 +265,11 @@ def categorize_disks(disks: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, An
     """
     categories = {"orphaned": [], "pvc": [], "aks_managed": []}
 
-    config = get_config()
+    aks_prefixes = tuple(get_config().managed_resource_group_patterns)
 
     for disk in disks:
-        name = disk["name"]
-        resource_group = disk["resource_group"]
-
         # Check against configured patterns
-        is_pvc = any(name.startswith(pattern) for pattern in ["pvc-"])
-        is_aks = any(resource_group.startswith(pattern) for pattern in config.managed_resource_group_patterns)
-
-        if is_pvc:
-            categories["pvc"].append(disk)
-        elif is_aks:
-            categories["aks_managed"].append(disk)
-        else:
-            categories["orphaned"].append(disk)
+        categories[unattached_disk_category(disk["name"], disk["resource_group"], aks_prefixes)].append(disk)
 
     return categories
 
@@ -177,14 +284,12 @@ def calculate_disk_costs(disks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     Returns:
         List of disks with cost information added
     """
-    get_config()
+    # Resolve per-SKU rates once instead of once per disk
+    rate_by_sku = get_disk_rate_table()
+    default_rate = rate_by_sku[_DEFAULT_DISK_SKU]
 
     for disk in disks:
-        size_gb = disk["size_gb"]
-        sku_name = disk["sku"]
-
-        # Estimate monthly cost
-        monthly_cost = estimate_disk_cost(size_gb, sku_name)
+        monthly_cost = disk["size_gb"] * rate_by_sku.get(disk["sku"], default_rate)
 
         disk["monthly_cost"] = round(monthly_cost, 2)
         disk["annual_cost"] = round(calculate_yearly_cost(monthly_cost), 2)
@@ -192,23 +297,29 @@ def calculate_disk_costs(disks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     return disks
 
 
-def compile_audit_statistics(categories: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Any]:
+def compile_audit_statistics(
+    categories: Dict[str, List[Dict[str, Any]]], category_costs: Optional[Dict[str, float]] = None
+) -> Dict[str, Any]:
     """
     Compile statistics from categorized disks.
 
     Args:
         categories: Dictionary with categorized disks
+        category_costs: Optional precomputed monthly cost per category (summed from the disks if omitted)
 
     Returns:
         Dictionary with audit statistics
     """
-    orphaned_cost = sum(d.get("monthly_cost", 0) for d in categories["orphaned"])
-    pvc_cost = sum(d.get("monthly_cost", 0) for d in categories["pvc"])
-    aks_cost = sum(d.get("monthly_cost", 0) for d in categories["aks_managed"])
-    total_cost = orphaned_cost + pvc_cost + aks_cost
+    if category_costs is None:
+        category_costs = {
+            category: sum(d.get("monthly_cost", 0) for d in disks) for category, disks in categories.items()
+        }
+
+    orphaned_cost = category_costs["orphaned"]
+    total_cost = orphaned_cost + category_costs["pvc"] + category_costs["aks_managed"]
 
     return {
-        "total_unattached_disks": sum(len(disks) for disks in categories.values()),
+        "total_unattached_disks": sum(map(len, categories.values())),
         "orphaned_count": len(categories["orphaned"]),
         "pvc_count": len(categories["pvc"]),
         "aks_managed_count": len(categories["aks_managed"]),
@@ -219,6 +330,92 @@ def compile_audit_statistics(categories: Dict[str, List[Dict[str, Any]]]) -> Dic
     }
 
 
+def _iter_priced_disks(disks: Iterable[DiskRecord]) -> Iterator[Tuple[str, DiskRecord, int]]:
+    """
+    Price and categorize disk records one at a time.
+
+    Args:
+        disks: Iterable of unpriced disk records
+
+    Yields:
+        Tuple of (category, priced disk record, monthly cost in integer cents)
+    """
+    rate_by_sku = get_disk_rate_table()
+    default_rate = rate_by_sku[_DEFAULT_DISK_SKU]
+    aks_prefixes = tuple(get_config().managed_resource_group_patterns)
+
+    for disk in disks:
+        raw_cents = disk.size_gb * rate_by_sku.get(disk.sku, default_rate) * 100
+        monthly_cents = int(raw_cents + 0.5)
+        disk = disk._replace(
+            monthly_cost=monthly_cents / 100, annual_cost=int(calculate_yearly_cost(raw_cents) + 0.5) / 100
+        )
+
+        yield unattached_disk_category(disk.name, disk.resource_group, aks_prefixes), disk, monthly_cents
+
+
+def iter_detailed_disk_audit(
+    compute_client: Any, regions: Optional[List[str]] = None, max_results: Optional[int] = None
+) -> Iterator[Tuple[str, str, Dict[str, Any], float]]:
+    """
+    Stream priced and categorized unattached disks as they are paged in.
+
+    Streaming counterpart of get_detailed_disk_audit for callers that want to
+    process disks incrementally instead of holding the whole audit in memory.
+
+    Args:
+        compute_client: Azure compute management client
+        regions: Optional list of regions to filter by
+        max_results: Optional number of disks after which paging stops
+
+    Yields:
+        Tuple of (category, location, disk information, monthly cost)
+    """
+    priced = _iter_priced_disks(_iter_unattached_disk_records(compute_client, regions))
+    for category, disk, _ in islice(priced, max_results):
+        yield category, disk.location, disk._asdict(), disk.monthly_cost
+
+
+def _price_and_categorize_disks(
+    disks: Iterable[DiskRecord],
+) -> Tuple[Dict[str, List[DiskRecord]], Dict[str, float], Dict[str, Dict[str, Any]]]:
+    """
+    Price, categorize and tally disks in a single pass.
+
+    Equivalent to calculate_disk_costs + categorize_disks + the per-category
+    and per-SKU sums, without walking the disk list once per step. Accepts any
+    iterable, so disks can be streamed straight from the API pager.
+
+    Args:
+        disks: Iterable of unpriced disk records
+
+    Returns:
+        Tuple of (categorized priced disk records, monthly cost per category, cost statistics by SKU)
+    """
+    categories: Dict[str, List[DiskRecord]] = {"orphaned": [], "pvc": [], "aks_managed": []}
+    # Costs are accumulated in integer cents and converted to dollars once at the end
+    category_cents = dict.fromkeys(categories, 0)
+    # Per-SKU [count, total_gb, cost_cents] accumulators, turned into dicts once at the end
+    sku_totals: Dict[str, List[Any]] = {}
+
+    for category, disk, monthly_cents in _iter_priced_disks(disks):
+        categories[category].append(disk)
+        category_cents[category] += monthly_cents
+
+        totals = sku_totals.get(disk.sku)
+        if totals is None:
+            totals = sku_totals[disk.sku] = [0, 0, 0]
+        totals[0] += 1
+        totals[1] += disk.size_gb
+        totals[2] += monthly_cents
+
+    category_costs = {category: cents / 100 for category, cents in category_cents.items()}
+    for totals in sku_totals.values():
+        totals[2] /= 100
+
+    return categories, category_costs, _sku_stats_from_totals(sku_totals)
+
+
 def get_detailed_disk_audit(
     credential, subscription_id: str, regions: Optional[List[str]] = None
 ) -> Tuple[Dict[str, Any], ApiErrors]:
@@ -239,29 +436,26 @@ def get_detailed_disk_audit(
     audit_results = {"summary": {}, "orphaned_disks": [], "pvc_disks": [], "aks_managed_disks": [], "cost_analysis": {}}
 
     try:
-        # Step 1: Fetch unattached disks using factory
+        # Step 1: Stream unattached disks using factory
         factory = get_client_factory()
         factory.credential = credential  # Use provided credential
         compute_client = factory.create_compute_client(subscription_id)
-        unattached_disks = fetch_unattached_disks(compute_client, regions)
-
-        # Step 2: Calculate costs for all disks
-        disks_with_costs = calculate_disk_costs(unattached_disks)
+        unattached_disks = _iter_unattached_disk_records(compute_client, regions)
 
-        # Step 3: Categorize disks
-        categories = categorize_disks(disks_with_costs)
+        # Step 2: Price, categorize and tally the disks in one pass as they arrive
+        categories, category_costs, by_sku = _price_and_categorize_disks(unattached_disks)
 
-        # Step 4: Assign to audit results
-        audit_results["orphaned_disks"] = categories["orphaned"]
-        audit_results["pvc_disks"] = categories["pvc"]
-        audit_results["aks_managed_disks"] = categories["aks_managed"]
+        # Step 3: Serialize the compact records for the audit results
+        audit_results["orphaned_disks"] = [disk._asdict() for disk in categories["orphaned"]]
+        audit_results["pvc_disks"] = [disk._asdict() for disk in categories["pvc"]]
+        audit_results["aks_managed_disks"] = [disk._asdict() for disk in categories["aks_managed"]]
 
-        # Step 5: Compile statistics
-        audit_results["summary"] = compile_audit_statistics(categories)
+        # Step 4: Compile statistics from the running totals
+        audit_results["summary"] = compile_audit_statistics(categories, category_costs)
 
-        # Step 6: Generate cost analysis
+        # Step 5: Generate cost analysis
         audit_results["cost_analysis"] = {
-            "by_sku": analyze_costs_by_sku(disks_with_costs),
+            "by_sku": by_sku,
             "recommendations": generate_disk_recommendations(audit_results),
         }
 
@@ -271,6 +465,50 @@ def get_detailed_disk_audit(
     return audit_results, api_errors
 
 
+def audit_subscriptions(
+    credential, subscription_ids: List[str], regions: Optional[List[str]] = None
+) -> Tuple[Dict[str, Any], ApiErrors]:
+    """
+    Run detailed disk audits for several subscriptions in parallel.
+
+    Listing disks is network-bound, so each subscription is audited in its own
+    worker thread (bounded by config.max_parallel_workers).
+
+    Args:
+        credential: Azure credential for authentication
+        subscription_ids: Azure subscription IDs to audit
+        regions: Optional list of regions to filter by
+
+    Returns:
+        Tuple of:
+        - Dictionary mapping subscription ID to its detailed disk audit
+        - Dictionary of any errors encountered, keyed by subscription ID
+    """
+    config = get_config()
+    audits: Dict[str, Any] = {}
+    api_errors: ApiErrors = {}
+
+    with ThreadPoolExecutor(max_workers=config.max_parallel_workers) as executor:
+        future_to_sub = {
+            executor.submit(get_detailed_disk_audit, credential, subscription_id, regions): subscription_id
+            for subscription_id in subscription_ids
+        }
+
+        for future in as_completed(future_to_sub):
+            subscription_id = future_to_sub[future]
+            try:
+                audit_results, errors = future.result()
+            except Exception as e:
+                api_errors[subscription_id] = f"Failed to perform disk audit: {str(e)}"
+                continue
+
+            audits[subscription_id] = audit_results
+            if errors:
+                api_errors[subscription_id] = errors["disk_audit"]
+
+    return audits, api_errors
+
+
 def analyze_costs_by_sku(disks: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
     """
     Analyze disk costs grouped by SKU type.
@@ -281,15 +519,36 @@ def analyze_costs_by_sku(disks: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any
     Returns:
         Dictionary with cost analysis by SKU
     """
-    sku_stats = defaultdict(lambda: {"count": 0, "total_gb": 0, "cost": 0})
+    sku_totals: Dict[str, List[Any]] = {}
 
     for disk in disks:
-        sku = disk["sku"]
-        sku_stats[sku]["count"] += 1
-        sku_stats[sku]["total_gb"] += disk["size_gb"]
-        sku_stats[sku]["cost"] += disk.get("monthly_cost", 0)
+        totals = sku_totals.get(disk["sku"])
+        if totals is None:
+            totals = sku_totals[disk["sku"]] = [0, 0, 0]
+        totals[0] += 1
+        totals[1] += disk["size_gb"]
+        totals[2] += disk.get("monthly_cost", 0)
 
-    return dict(sku_stats)
+    return _sku_stats_from_totals(sku_totals)
+
+
+def _sku_stats_from_totals(sku_totals: Dict[str, List[Any]]) -> Dict[str, Dict[str, Any]]:
+    """Expand per-SKU [count, total_gb, cost] accumulators into the reported statistics dicts."""
+    return {
+        sku: {"count": count, "total_gb": total_gb, "cost": cost} for sku, (count, total_gb, cost) in sku_totals.items()
+    }
+
+
+def get_disk_rate_table() -> Dict[str, float]:
+    """
+    Resolve the monthly per-GB rate for each known disk SKU.
+
+    Returns:
+        Dictionary mapping SKU name to monthly cost per GB in USD
+    """
+    rates = get_config().disk_cost_rates
+
+    return {sku: rates.get(rate_key, 0.05) for sku, rate_key in _DISK_SKU_RATE_KEYS.items()}
 
 
 def estimate_disk_cost(size_gb: int, sku_name: str) -> float:
@@ -303,18 +562,9 @@ def estimate_disk_cost(size_gb: int, sku_name: str) -> float:
     Returns:
         Estimated monthly cost in USD
     """
-    config = get_config()
-
-    # Map SKU names to cost rate keys
-    sku_mapping = {
-        "Standard_LRS": "standard_hdd",
-        "StandardSSD_LRS": "standard_ssd",
-        "Premium_LRS": "premium_ssd",
-        "UltraSSD_LRS": "ultra_disk",
-    }
-
-    rate_key = sku_mapping.get(sku_name, "standard_hdd")
-    rate_per_gb = config.disk_cost_rates.get(rate_key, 0.05)
+    rates = get_config().disk_cost_rates
+    rate_key = _DISK_SKU_RATE_KEYS.get(sku_name, _DISK_SKU_RATE_KEYS[_DEFAULT_DISK_SKU])
+    rate_per_gb = rates.get(rate_key, 0.05)
 
     return size_gb * rate_per_gb
 
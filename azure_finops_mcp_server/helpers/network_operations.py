@@ -3,10 +3,11 @@
 import logging
 from typing import Any, Dict, List, Optional, Tuple
 
-from azure.mgmt.network import NetworkManagementClient
-
 from azure_finops_mcp_server.config import get_config
+from azure_finops_mcp_server.helpers.azure_client_factory import get_client_factory
 from azure_finops_mcp_server.helpers.azure_utils import extract_resource_group
+from azure_finops_mcp_server.helpers.concurrent_util import iter_prefetched
+from azure_finops_mcp_server.helpers.retry_handler import get_retry_handler
 
 logger = logging.getLogger(__name__)
 
@@ -31,31 +32,32 @@ def get_unassociated_public_ips(
     """
     api_errors: ApiErrors = {}
     unassociated_ips = []
+    region_set = frozenset(regions) if regions else None
 
     try:
-        network_client = NetworkManagementClient(credential, subscription_id)
+        factory = get_client_factory()
+        factory.credential = credential  # Use provided credential
+        network_client = factory.create_network_client(subscription_id)
 
-        for public_ip in network_client.public_ip_addresses.list_all():
+        public_ips = iter_prefetched(network_client.public_ip_addresses.list_all(), get_retry_handler().fetch_next_page)
+        for public_ip in public_ips:
             # Filter by region if specified
-            if regions and public_ip.location not in regions:
+            if region_set and public_ip.location not in region_set:
                 continue
 
             # Check if IP is associated with any resource
             if public_ip.ip_configuration is None:
-                ip_info = {
-                    "name": public_ip.name,
-                    "resource_group": extract_resource_group(public_ip.id),
-                    "location": public_ip.location,
-                    "ip_address": public_ip.ip_address or "Not Assigned",
-                    "sku": public_ip.sku.name if public_ip.sku else "Basic",
-                    "allocation_method": public_ip.public_ip_allocation_method,
-                    "id": public_ip.id,
-                }
-
-                # Add cost estimate
-                ip_info["monthly_cost"] = estimate_public_ip_cost(ip_info["sku"], ip_info["allocation_method"])
-
-                unassociated_ips.append(ip_info)
+                unassociated_ips.append(
+                    unassociated_ip_info(
+                        public_ip.name,
+                        extract_resource_group(public_ip.id),
+                        public_ip.location,
+                        public_ip.ip_address,
+                        public_ip.sku.name if public_ip.sku else None,
+                        public_ip.public_ip_allocation_method,
+                        public_ip.id,
+                    )
+                )
 
     except Exception as e:
         api_errors["unassociated_ips"] = f"Failed to get unassociated IPs: {str(e)}"
@@ -63,6 +65,29 @@ def get_unassociated_public_ips(
     return {"unassociated_ips": unassociated_ips}, api_errors
 
 
+def unassociated_ip_info(
+    name: str,
+    resource_group: str,
+    location: str,
+    ip_address: Optional[str],
+    sku: Optional[str],
+    allocation_method: Optional[str],
+    ip_id: str,
+) -> Dict[str, Any]:
+    """Build the report entry of an unassociated public IP, with its cost estimate (SDK and Resource Graph audits)."""
+    sku = sku or "Basic"
+    return {
+        "name": name,
+        "resource_group": resource_group,
+        "location": location,
+        "ip_address": ip_address or "Not Assigned",
+        "sku": sku,
+        "allocation_method": allocation_method,
+        "id": ip_id,
+        "monthly_cost": estimate_public_ip_cost(sku, allocation_method),
+    }
+
+
 def estimate_public_ip_cost(sku: str, allocation_method: str) -> float:
     """
     Estimate monthly cost for a public IP address.
@@ -135,17 +160,20 @@ def get_network_security_groups(
     """
     api_errors: ApiErrors = {}
     nsgs = []
+    region_set = frozenset(regions) if regions else None
 
     try:
-        network_client = NetworkManagementClient(credential, subscription_id)
+        factory = get_client_factory()
+        factory.credential = credential  # Use provided credential
+        network_client = factory.create_network_client(subscription_id)
 
         for nsg in network_client.network_security_groups.list_all():
-            if regions and nsg.location not in regions:
+            if region_set and nsg.location not in region_set:
                 continue
 
             nsg_info = {
                 "name": nsg.name,
-                "resource_group": nsg.id.split("/")[4],
+                "resource_group": extract_resource_group(nsg.id),
                 "location": nsg.location,
                 "rules_count": len(nsg.security_rules) if nsg.security_rules else 0,
                 "default_rules_count": len(nsg.default_security_rules) if nsg.default_security_rules else 0,
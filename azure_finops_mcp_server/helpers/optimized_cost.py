@@ -13,6 +13,7 @@ from azure.mgmt.costmanagement.models import (
     QueryTimePeriod,
 )
 
+from .azure_client_factory import get_shared_transport
 from .concurrent_util import ConcurrentProcessor
 from .cost_filters import cost_filters
 from .subscription_manager import get_credential
@@ -46,7 +47,9 @@ class OptimizedCostProcessor:
         def process_single_subscription(sub_id: str) -> Dict[str, Any]:
             """Process a single subscription's cost data."""
             try:
-                cost_client = CostManagementClient(credential, base_url="https://management.azure.com")
+                cost_client = CostManagementClient(
+                    credential, base_url="https://management.azure.com", transport=get_shared_transport()
+                )
 
                 query_result = cost_client.query.usage(scope=f"/subscriptions/{sub_id}", parameters=query_definition)
 
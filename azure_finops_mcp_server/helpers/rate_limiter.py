@@ -3,14 +3,20 @@
 import logging
 import threading
 import time
-from collections import deque
 from dataclasses import dataclass
 from typing import Dict, Optional
 
+from azure_finops_mcp_server.config import get_config
+
 logger = logging.getLogger(__name__)
 
+_NS_PER_SECOND = 1_000_000_000
+
+# Number of bucket-creation lock stripes (a power of two, so a key maps to its stripe with a mask)
+_LOCK_STRIPES = 16
 
-@dataclass
+
+@dataclass(slots=True)
 class RateLimitConfig:
     """Configuration for rate limiting."""
 
@@ -22,7 +28,25 @@ class RateLimitConfig:
 
 
 class TokenBucket:
-    """Token bucket algorithm for rate limiting."""
+    """
+    Token bucket algorithm for rate limiting.
+
+    The only state is ``zero_time_ns``, the moment the bucket was (or will be)
+    empty; the token count is derived from it as
+    ``min((now - zero_time) * rate, capacity)``. Consumers compute the new
+    value without holding a lock and publish it with a compare-and-set,
+    retrying if another thread got there first, so the lock only guards a
+    single comparison and assignment.
+
+    Time is kept in integer nanoseconds of the monotonic clock and tokens are
+    measured as the nanoseconds it takes to earn them, so the hot path is
+    integer-only: no rounding drift and no negative gaps from clock jumps.
+
+    Rate and capacity are fixed at construction, so readers such as
+    RateLimiter.get_stats can take a consistent snapshot without the lock.
+    """
+
+    __slots__ = ("_rate", "_capacity", "ns_per_token", "capacity_ns", "zero_time_ns", "lock")
 
     def __init__(self, rate: float, capacity: int):
         """
@@ -32,39 +56,152 @@ class TokenBucket:
             rate: Tokens added per second
             capacity: Maximum bucket capacity
         """
-        self.rate = rate
-        self.capacity = capacity
-        self.tokens = capacity
-        self.last_update = time.time()
+        self._rate = rate
+        self._capacity = capacity
+        self.ns_per_token = max(1, round(_NS_PER_SECOND / rate))
+        self.capacity_ns = capacity * self.ns_per_token
+        # Start full: the bucket was empty exactly capacity / rate seconds ago
+        self.zero_time_ns = time.monotonic_ns() - self.capacity_ns
         self.lock = threading.Lock()
 
-    def consume(self, tokens: int = 1) -> bool:
+    @property
+    def rate(self) -> float:
+        """Tokens added per second."""
+        return self._rate
+
+    @property
+    def capacity(self) -> int:
+        """Maximum bucket capacity."""
+        return self._capacity
+
+    def consume(self, tokens: int = 1, now_ns: Optional[int] = None) -> bool:
         """
         Attempt to consume tokens from the bucket.
 
         Args:
             tokens: Number of tokens to consume
+            now_ns: Current time.monotonic_ns() reading, for callers that already have one
 
         Returns:
             True if tokens were consumed, False if insufficient tokens
         """
+        needed_ns = tokens * self.ns_per_token
+        # One clock read per call; compare-and-set retries reuse it
+        if now_ns is None:
+            now_ns = time.monotonic_ns()
+        capacity_ns = self.capacity_ns
+        lock = self.lock
+
+        while True:
+            zero_time_ns = self.zero_time_ns
+            available_ns = now_ns - zero_time_ns
+            if available_ns > capacity_ns:
+                available_ns = capacity_ns
+
+            if available_ns < needed_ns:
+                return False
+
+            # Compare-and-set, inlined on the hot path (see _compare_and_set)
+            with lock:
+                if self.zero_time_ns == zero_time_ns:
+                    self.zero_time_ns = now_ns - available_ns + needed_ns
+                    return True
+
+    def reserve(self, tokens: int = 1, now_ns: Optional[int] = None) -> float:
+        """
+        Reserve tokens, going into debt if the bucket does not hold enough yet.
+
+        Args:
+            tokens: Number of tokens to reserve
+            now_ns: Current time.monotonic_ns() reading, for callers that already have one
+
+        Returns:
+            Seconds to wait before the reserved tokens are actually available (0.0 if immediate)
+        """
+        needed_ns = tokens * self.ns_per_token
+        if now_ns is None:
+            now_ns = time.monotonic_ns()
+
+        while True:
+            zero_time_ns = self.zero_time_ns
+            # Negative when earlier reservations are still outstanding
+            available_ns = min(now_ns - zero_time_ns, self.capacity_ns)
+
+            if self._compare_and_set(zero_time_ns, now_ns - available_ns + needed_ns):
+                return max(0, needed_ns - available_ns) / _NS_PER_SECOND
+
+    def available_tokens(self) -> float:
+        """
+        Get the number of tokens currently available.
+
+        Returns:
+            Available tokens (between 0 and capacity; 0 while reservations are outstanding)
+        """
+        available_ns = min(time.monotonic_ns() - self.zero_time_ns, self.capacity_ns)
+        return max(0, available_ns) / self.ns_per_token
+
+    def _compare_and_set(self, expected: int, new: int) -> bool:
+        """Publish a new zero_time_ns if no other consumer changed it since it was read."""
         with self.lock:
-            self._refill()
+            if self.zero_time_ns != expected:
+                return False
+            self.zero_time_ns = new
+            return True
+
 
-            if self.tokens >= tokens:
-                self.tokens -= tokens
-                return True
-            return False
+class RequestWindow:
+    """
+    Sliding-window request counter built from fixed one-second slots.
 
-    def _refill(self):
-        """Refill bucket based on elapsed time."""
-        now = time.time()
-        elapsed = now - self.last_update
+    Recording a request increments the current slot; slots that fall out of
+    the window are zeroed as the clock advances, so memory is constant and
+    counting is O(window_seconds) regardless of request volume.
+    """
 
-        # Add tokens based on elapsed time
-        tokens_to_add = elapsed * self.rate
-        self.tokens = min(self.capacity, self.tokens + tokens_to_add)
-        self.last_update = now
+    __slots__ = ("slots", "last_tick", "lock")
+
+    def __init__(self, window_seconds: int):
+        """
+        Initialize request window.
+
+        Args:
+            window_seconds: Length of the window in seconds (one slot per second)
+        """
+        self.slots = [0] * max(1, window_seconds)
+        self.last_tick = int(time.monotonic())
+        self.lock = threading.Lock()
+
+    def record(self) -> None:
+        """Count one request in the current second."""
+        tick = int(time.monotonic())
+        with self.lock:
+            self._advance(tick)
+            self.slots[tick % len(self.slots)] += 1
+
+    def count(self) -> int:
+        """
+        Count requests within the window.
+
+        Returns:
+            Number of requests recorded during the last window_seconds
+        """
+        with self.lock:
+            self._advance(int(time.monotonic()))
+            return sum(self.slots)
+
+    def _advance(self, tick: int) -> None:
+        """Zero the slots of the seconds elapsed since the last update."""
+        elapsed = tick - self.last_tick
+        if elapsed <= 0:
+            return
+
+        size = len(self.slots)
+        if elapsed >= size:
+            self.slots = [0] * size
+        else:
+            for offset in range(1, elapsed + 1):
+                self.slots[(self.last_tick + offset) % size] = 0
+        self.last_tick = tick
 
 
 class RateLimiter:
@@ -79,8 +216,10 @@ class RateLimiter:
         """
         self.config = config or RateLimitConfig()
         self.buckets: Dict[str, TokenBucket] = {}
-        self.request_history: Dict[str, deque] = {}
+        self.request_windows: Dict[str, RequestWindow] = {}
         self.lock = threading.Lock()
+        # Striped locks for bucket creation, so distinct subscriptions never contend
+        self.shard_locks = [threading.Lock() for _ in range(_LOCK_STRIPES)]
 
         if not self.config.enabled:
             logger.info("Rate limiting is disabled")
@@ -101,22 +240,32 @@ class RateLimiter:
 
         bucket_key = key if self.config.per_subscription and key else "global"
 
-        with self.lock:
-            if bucket_key not in self.buckets:
-                self.buckets[bucket_key] = TokenBucket(
-                    rate=self.config.requests_per_second, capacity=self.config.burst_size
-                )
-
-            bucket = self.buckets[bucket_key]
-
         # Try to consume tokens
-        if bucket.consume(tokens):
+        if self._get_bucket(bucket_key).consume(tokens):
             self._record_request(bucket_key)
             return True
 
         logger.warning(f"Rate limit exceeded for {bucket_key}")
         return False
 
+    def _get_bucket(self, bucket_key: str) -> TokenBucket:
+        """Get the bucket for a key, creating it on first use."""
+        # Lock-free lookup on the hot path; only the key's stripe is locked to create a bucket
+        bucket = self.buckets.get(bucket_key)
+        if bucket is None:
+            with self.shard_locks[self._shard(bucket_key)]:
+                bucket = self.buckets.get(bucket_key)
+                if bucket is None:
+                    bucket = self.buckets[bucket_key] = TokenBucket(
+                        rate=self.config.requests_per_second, capacity=self.config.burst_size
+                    )
+        return bucket
+
+    @staticmethod
+    def _shard(key: str) -> int:
+        """Map a bucket key to its lock stripe."""
+        return hash(key) & (_LOCK_STRIPES - 1)
+
     def wait_if_needed(self, key: Optional[str] = None, tokens: int = 1) -> None:
         """
         Wait if necessary to respect rate limits.
@@ -128,18 +277,24 @@ class RateLimiter:
         if not self.config.enabled:
             return
 
-        while not self.acquire(key, tokens):
-            # Wait for tokens to refill
-            wait_time = 1.0 / self.config.requests_per_second
+        bucket_key = key if self.config.per_subscription and key else "global"
+
+        # Reserve the tokens up front and sleep once until they are due, in arrival order
+        wait_time = self._get_bucket(bucket_key).reserve(tokens)
+        self._record_request(bucket_key)
+
+        if wait_time > 0:
             logger.debug(f"Rate limited, waiting {wait_time:.2f}s")
             time.sleep(wait_time)
 
     def _record_request(self, key: str):
-        """Record request timestamp for monitoring."""
-        if key not in self.request_history:
-            self.request_history[key] = deque(maxlen=1000)
+        """Count the request in the key's sliding window for monitoring."""
+        window = self.request_windows.get(key)
+        if window is None:
+            # setdefault is atomic, so concurrent first requests share one window
+            window = self.request_windows.setdefault(key, RequestWindow(self.config.window_seconds))
 
-        self.request_history[key].append(time.time())
+        window.record()
 
     def get_stats(self, key: Optional[str] = None) -> Dict[str, float]:
         """
@@ -158,21 +313,18 @@ class RateLimiter:
 
         bucket_key = key if self.config.per_subscription and key else "global"
 
-        if bucket_key in self.buckets:
-            bucket = self.buckets[bucket_key]
-            with bucket.lock:
-                bucket._refill()
-                stats["tokens_available"] = float(bucket.tokens)
-                stats["capacity"] = float(bucket.capacity)
-                stats["rate"] = float(bucket.rate)
-
-        if bucket_key in self.request_history:
-            history = self.request_history[bucket_key]
-            if history:
-                now = time.time()
-                recent_requests = sum(1 for t in history if now - t < self.config.window_seconds)
-                stats["recent_requests"] = float(recent_requests)
-                stats["requests_per_second"] = float(recent_requests) / float(self.config.window_seconds)
+        # Lock-free snapshot: the token count is derived from a single field read
+        bucket = self.buckets.get(bucket_key)
+        if bucket is not None:
+            stats["tokens_available"] = float(bucket.available_tokens())
+            stats["capacity"] = float(bucket.capacity)
+            stats["rate"] = float(bucket.rate)
+
+        window = self.request_windows.get(bucket_key)
+        if window is not None:
+            recent_requests = window.count()
+            stats["recent_requests"] = float(recent_requests)
+            stats["requests_per_second"] = float(recent_requests) / float(self.config.window_seconds)
 
         return stats
 
@@ -183,46 +335,51 @@ class RateLimiter:
         Args:
             key: Optional key to reset, or None to reset all
         """
-        with self.lock:
-            if key:
-                if key in self.buckets:
-                    del self.buckets[key]
-                if key in self.request_history:
-                    del self.request_history[key]
-            else:
+        if key:
+            with self.shard_locks[self._shard(key)]:
+                self.buckets.pop(key, None)
+                self.request_windows.pop(key, None)
+        else:
+            with self.lock:
                 self.buckets.clear()
-                self.request_history.clear()
+                self.request_windows.clear()
 
         logger.info(f"Rate limiter reset for {key or 'all keys'}")
 
 
 # Global rate limiter instance
 _rate_limiter: Optional[RateLimiter] = None
+_rate_limiter_lock = threading.Lock()
 
 
 def get_rate_limiter() -> RateLimiter:
     """Get global rate limiter instance."""
     global _rate_limiter
 
-    if _rate_limiter is None:
-        from azure_finops_mcp_server.config import get_config
+    # Fast path: no lock once the limiter exists
+    rate_limiter = _rate_limiter
+    if rate_limiter is not None:
+        return rate_limiter
 
-        config = get_config()
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            config = get_config()
 
-        rate_config = RateLimitConfig(
-            enabled=config.rate_limit_enabled,
-            requests_per_second=config.rate_limit_requests_per_second,
-            burst_size=config.rate_limit_burst_size,
-            window_seconds=config.rate_limit_window_seconds,
-            per_subscription=config.rate_limit_per_subscription,
-        )
+            rate_config = RateLimitConfig(
+                enabled=config.rate_limit_enabled,
+                requests_per_second=config.rate_limit_requests_per_second,
+                burst_size=config.rate_limit_burst_size,
+                window_seconds=config.rate_limit_window_seconds,
+                per_subscription=config.rate_limit_per_subscription,
+            )
 
-        _rate_limiter = RateLimiter(rate_config)
+            _rate_limiter = RateLimiter(rate_config)
 
-    return _rate_limiter
+        return _rate_limiter
 
 
 def reset_rate_limiter():
     """Reset global rate limiter."""
     global _rate_limiter
-    _rate_limiter = None
+    with _rate_limiter_lock:
+        _rate_limiter = None
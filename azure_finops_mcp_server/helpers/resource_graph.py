@@ -0,0 +1,221 @@
+"""Azure Resource Graph queries for auditing many subscriptions at once.
+
+One Resource Graph query covers every subscription, so the stopped VM,
+unattached disk and unassociated public IP audits cost a handful of paged
+requests in total instead of one paged ARM listing per subscription and
+resource type. The per-subscription SDK auditors remain the fallback when
+the azure-mgmt-resourcegraph package is missing, the feature is disabled, or
+the caller lacks read access to Resource Graph.
+"""
+
+from collections import defaultdict
+from itertools import groupby
+from operator import itemgetter
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from azure_finops_mcp_server.config import get_config
+from azure_finops_mcp_server.helpers.azure_client_factory import get_shared_transport
+from azure_finops_mcp_server.helpers.azure_utils import extract_resource_group
+from azure_finops_mcp_server.helpers.disk_operations import unattached_disk_category, unattached_disks_result
+from azure_finops_mcp_server.helpers.network_operations import unassociated_ip_info
+from azure_finops_mcp_server.helpers.retry_handler import get_retry_handler
+from azure_finops_mcp_server.helpers.vm_operations import (
+    STOPPED_POWER_CODES,
+    calculate_vm_statistics,
+    stopped_vm_info,
+)
+
+try:
+    from azure.mgmt.resourcegraph import ResourceGraphClient
+    from azure.mgmt.resourcegraph.models import QueryRequest, QueryRequestOptions
+except ImportError:
+    ResourceGraphClient = None
+
+ApiErrors = Dict[str, str]
+
+# Result of one SDK-equivalent auditor: (result, api_errors)
+AuditResult = Tuple[Dict[str, Any], ApiErrors]
+
+# Rows returned per page (the Resource Graph maximum)
+_PAGE_SIZE = 1000
+
+# Every VM with its power state, so the statistics can count the VMs checked
+_VMS_QUERY = (
+    "Resources"
+    " | where type =~ 'microsoft.compute/virtualmachines'{region_filter}"
+    " | extend powerState = tostring(properties.extended.instanceView.powerState.code)"
+    " | project subscriptionId, id, name, location,"
+    " vmSize = tostring(properties.hardwareProfile.vmSize), powerState"
+    " | order by subscriptionId asc"
+)
+_UNATTACHED_DISKS_QUERY = (
+    "Resources"
+    " | where type =~ 'microsoft.compute/disks'{region_filter}"
+    " | where isempty(managedBy)"
+    " | project subscriptionId, id, name, location,"
+    " sku = tostring(sku.name), sizeGb = toint(properties.diskSizeGB)"
+    " | order by subscriptionId asc"
+)
+_UNASSOCIATED_PUBLIC_IPS_QUERY = (
+    "Resources"
+    " | where type =~ 'microsoft.network/publicipaddresses'{region_filter}"
+    " | where isnull(properties.ipConfiguration)"
+    " | project subscriptionId, id, name, location,"
+    " ipAddress = tostring(properties.ipAddress), sku = tostring(sku.name),"
+    " allocationMethod = tostring(properties.publicIPAllocationMethod)"
+    " | order by subscriptionId asc"
+)
+
+
+def is_resource_graph_enabled() -> bool:
+    """Whether audits should query Azure Resource Graph (SDK installed and enabled in config)."""
+    return ResourceGraphClient is not None and get_config().use_resource_graph
+
+
+def _region_filter(regions: Optional[List[str]]) -> str:
+    """Build the KQL location clause for a region list (empty when no regions are given)."""
+    if not regions:
+        return ""
+    quoted = ", ".join("'" + region.replace("\\", "\\\\").replace("'", "\\'") + "'" for region in regions)
+    return f" | where location in ({quoted})"
+
+
+def _arg_query(credential, subscription_ids: List[str], kql: str) -> Iterator[Dict[str, Any]]:
+    """
+    Run a Resource Graph query over several subscriptions, following skip tokens.
+
+    Each page request goes through the retry handler, so throttled pages are
+    retried with backoff.
+
+    Args:
+        credential: Azure credential for authentication
+        subscription_ids: Subscriptions to query
+        kql: Resource Graph (KQL) query
+
+    Yields:
+        One dictionary per result row
+    """
+    client = ResourceGraphClient(credential, transport=get_shared_transport())
+    retry_handler = get_retry_handler()
+    skip_token = None
+
+    while True:
+        request = QueryRequest(
+            subscriptions=subscription_ids,
+            query=kql,
+            options=QueryRequestOptions(top=_PAGE_SIZE, skip_token=skip_token, result_format="objectArray"),
+        )
+        response = retry_handler.execute_with_retry(client.resources, request)
+        yield from response.data
+        skip_token = response.skip_token
+        if not skip_token:
+            return
+
+
+def audit_with_resource_graph(
+    credential, subscription_ids: List[str], regions: Optional[List[str]] = None
+) -> Dict[str, Tuple[AuditResult, AuditResult, AuditResult]]:
+    """
+    Audit stopped VMs, unattached disks and unassociated public IPs of many subscriptions.
+
+    Results have the same shape as get_stopped_vms, get_unattached_disks
+    (with PVC and AKS-managed disks categorized but not included) and
+    get_unassociated_public_ips.
+
+    Args:
+        credential: Azure credential for authentication
+        subscription_ids: Azure subscription IDs to audit
+        regions: Optional list of regions to filter by
+
+    Returns:
+        Dictionary mapping subscription ID to its (VM, disk, public IP) audit results
+
+    Raises:
+        Exception: Any Resource Graph failure, so callers can fall back to the SDK auditors
+    """
+    region_filter = _region_filter(regions)
+    # Resource Graph may report subscription IDs in a different case than requested
+    requested_ids = {sub_id.lower(): sub_id for sub_id in subscription_ids}
+    total_vms: Dict[str, int] = defaultdict(int)
+    stopped_vms: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    unattached_disks: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    disk_categories: Dict[str, Dict[str, List[Dict[str, Any]]]] = defaultdict(
+        lambda: {"orphaned": [], "pvc": [], "aks_managed": []}
+    )
+    unassociated_ips: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+
+    def row_runs(query: str) -> Iterator[Tuple[str, Iterator[Dict[str, Any]]]]:
+        # The queries order rows by subscription, so the subscription ID is resolved and its
+        # result lists are looked up once per run of rows rather than once per row. Runs still
+        # accumulate into the per-subscription lists, so a subscription split across runs is safe.
+        rows = _arg_query(credential, subscription_ids, query.format(region_filter=region_filter))
+        for raw_id, run in groupby(rows, key=itemgetter("subscriptionId")):
+            yield requested_ids.get(raw_id.lower(), raw_id), run
+
+    for sub_id, run in row_runs(_VMS_QUERY):
+        stopped = stopped_vms[sub_id]
+        checked = 0
+        for row in run:
+            checked += 1
+            if row.get("powerState") in STOPPED_POWER_CODES:
+                vm_id = row["id"]
+                stopped.append(
+                    stopped_vm_info(
+                        row["name"],
+                        extract_resource_group(vm_id),
+                        row["location"],
+                        row.get("vmSize") or "Unknown",
+                        vm_id,
+                    )
+                )
+        total_vms[sub_id] += checked
+
+    for sub_id, run in row_runs(_UNATTACHED_DISKS_QUERY):
+        categories = disk_categories[sub_id]
+        orphaned = unattached_disks[sub_id]
+        for row in run:
+            disk_id = row["id"]
+            resource_group = extract_resource_group(disk_id)
+            disk_info = {
+                "name": row["name"],
+                "resource_group": resource_group,
+                "location": row["location"],
+                "size_gb": row.get("sizeGb"),
+                "sku": row.get("sku") or "Unknown",
+                "id": disk_id,
+            }
+            category = unattached_disk_category(disk_info["name"], resource_group)
+            categories[category].append(disk_info)
+            if category == "orphaned":
+                orphaned.append(disk_info)
+
+    for sub_id, run in row_runs(_UNASSOCIATED_PUBLIC_IPS_QUERY):
+        unassociated = unassociated_ips[sub_id]
+        for row in run:
+            ip_id = row["id"]
+            unassociated.append(
+                unassociated_ip_info(
+                    row["name"],
+                    extract_resource_group(ip_id),
+                    row["location"],
+                    row.get("ipAddress"),
+                    row.get("sku"),
+                    row.get("allocationMethod"),
+                    ip_id,
+                )
+            )
+
+    return {
+        sub_id: (
+            (
+                {
+                    "stopped_vms": stopped_vms[sub_id],
+                    "statistics": calculate_vm_statistics(stopped_vms[sub_id], total_vms[sub_id]),
+                },
+                {},
+            ),
+            (unattached_disks_result(unattached_disks[sub_id], disk_categories[sub_id]), {}),
+            ({"unassociated_ips": unassociated_ips[sub_id]}, {}),
+        )
+        for sub_id in subscription_ids
+    }
@@ -4,7 +4,7 @@ import logging
 import random
 import time
 from functools import wraps
-from typing import Any, Callable, Optional, Tuple, Type
+from typing import Any, Callable, Iterator, Optional, Tuple, Type
 
 from azure.core.exceptions import (
     ClientAuthenticationError,
@@ -103,6 +103,27 @@ class RetryHandler:
 
         return max(0, backoff)
 
+    def retry_after(self, exception: Exception) -> Optional[float]:
+        """
+        Read the server-requested delay from a throttled response's Retry-After header.
+
+        Args:
+            exception: The exception that occurred
+
+        Returns:
+            Delay in seconds (capped at max_backoff), or None if the response gives none
+        """
+        response = getattr(exception, "response", None)
+        headers = getattr(response, "headers", None)
+        if not headers:
+            return None
+
+        try:
+            # ARM sends delta-seconds; the HTTP-date form is left to the computed backoff
+            return min(float(headers.get("Retry-After")), self.config.max_backoff)
+        except (TypeError, ValueError):
+            return None
+
     def should_retry(self, exception: Exception) -> bool:
         """
         Determine if an exception should trigger a retry.
@@ -170,7 +191,8 @@ class RetryHandler:
                 last_exception = e
 
                 if attempt < self.config.max_retries and self.should_retry(e):
-                    backoff = self.calculate_backoff(attempt)
+                    # Wait at least as long as a throttling response asked for
+                    backoff = max(self.calculate_backoff(attempt), self.retry_after(e) or 0)
                     self.stats["total_retries"] += 1
 
                     logger.warning(
@@ -187,6 +209,18 @@ class RetryHandler:
         logger.error(f"Operation failed after {self.config.max_retries} retries: {str(last_exception)}")
         raise last_exception
 
+    def fetch_next_page(self, pages: Iterator[Any]) -> Any:
+        """
+        Fetch the next page of a paged Azure listing with retries.
+
+        Args:
+            pages: Page iterator, e.g. from ItemPaged.by_page()
+
+        Returns:
+            The next page, or None once the listing is exhausted
+        """
+        return self.execute_with_retry(next, pages, None)
+
     def get_stats(self) -> dict:
         """Get retry statistics."""
         return {
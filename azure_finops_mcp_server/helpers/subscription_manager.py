@@ -9,25 +9,170 @@ explicit command lists (not shell=True) provides additional safety.
 
 import json
 import logging
+import os
 import subprocess  # Used only for trusted Azure CLI commands
+import tempfile
+import threading
+import time
 from collections import defaultdict
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
-from azure.identity import AzureCliCredential, DefaultAzureCredential
+from azure.core.credentials import AccessToken
+from azure.identity import AzureCliCredential, CredentialUnavailableError, DefaultAzureCredential
+
+from azure_finops_mcp_server.config import get_config
+
+try:
+    from azure.mgmt.resource import SubscriptionClient
+except ImportError:  # azure-mgmt-resource 25+ ships it separately as azure-mgmt-subscription
+    try:
+        from azure.mgmt.subscription import SubscriptionClient
+    except ImportError:
+        SubscriptionClient = None
 
 logger = logging.getLogger(__name__)
 
 ApiErrors = Dict[str, str]
 
+# Cached credential and its expiry (monotonic clock)
+_credential: Optional[Any] = None
+_credential_expires_at: float = 0.0
+_credential_lock = threading.Lock()
+
+# Cached subscription list and its expiry (monotonic clock)
+_subscriptions: List[Dict[str, str]] = []
+_subscriptions_expires_at: float = 0.0
+_subscriptions_lock = threading.Lock()
+
+# Cached `az account show` result and its expiry (monotonic clock)
+_current_subscription: Optional[Dict[str, str]] = None
+_current_subscription_expires_at: float = 0.0
 
-def get_azure_subscriptions() -> List[Dict[str, str]]:
+# Cached tokens are replaced this many seconds before they expire
+_TOKEN_REFRESH_MARGIN_SECONDS = 300
+
+
+class CachingCredential:
     """
-    Get list of Azure subscriptions available via Azure CLI.
+    Token credential wrapper that reuses tokens until shortly before they expire.
+
+    AzureCliCredential keeps no token cache and runs `az account
+    get-access-token` on every get_token call, while each SDK client's
+    authentication policy only caches the token it fetched itself. Sharing one
+    wrapper across all clients fetches a token once per scope and lifetime.
+    """
+
+    def __init__(self, inner: Any):
+        """
+        Initialize the wrapper.
+
+        Args:
+            inner: Credential that fetches the tokens
+        """
+        self.inner = inner
+        self._tokens: Dict[Tuple[Tuple[str, ...], bool], AccessToken] = {}
+        self._lock = threading.Lock()
+
+    def get_token(
+        self, *scopes: str, claims: Optional[str] = None, tenant_id: Optional[str] = None, **kwargs: Any
+    ) -> AccessToken:
+        """
+        Get an access token for the scopes, fetching it only when the cached one is about to expire.
+
+        Requests with claims or a tenant override are not cached, since they ask
+        for a token other than the default one.
+        """
+        if claims or tenant_id:
+            return self.inner.get_token(*scopes, claims=claims, tenant_id=tenant_id, **kwargs)
+
+        key = (scopes, bool(kwargs.get("enable_cae")))
+        # Fetch under the lock so concurrent callers wait for one token rather than each fetching one
+        with self._lock:
+            token = self._tokens.get(key)
+            if token is None or token.expires_on - time.time() <= _TOKEN_REFRESH_MARGIN_SECONDS:
+                token = self._tokens[key] = self.inner.get_token(*scopes, **kwargs)
+            return token
+
+    def close(self) -> None:
+        """Close the wrapped credential."""
+        self.inner.close()
+
+
+def get_azure_subscriptions(clear_cache: bool = False) -> List[Dict[str, str]]:
+    """
+    Get list of Azure subscriptions available to the signed-in identity.
     Similar to AWS profiles but for Azure subscriptions.
 
+    Subscriptions are listed in-process with the SDK SubscriptionClient when it
+    is installed, falling back to `az account list`. Either lookup costs far
+    more than the lookups made with its result, so the output is cached for
+    config.subscription_cache_ttl_seconds, both in memory and in
+    config.subscription_cache_file so later server processes skip it too.
+    Failed lookups are not cached so a later `az login` takes effect
+    immediately.
+
+    Args:
+        clear_cache: Discard the cached list (in memory and on disk) and query Azure again
+
     Returns:
         List of subscription dictionaries with id, name, and other metadata
     """
+    global _subscriptions, _subscriptions_expires_at, _current_subscription, _current_subscription_expires_at
+
+    config = get_config()
+    ttl = config.subscription_cache_ttl_seconds
+    cache_file = os.path.expanduser(config.subscription_cache_file)
+
+    with _subscriptions_lock:
+        if clear_cache:
+            _subscriptions = []
+            _subscriptions_expires_at = 0.0
+            _current_subscription = None
+            _current_subscription_expires_at = 0.0
+            _remove_subscription_cache(cache_file)
+
+        if _subscriptions and time.monotonic() < _subscriptions_expires_at:
+            return list(_subscriptions)
+
+        subscriptions, ttl_left = _read_subscription_cache(cache_file, ttl) if ttl > 0 else ([], 0.0)
+        if not subscriptions:
+            subscriptions = _list_azure_subscriptions()
+            ttl_left = ttl
+            if subscriptions and ttl > 0:
+                _write_subscription_cache(cache_file, subscriptions)
+
+        if subscriptions:
+            _subscriptions = subscriptions
+            _subscriptions_expires_at = time.monotonic() + ttl_left
+        return list(subscriptions)
+
+
+def _list_azure_subscriptions() -> List[Dict[str, str]]:
+    """List subscriptions via the SDK, or the Azure CLI when the SDK client is unavailable or fails."""
+    if SubscriptionClient is not None:
+        try:
+            return _list_subscriptions_with_sdk()
+        except Exception as e:
+            logger.warning(f"SubscriptionClient listing failed: {str(e)}, falling back to Azure CLI")
+    return _list_subscriptions_with_cli()
+
+
+def _list_subscriptions_with_sdk() -> List[Dict[str, str]]:
+    """
+    List subscriptions through ARM in-process, in the same shape as `az account list`.
+
+    The SDK does not know which subscription the CLI treats as current, so
+    entries carry no isDefault flag.
+    """
+    client = SubscriptionClient(get_credential())
+    return [
+        {"id": sub.subscription_id, "name": sub.display_name, "state": sub.state, "tenantId": sub.tenant_id}
+        for sub in client.subscriptions.list()
+    ]
+
+
+def _list_subscriptions_with_cli() -> List[Dict[str, str]]:
+    """Run `az account list` and parse its output."""
     try:
         # Security: Hardcoded Azure CLI command - no user input injected
         result = subprocess.run(
@@ -40,6 +185,94 @@ def get_azure_subscriptions() -> List[Dict[str, str]]:
         return []
 
 
+def _read_subscription_cache(cache_file: str, ttl: int) -> Tuple[List[Dict[str, str]], float]:
+    """Load the cached subscription list if the file is younger than ttl; returns it with its remaining TTL."""
+    try:
+        age = time.time() - os.path.getmtime(cache_file)
+        if age >= ttl:
+            return [], 0.0
+        with open(cache_file, "r") as f:
+            return json.load(f), ttl - age
+    except FileNotFoundError:
+        return [], 0.0
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"Ignoring unreadable subscription cache {cache_file}: {str(e)}")
+        return [], 0.0
+
+
+def _write_subscription_cache(cache_file: str, subscriptions: List[Dict[str, str]]) -> None:
+    """Write the subscription list atomically, so concurrent readers never see a partial file."""
+    try:
+        cache_dir = os.path.dirname(cache_file)
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=cache_dir, prefix=".subscriptions-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(subscriptions, f)
+            os.replace(temp_path, cache_file)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+    except OSError as e:
+        logger.warning(f"Failed to write subscription cache {cache_file}: {str(e)}")
+
+
+def _remove_subscription_cache(cache_file: str) -> None:
+    """Delete the subscription cache file if it exists."""
+    try:
+        os.remove(cache_file)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"Failed to remove subscription cache {cache_file}: {str(e)}")
+
+
+def _get_current_subscription() -> Dict[str, str]:
+    """
+    Get the Azure CLI's current subscription via `az account show`.
+
+    Only needed when the subscription list carries no isDefault flag (the SDK
+    listing never does), in which case every default-subscription request
+    would otherwise spawn the CLI. The result is cached in memory for
+    config.subscription_cache_ttl_seconds, like the subscription list.
+
+    Returns:
+        The current subscription's details
+
+    Raises:
+        subprocess.CalledProcessError: The CLI failed (e.g. not logged in); failures are not cached
+        json.JSONDecodeError: The CLI printed something other than JSON
+    """
+    global _current_subscription, _current_subscription_expires_at
+
+    with _subscriptions_lock:
+        if _current_subscription is not None and time.monotonic() < _current_subscription_expires_at:
+            return _current_subscription
+
+        # Security: Hardcoded Azure CLI command - no user input injected
+        result = subprocess.run(
+            ["az", "account", "show", "--output", "json"], capture_output=True, text=True, check=True
+        )
+        current_sub = json.loads(result.stdout)
+
+        ttl = get_config().subscription_cache_ttl_seconds
+        if ttl > 0:
+            _current_subscription = current_sub
+            _current_subscription_expires_at = time.monotonic() + ttl
+        return current_sub
+
+
+def reset_subscriptions() -> None:
+    """Drop the in-memory subscription list; the next call reloads it from the cache file or the Azure CLI."""
+    global _subscriptions, _subscriptions_expires_at, _current_subscription, _current_subscription_expires_at
+
+    with _subscriptions_lock:
+        _subscriptions = []
+        _subscriptions_expires_at = 0.0
+        _current_subscription = None
+        _current_subscription_expires_at = 0.0
+
+
 def profiles_to_use(
     profiles: Optional[List[str]] = None, all_profiles: Optional[bool] = False
 ) -> Tuple[Dict[str, List[str]], ApiErrors]:
@@ -65,9 +298,8 @@ def profiles_to_use(
         profile_errors["azure_cli"] = "No Azure subscriptions found. Please run 'az login'"
         return subscription_to_names_map, profile_errors
 
-    # Create lookup dictionaries for fast access
-    subscription_by_name = {sub["name"]: sub for sub in available_subscriptions}
-    subscription_by_id = {sub["id"]: sub for sub in available_subscriptions}
+    # Single lookup table keyed by both ID and name; names are written last so they win over a colliding ID
+    subscription_lookup = {sub[key]: sub for key in ("id", "name") for sub in available_subscriptions}
 
     if all_profiles:
         # Return all available subscriptions
@@ -76,25 +308,22 @@ def profiles_to_use(
     elif profiles:
         # Filter to specified profiles
         for profile in profiles:
-            if profile in subscription_by_name:
-                sub = subscription_by_name[profile]
-                subscription_to_names_map[sub["id"]].append(sub["name"])
-            elif profile in subscription_by_id:
-                sub = subscription_by_id[profile]
+            sub = subscription_lookup.get(profile)
+            if sub is not None:
                 subscription_to_names_map[sub["id"]].append(sub["name"])
             else:
                 profile_errors[profile] = f"Subscription '{profile}' not found"
     else:
-        # Default to current subscription
-        try:
-            # Security: Hardcoded Azure CLI command - no user input injected
-            result = subprocess.run(
-                ["az", "account", "show", "--output", "json"], capture_output=True, text=True, check=True
-            )
-            current_sub = json.loads(result.stdout)
+        # Default to current subscription; `az account list` already flags it with isDefault
+        current_sub = next((sub for sub in available_subscriptions if sub.get("isDefault")), None)
+        if current_sub is not None:
             subscription_to_names_map[current_sub["id"]].append(current_sub["name"])
-        except (subprocess.CalledProcessError, json.JSONDecodeError) as e:
-            profile_errors["current"] = f"Failed to get current subscription: {str(e)}"
+        else:
+            try:
+                current_sub = _get_current_subscription()
+                subscription_to_names_map[current_sub["id"]].append(current_sub["name"])
+            except (subprocess.CalledProcessError, json.JSONDecodeError) as e:
+                profile_errors["current"] = f"Failed to get current subscription: {str(e)}"
 
     return subscription_to_names_map, profile_errors
 
@@ -104,17 +333,50 @@ def get_credential():
     Get Azure credential for authentication.
     First tries AzureCliCredential, falls back to DefaultAzureCredential.
 
+    The resolved credential is cached for config.cache_ttl_seconds so the
+    token probe (which shells out to the Azure CLI) is not repeated on every
+    call. It is wrapped in a CachingCredential, so the probe's token and every
+    later token are shared by all clients until shortly before they expire.
+
     Returns:
-        Azure credential object for authentication
+        CachingCredential wrapping the Azure credential
+    """
+    global _credential, _credential_expires_at
+
+    with _credential_lock:
+        if _credential is not None and time.monotonic() < _credential_expires_at:
+            return _credential
+
+        _credential = _create_credential()
+        _credential_expires_at = time.monotonic() + get_config().cache_ttl_seconds
+        return _credential
+
+
+def _create_credential():
+    """
+    Create and validate a new Azure credential.
+
+    Falls back to DefaultAzureCredential only when the Azure CLI credential is
+    unavailable (CLI missing, not logged in, timed out). Any other failure,
+    such as the CLI rejecting the login, is raised to the caller.
     """
     try:
         # Try Azure CLI credential first (most common for local development)
-        credential = AzureCliCredential()
-        # Test the credential by attempting to get a token
+        credential = CachingCredential(AzureCliCredential())
+        # Test the credential by attempting to get a token (which is then cached for the clients)
         credential.get_token("https://management.azure.com/.default")
         logger.info("Using Azure CLI credential")
         return credential
-    except Exception as e:
-        logger.warning(f"Azure CLI credential failed: {str(e)}, falling back to DefaultAzureCredential")
+    except CredentialUnavailableError as e:
+        logger.warning(f"Azure CLI credential unavailable: {str(e)}, falling back to DefaultAzureCredential")
         # Fall back to DefaultAzureCredential which tries multiple methods
-        return DefaultAzureCredential()
+        return CachingCredential(DefaultAzureCredential())
+
+
+def reset_credential() -> None:
+    """Drop the cached credential so the next call re-authenticates."""
+    global _credential, _credential_expires_at
+
+    with _credential_lock:
+        _credential = None
+        _credential_expires_at = 0.0
@@ -5,8 +5,9 @@ This module maintains the original API while delegating to focused modules.
 """
 
 from .budget_operations_refactored import analyze_spending_trends, generate_budget_recommendations, get_budget_data
-from .cost_filters import build_complex_filter, cost_filters, parse_filter_string, validate_filters
+from .cost_filters import build_complex_filter, cost_filters, map_group_by, parse_filter_string, validate_filters
 from .disk_operations import (
+    audit_subscriptions,
     estimate_disk_cost,
     generate_disk_recommendations,
     get_detailed_disk_audit,
@@ -38,6 +39,7 @@ __all__ = [
     # Disk operations
     "get_unattached_disks",
     "get_detailed_disk_audit",
+    "audit_subscriptions",
     "estimate_disk_cost",
     "generate_disk_recommendations",
     # Network operations
@@ -55,4 +57,5 @@ __all__ = [
     "parse_filter_string",
     "validate_filters",
     "build_complex_filter",
+    "map_group_by",
 ]
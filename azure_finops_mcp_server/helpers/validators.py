@@ -2,13 +2,53 @@
 
 import logging
 import re
-from datetime import date, datetime, timedelta
+from datetime import date, timedelta
 from functools import wraps
 from typing import Any, Dict, List, Optional, Union
 
+from azure_finops_mcp_server.helpers.azure_utils import parse_iso_date
+
 logger = logging.getLogger(__name__)
 
 
+# Common Azure regions (not exhaustive)
+_VALID_REGIONS = frozenset(
+    {
+        "eastus",
+        "eastus2",
+        "westus",
+        "westus2",
+        "westus3",
+        "centralus",
+        "northcentralus",
+        "southcentralus",
+        "westcentralus",
+        "northeurope",
+        "westeurope",
+        "uksouth",
+        "ukwest",
+        "eastasia",
+        "southeastasia",
+        "japaneast",
+        "japanwest",
+        "australiaeast",
+        "australiasoutheast",
+        "centralindia",
+        "canadacentral",
+        "canadaeast",
+        "brazilsouth",
+        "francecentral",
+        "germanywestcentral",
+        "norwayeast",
+        "switzerlandnorth",
+        "uaenorth",
+        "southafricanorth",
+        "koreacentral",
+        "koreasouth",
+    }
+)
+
+
 class ValidationError(Exception):
     """Exception raised for validation errors."""
 
@@ -67,45 +107,10 @@ class Validators:
         Raises:
             ValidationError: If invalid
         """
-        # Common Azure regions (not exhaustive)
-        valid_regions = {
-            "eastus",
-            "eastus2",
-            "westus",
-            "westus2",
-            "westus3",
-            "centralus",
-            "northcentralus",
-            "southcentralus",
-            "westcentralus",
-            "northeurope",
-            "westeurope",
-            "uksouth",
-            "ukwest",
-            "eastasia",
-            "southeastasia",
-            "japaneast",
-            "japanwest",
-            "australiaeast",
-            "australiasoutheast",
-            "centralindia",
-            "canadacentral",
-            "canadaeast",
-            "brazilsouth",
-            "francecentral",
-            "germanywestcentral",
-            "norwayeast",
-            "switzerlandnorth",
-            "uaenorth",
-            "southafricanorth",
-            "koreacentral",
-            "koreasouth",
-        }
-
         if not region:
             raise ValidationError("region", "Region cannot be empty")
 
-        if region.lower() not in valid_regions:
+        if region.lower() not in _VALID_REGIONS:
             raise ValidationError("region", f"Invalid region '{region}'. Must be a valid Azure region.")
 
         return True
@@ -129,8 +134,7 @@ class Validators:
             raise ValidationError(field_name, "Date cannot be empty")
 
         try:
-            parsed_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-            return parsed_date
+            return parse_iso_date(date_str)
         except ValueError:
             raise ValidationError(field_name, "Invalid date format. Use YYYY-MM-DD")
 
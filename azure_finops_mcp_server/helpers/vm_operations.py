@@ -9,32 +9,46 @@ from azure.mgmt.compute import ComputeManagementClient
 from azure_finops_mcp_server.config import get_config
 from azure_finops_mcp_server.helpers.azure_client_factory import get_client_factory
 from azure_finops_mcp_server.helpers.azure_utils import calculate_yearly_cost, extract_resource_group, format_cost
+from azure_finops_mcp_server.helpers.concurrent_util import iter_prefetched
+from azure_finops_mcp_server.helpers.retry_handler import get_retry_handler
 
 logger = logging.getLogger(__name__)
 
 ApiErrors = Dict[str, str]
 
+# Power states reported as stopped VMs, matched exactly against each status code.
+# Stopped (not deallocated) VMs keep their compute allocation and are still billed for it.
+STOPPED_POWER_CODES = frozenset({"PowerState/deallocated", "PowerState/stopped"})
 
-def get_vm_instance_view_batch(compute_client: ComputeManagementClient, vm_list: List[Any]) -> Dict[str, Any]:
+
+def get_vm_instance_view_batch(
+    compute_client: ComputeManagementClient, vm_list: List[Any], max_workers: Optional[int] = None
+) -> Dict[str, Any]:
     """
     Get instance views for multiple VMs in parallel to avoid N+1 queries.
 
+    Each call goes through the retry handler, so throttled (429) or transient
+    failures are retried with backoff. VMs whose instance view still cannot be
+    fetched are logged and left out of the result.
+
     Args:
         compute_client: Azure compute management client
         vm_list: List of VM objects
+        max_workers: Maximum concurrent calls (defaults to config.max_parallel_workers)
 
     Returns:
         Dictionary mapping VM ID to instance view
     """
     config = get_config()
+    retry_handler = get_retry_handler()
     instance_views = {}
 
     def fetch_instance_view(vm):
         """Fetch instance view for a single VM."""
         try:
             resource_group = extract_resource_group(vm.id)
-            instance_view = compute_client.virtual_machines.instance_view(
-                resource_group_name=resource_group, vm_name=vm.name
+            instance_view = retry_handler.execute_with_retry(
+                compute_client.virtual_machines.instance_view, resource_group_name=resource_group, vm_name=vm.name
             )
             return vm.id, instance_view
         except Exception as e:
@@ -42,7 +56,7 @@ def get_vm_instance_view_batch(compute_client: ComputeManagementClient, vm_list:
             return vm.id, None
 
     # Use ThreadPoolExecutor for parallel fetching
-    with ThreadPoolExecutor(max_workers=config.max_parallel_workers) as executor:
+    with ThreadPoolExecutor(max_workers=max_workers or config.max_parallel_workers) as executor:
         future_to_vm = {executor.submit(fetch_instance_view, vm): vm for vm in vm_list}
 
         for future in as_completed(future_to_vm):
@@ -58,26 +72,28 @@ def _process_vm_for_stopped_status(vm, instance_view) -> Optional[Dict[str, Any]
     if not instance_view or not instance_view.statuses:
         return None
 
-    for status in instance_view.statuses:
-        if status.code and "PowerState/deallocated" in status.code:
-            vm_info = {
-                "name": vm.name,
-                "resource_group": extract_resource_group(vm.id),
-                "location": vm.location,
-                "vm_size": vm.hardware_profile.vm_size if vm.hardware_profile else "Unknown",
-                "id": vm.id,
-            }
+    if not any(status.code in STOPPED_POWER_CODES for status in instance_view.statuses):
+        return None
+
+    vm_size = vm.hardware_profile.vm_size if vm.hardware_profile else "Unknown"
+    return stopped_vm_info(vm.name, extract_resource_group(vm.id), vm.location, vm_size, vm.id)
 
-            # Add cost estimation
-            monthly_cost = estimate_vm_monthly_cost(vm_info["vm_size"])
-            vm_info["estimated_monthly_cost"] = monthly_cost
-            vm_info["estimated_annual_cost"] = calculate_yearly_cost(monthly_cost)
 
-            return vm_info
-    return None
+def stopped_vm_info(name: str, resource_group: str, location: str, vm_size: str, vm_id: str) -> Dict[str, Any]:
+    """Build the report entry of a stopped VM, with its cost estimates (also used by the Resource Graph audit)."""
+    monthly_cost = estimate_vm_monthly_cost(vm_size)
+    return {
+        "name": name,
+        "resource_group": resource_group,
+        "location": location,
+        "vm_size": vm_size,
+        "id": vm_id,
+        "estimated_monthly_cost": monthly_cost,
+        "estimated_annual_cost": calculate_yearly_cost(monthly_cost),
+    }
 
 
-def _calculate_vm_statistics(stopped_vms: List[Dict], total_vms: int) -> Dict[str, Any]:
+def calculate_vm_statistics(stopped_vms: List[Dict], total_vms: int) -> Dict[str, Any]:
     """Calculate statistics for stopped VMs."""
     total_monthly_waste = sum(vm["estimated_monthly_cost"] for vm in stopped_vms)
     return {
@@ -106,28 +122,47 @@ def get_stopped_vms(
     """
     api_errors: ApiErrors = {}
     stopped_vms = []
+    region_set = frozenset(regions) if regions else None
 
     try:
         # Use factory to create compute client for better testability
         factory = get_client_factory()
+        factory.credential = credential  # Use provided credential
         compute_client = factory.create_compute_client(subscription_id)
 
-        # Get all VMs and filter by region
-        all_vms = list(compute_client.virtual_machines.list_all())
-        filtered_vms = [vm for vm in all_vms if vm.location in regions] if regions else all_vms
-
-        # Get instance views in batch
-        instance_views = get_vm_instance_view_batch(compute_client, filtered_vms)
+        # Get all VMs with their instance views (power state) in one listing. Each VM is reduced to its
+        # report entry as pages stream in, so the full VM models (OS, network and storage profiles, tags, ...)
+        # are never held for the whole subscription
+        all_vms = iter_prefetched(
+            compute_client.virtual_machines.list_all(expand="instanceView"), get_retry_handler().fetch_next_page
+        )
+        total_vms = 0
+        missing_views = []
+        for vm in all_vms:
+            if region_set and vm.location not in region_set:
+                continue
+            total_vms += 1
+
+            if vm.instance_view is None:
+                # Only VMs the listing returned without an instance view need a per-VM call
+                missing_views.append(vm)
+                continue
+            vm_info = _process_vm_for_stopped_status(vm, vm.instance_view)
+            if vm_info:
+                stopped_vms.append(vm_info)
 
-        # Process each VM
-        for vm in filtered_vms:
+        instance_views = get_vm_instance_view_batch(compute_client, missing_views) if missing_views else {}
+        for vm in missing_views:
             instance_view = instance_views.get(vm.id)
+            if instance_view is None:
+                api_errors[f"instance_view:{vm.name}"] = f"Failed to get instance view for VM {vm.name}"
+                continue
             vm_info = _process_vm_for_stopped_status(vm, instance_view)
             if vm_info:
                 stopped_vms.append(vm_info)
 
         # Calculate statistics
-        statistics = _calculate_vm_statistics(stopped_vms, len(filtered_vms))
+        statistics = calculate_vm_statistics(stopped_vms, total_vms)
 
         result = {"stopped_vms": stopped_vms, "statistics": statistics}
 
@@ -148,13 +183,11 @@ def estimate_vm_monthly_cost(vm_size: str) -> float:
     Returns:
         Estimated monthly cost in USD
     """
-    config = get_config()
-
-    # Use hourly rates from config and convert to monthly
-    hourly_rate = config.vm_cost_rates.get(vm_size, config.vm_cost_rates.get("default", 0.10))
-    monthly_cost = hourly_rate * config.hours_per_month
+    # Monthly rates are precomputed once per config, so this is a single dict hit
+    monthly_rates = get_config().vm_monthly_cost_rates
+    monthly_cost = monthly_rates.get(vm_size)
 
-    return round(monthly_cost, 2)
+    return monthly_rates["default"] if monthly_cost is None else monthly_cost
 
 
 def calculate_vm_waste(stopped_vms: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -173,7 +206,9 @@ def calculate_vm_waste(stopped_vms: List[Dict[str, Any]]) -> Dict[str, Any]:
 
     for vm in stopped_vms:
         vm_size = vm.get("vm_size", "Unknown")
-        monthly_cost = vm.get("estimated_monthly_cost", estimate_vm_monthly_cost(vm_size))
+        monthly_cost = vm.get("estimated_monthly_cost")
+        if monthly_cost is None:
+            monthly_cost = estimate_vm_monthly_cost(vm_size)
 
         vm_waste[vm["name"]] = monthly_cost
         total_waste += monthly_cost
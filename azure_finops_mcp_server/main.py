@@ -1,17 +1,26 @@
+import asyncio
+import logging
 from collections import defaultdict
-from datetime import date, datetime, timedelta
-from typing import Any, Dict, List, Optional
+from datetime import date, timedelta
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, Tuple
 
 from azure.mgmt.costmanagement import CostManagementClient
 from azure.mgmt.costmanagement.models import (
     QueryAggregation,
     QueryDataset,
     QueryDefinition,
+    QueryFilter,
     QueryGrouping,
     QueryTimePeriod,
 )
 from mcp.server.fastmcp import FastMCP
 
+from azure_finops_mcp_server.config import get_config
+from azure_finops_mcp_server.helpers.azure_client_factory import get_shared_transport
+from azure_finops_mcp_server.helpers.azure_utils import aggregate_cost_rows, parse_iso_date
+from azure_finops_mcp_server.helpers.cache_manager import get_cache
+from azure_finops_mcp_server.helpers.resource_graph import audit_with_resource_graph, is_resource_graph_enabled
 from azure_finops_mcp_server.helpers.util import (
     cost_filters,
     get_budget_data,
@@ -19,12 +28,80 @@ from azure_finops_mcp_server.helpers.util import (
     get_stopped_vms,
     get_unassociated_public_ips,
     get_unattached_disks,
+    map_group_by,
     profiles_to_use,
 )
 
+logger = logging.getLogger(__name__)
+
 mcp = FastMCP("azure_finops")
 
 
+def _query_subscription_cost(
+    cost_mgmt_client: CostManagementClient,
+    subscription_id: str,
+    primary_name: str,
+    period_start_date: date,
+    period_end_date: date,
+    query_filter: Optional[QueryFilter],
+    azure_group_by: str,
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Run the cost query for a single subscription.
+
+    Args:
+        cost_mgmt_client: Cost Management client shared across subscriptions
+        subscription_id: Azure subscription ID
+        primary_name: Subscription name used for reporting
+        period_start_date: Start date for cost period
+        period_end_date: End date for cost period
+        query_filter: Optional cost query filter
+        azure_group_by: Grouping dimension
+
+    Returns:
+        Tuple of the cost_data key and the processed cost data (or error) for the subscription
+    """
+    try:
+        # Create query definition
+        time_period = QueryTimePeriod(from_property=period_start_date, to=period_end_date)
+
+        # Create dataset with grouping
+        dataset = QueryDataset(
+            granularity="None",
+            aggregation={"totalCost": QueryAggregation(name="Cost", function="Sum")},
+            grouping=[QueryGrouping(type="Dimension", name=azure_group_by)],
+        )
+
+        if query_filter:
+            dataset.filter = query_filter
+
+        query_definition = QueryDefinition(type="Usage", timeframe="Custom", time_period=time_period, dataset=dataset)
+
+        # Execute query
+        scope = f"/subscriptions/{subscription_id}"
+        query_result = cost_mgmt_client.query.usage(scope=scope, parameters=query_definition)
+
+        # Process results
+        total_cost, service_costs = aggregate_cost_rows(query_result.rows)
+
+        # Filter out negligible costs, then order the rest by cost (descending)
+        significant_costs = [(k, v) for k, v in service_costs.items() if v > 0.001]
+        sorted_service_costs = sorted(significant_costs, key=itemgetter(1), reverse=True)
+        processed_service_costs = {k: round(v, 2) for k, v in sorted_service_costs}
+
+        return f"Subscription: {primary_name}", {
+            "Subscription ID": subscription_id,
+            "Period Start Date": period_start_date.isoformat(),
+            "Period End Date": period_end_date.isoformat(),
+            "Total Cost": round(total_cost, 2),
+            f"Cost By {azure_group_by}": processed_service_costs,
+            "Status": "success",
+        }
+
+    except Exception as e:
+        return primary_name, {"subscription_name": primary_name, "status": "error", "message": str(e)}
+
+
 @mcp.tool(annotations={"readOnlyHint": True})
 async def get_cost(
     profiles: Optional[List[str]] = None,
@@ -68,111 +145,98 @@ async def get_cost(
         if not profiles_to_query:
             return {"error": "No valid Azure subscriptions found."}
 
-    cost_data = {}
     credential = get_credential()
 
     # Map AWS group_by values to Azure equivalents
-    group_by_map = {
-        "SERVICE": "ServiceName",
-        "REGION": "ResourceLocation",
-        "INSTANCE_TYPE": "MeterSubcategory",
-        "RESOURCE_ID": "ResourceId",
-        "RESOURCE_GROUP": "ResourceGroupName",
-    }
-    azure_group_by = group_by_map.get(group_by, group_by)
+    azure_group_by = map_group_by(group_by)
 
-    for subscription_id, subscription_names in profiles_to_query.items():
-        primary_name = subscription_names[0]
+    # Prepare time period (shared by every subscription)
+    first_name = next(iter(profiles_to_query.values()))[0]
+    today = date.today()
+    period_start_date: date
+    period_end_date: date
 
+    if start_date_iso and end_date_iso:
         try:
-            cost_mgmt_client = CostManagementClient(credential, base_url="https://management.azure.com")
-
-            # Prepare time period
-            today = date.today()
-            period_start_date: date
-            period_end_date: date
-
-            if start_date_iso and end_date_iso:
-                try:
-                    period_start_date = datetime.strptime(start_date_iso, "%Y-%m-%d").date()
-                    period_end_date = datetime.strptime(end_date_iso, "%Y-%m-%d").date()
-                    if period_start_date > period_end_date:
-                        return {
-                            "profile_name": primary_name,
-                            "status": "error",
-                            "message": "Start date cannot be after end date.",
-                        }
-                except ValueError:
-                    return {
-                        "profile_name": primary_name,
-                        "status": "error",
-                        "message": "Invalid date format. Use YYYY-MM-DD.",
-                    }
-            elif time_range_days is not None:
-                if time_range_days <= 0:
-                    return {
-                        "profile_name": primary_name,
-                        "status": "error",
-                        "message": "time_range_days must be positive.",
-                    }
-                period_end_date = today
-                period_start_date = today - timedelta(days=time_range_days - 1)
-            else:  # Default to current month to date
-                period_start_date = today.replace(day=1)
-                period_end_date = today
-
-            # Create query definition
-            time_period = QueryTimePeriod(from_property=period_start_date, to=period_end_date)
-
-            # Build filters
-            filter_kwargs = cost_filters(tags, dimensions)
-
-            # Create dataset with grouping
-            dataset = QueryDataset(
-                granularity="None",
-                aggregation={"totalCost": QueryAggregation(name="Cost", function="Sum")},
-                grouping=[QueryGrouping(type="Dimension", name=azure_group_by)],
-            )
-
-            if filter_kwargs.get("filter"):
-                dataset.filter = filter_kwargs["filter"]
+            period_start_date = parse_iso_date(start_date_iso)
+            period_end_date = parse_iso_date(end_date_iso)
+            if period_start_date > period_end_date:
+                return {
+                    "profile_name": first_name,
+                    "status": "error",
+                    "message": "Start date cannot be after end date.",
+                }
+        except ValueError:
+            return {
+                "profile_name": first_name,
+                "status": "error",
+                "message": "Invalid date format. Use YYYY-MM-DD.",
+            }
+    elif time_range_days is not None:
+        if time_range_days <= 0:
+            return {
+                "profile_name": first_name,
+                "status": "error",
+                "message": "time_range_days must be positive.",
+            }
+        period_end_date = today
+        period_start_date = today - timedelta(days=time_range_days - 1)
+    else:  # Default to current month to date
+        period_start_date = today.replace(day=1)
+        period_end_date = today
+
+    # Build filters
+    query_filter = cost_filters(tags, dimensions)
+
+    # Cost queries are scoped per request, so a single client (and its connection pool) serves every subscription
+    config = get_config()
+    cost_mgmt_client = CostManagementClient(
+        credential, base_url=config.azure_management_url, transport=get_shared_transport()
+    )
+
+    # Query subscriptions concurrently; each blocking SDK call runs in a worker thread
+    semaphore = asyncio.Semaphore(config.max_parallel_workers)
+
+    # Successful results are cached (when enabled) so repeated refreshes skip the API call
+    cache = get_cache()
+    query_params = {
+        "start": period_start_date.isoformat(),
+        "end": period_end_date.isoformat(),
+        "group_by": azure_group_by,
+        # Only the first spec of each list is applied to the query, so order is part of the key
+        "tags": list(tags or []),
+        "dimensions": list(dimensions or []),
+    }
 
-            query_definition = QueryDefinition(
-                type="Usage", timeframe="Custom", time_period=time_period, dataset=dataset
+    async def _fetch_one(subscription_id: str, primary_name: str) -> Tuple[str, Dict[str, Any]]:
+        cache_key = cache.make_key("cost", subscription_id=subscription_id, name=primary_name, **query_params)
+        cached_result = cache.get(cache_key)
+        if cached_result is not None:
+            return cached_result
+
+        async with semaphore:
+            result = await asyncio.to_thread(
+                _query_subscription_cost,
+                cost_mgmt_client,
+                subscription_id,
+                primary_name,
+                period_start_date,
+                period_end_date,
+                query_filter,
+                azure_group_by,
             )
 
-            # Execute query
-            scope = f"/subscriptions/{subscription_id}"
-            query_result = cost_mgmt_client.query.usage(scope=scope, parameters=query_definition)
-
-            # Process results
-            total_cost = 0.0
-            service_costs = defaultdict(float)
-
-            if query_result.rows:
-                for row in query_result.rows:
-                    # Row format: [cost_value, dimension_value]
-                    if len(row) >= 2:
-                        cost = float(row[0]) if row[0] else 0.0
-                        service = row[1] if row[1] else "Unknown"
-                        total_cost += cost
-                        service_costs[service] += cost
-
-            # Sort and filter service costs
-            sorted_service_costs = dict(sorted(service_costs.items(), key=lambda item: item[1], reverse=True))
-            processed_service_costs = {k: round(v, 2) for k, v in sorted_service_costs.items() if v > 0.001}
-
-            cost_data[f"Subscription: {primary_name}"] = {
-                "Subscription ID": subscription_id,
-                "Period Start Date": period_start_date.isoformat(),
-                "Period End Date": period_end_date.isoformat(),
-                "Total Cost": round(total_cost, 2),
-                f"Cost By {azure_group_by}": processed_service_costs,
-                "Status": "success",
-            }
+        if result[1].get("Status") == "success":
+            cache.set(cache_key, result)
+        return result
 
-        except Exception as e:
-            cost_data[primary_name] = {"subscription_name": primary_name, "status": "error", "message": str(e)}
+    results = await asyncio.gather(
+        *(
+            _fetch_one(subscription_id, subscription_names[0])
+            for subscription_id, subscription_names in profiles_to_query.items()
+        )
+    )
+    cost_data = dict(results)
 
     return {"accounts_cost_data": cost_data, "errors_for_profiles": errors_for_profiles}
 
@@ -212,34 +276,64 @@ async def run_finops_audit(
 
     credential = get_credential()
 
-    for subscription_id, subscription_names in profiles_to_query.items():
-        primary_name = subscription_names[0]
-
-        # Get stopped VMs
-        stopped_vms, vm_errors = get_stopped_vms(credential, subscription_id, regions)
+    # Every auditor is a blocking SDK call, so run them all in worker threads: the four checks of a
+    # subscription overlap each other, and subscriptions overlap each other, bounded by the worker limit
+    semaphore = asyncio.Semaphore(get_config().max_parallel_workers)
 
-        # Get unattached disks
-        unattached_disks, disk_errors = get_unattached_disks(credential, subscription_id, regions)
+    async def _run_auditor(auditor, *args) -> Tuple[Any, Dict[str, str]]:
+        async with semaphore:
+            return await asyncio.to_thread(auditor, credential, *args)
 
-        # Get unassociated public IPs
-        unassociated_ips, ip_errors = get_unassociated_public_ips(credential, subscription_id, regions)
-
-        # Get budget data
-        budget_status, budget_errors = get_budget_data(credential, subscription_id)
+    # Budgets are never covered by Resource Graph, so start them now to overlap the graph query
+    budget_audits = {
+        subscription_id: asyncio.create_task(_run_auditor(get_budget_data, subscription_id))
+        for subscription_id in profiles_to_query
+    }
 
-        audit_report[f"Subscription: {primary_name}"].append(
-            {
-                "Subscription ID": subscription_id,
-                "Stopped/Deallocated VMs": stopped_vms,
-                "Unattached Managed Disks": unattached_disks,
-                "Unassociated Public IPs": unassociated_ips,
-                "Budget Status": budget_status,
-                "Errors getting VMs": vm_errors,
-                "Errors getting Disks": disk_errors,
-                "Errors getting Public IPs": ip_errors,
-                "Errors getting Budgets": budget_errors,
-            }
-        )
+    # One Resource Graph query per resource type covers every subscription; without it (or when it
+    # fails, e.g. for lack of access) each subscription's resources are listed through the SDK
+    graph_audits: Dict[str, Any] = {}
+    if is_resource_graph_enabled():
+        try:
+            graph_audits = await asyncio.to_thread(
+                audit_with_resource_graph, credential, list(profiles_to_query), regions
+            )
+        except Exception as e:
+            logger.warning(f"Resource Graph audit failed: {str(e)}, falling back to per-subscription listing")
+
+    async def _audit_one(subscription_id: str) -> Dict[str, Any]:
+        graph_audit = graph_audits.get(subscription_id)
+        if graph_audit:
+            (stopped_vms, vm_errors), (unattached_disks, disk_errors), (unassociated_ips, ip_errors) = graph_audit
+            budget_status, budget_errors = await budget_audits[subscription_id]
+        else:
+            (
+                (stopped_vms, vm_errors),
+                (unattached_disks, disk_errors),
+                (unassociated_ips, ip_errors),
+                (budget_status, budget_errors),
+            ) = await asyncio.gather(
+                _run_auditor(get_stopped_vms, subscription_id, regions),
+                _run_auditor(get_unattached_disks, subscription_id, regions),
+                _run_auditor(get_unassociated_public_ips, subscription_id, regions),
+                budget_audits[subscription_id],
+            )
+        return {
+            "Subscription ID": subscription_id,
+            "Stopped/Deallocated VMs": stopped_vms,
+            "Unattached Managed Disks": unattached_disks,
+            "Unassociated Public IPs": unassociated_ips,
+            "Budget Status": budget_status,
+            "Errors getting VMs": vm_errors,
+            "Errors getting Disks": disk_errors,
+            "Errors getting Public IPs": ip_errors,
+            "Errors getting Budgets": budget_errors,
+        }
+
+    subscription_audits = await asyncio.gather(*(_audit_one(subscription_id) for subscription_id in profiles_to_query))
+
+    for subscription_names, subscription_audit in zip(profiles_to_query.values(), subscription_audits):
+        audit_report[f"Subscription: {subscription_names[0]}"].append(subscription_audit)
 
     return {"Audit Report": dict(audit_report), "Error processing subscriptions": errors_for_profiles}
 
@@ -1,8 +1,8 @@
 """Refactored main module with parallel processing and improved architecture."""
 
 import logging
-from collections import defaultdict
-from datetime import date, datetime, timedelta
+from datetime import date, timedelta
+from operator import itemgetter
 from typing import Any, Dict, List, Optional
 
 from azure.mgmt.costmanagement import CostManagementClient
@@ -16,6 +16,8 @@ from azure.mgmt.costmanagement.models import (
 from mcp.server.fastmcp import FastMCP
 
 from azure_finops_mcp_server.config import get_config
+from azure_finops_mcp_server.helpers.azure_client_factory import get_shared_transport
+from azure_finops_mcp_server.helpers.azure_utils import aggregate_cost_rows, parse_iso_date
 from azure_finops_mcp_server.helpers.parallel_processor import ParallelSubscriptionProcessor, parallel_cost_aggregation
 from azure_finops_mcp_server.helpers.util import (
     cost_filters,
@@ -24,6 +26,7 @@ from azure_finops_mcp_server.helpers.util import (
     get_stopped_vms,
     get_unassociated_public_ips,
     get_unattached_disks,
+    map_group_by,
     profiles_to_use,
 )
 
@@ -59,7 +62,9 @@ def process_single_subscription_cost(
         Cost data dictionary for the subscription
     """
     try:
-        cost_mgmt_client = CostManagementClient(credential, base_url="https://management.azure.com")
+        cost_mgmt_client = CostManagementClient(
+            credential, base_url="https://management.azure.com", transport=get_shared_transport()
+        )
 
         # Create query definition
         time_period = QueryTimePeriod(from_property=period_start_date, to=period_end_date)
@@ -84,20 +89,12 @@ def process_single_subscription_cost(
         query_result = cost_mgmt_client.query.usage(scope=scope, parameters=query_definition)
 
         # Process results
-        total_cost = 0.0
-        service_costs = defaultdict(float)
-
-        if query_result.rows:
-            for row in query_result.rows:
-                if len(row) >= 2:
-                    cost = float(row[0]) if row[0] else 0.0
-                    service = row[1] if row[1] else "Unknown"
-                    total_cost += cost
-                    service_costs[service] += cost
+        total_cost, service_costs = aggregate_cost_rows(query_result.rows)
 
-        # Sort and filter service costs
-        sorted_service_costs = dict(sorted(service_costs.items(), key=lambda item: item[1], reverse=True))
-        processed_service_costs = {k: round(v, 2) for k, v in sorted_service_costs.items() if v > 0.001}
+        # Filter out negligible costs, then order the rest by cost (descending)
+        significant_costs = [(k, v) for k, v in service_costs.items() if v > 0.001]
+        sorted_service_costs = sorted(significant_costs, key=itemgetter(1), reverse=True)
+        processed_service_costs = {k: round(v, 2) for k, v in sorted_service_costs}
 
         return {
             "Subscription ID": subscription_id,
@@ -161,14 +158,7 @@ async def get_cost(
     credential = get_credential()
 
     # Map AWS group_by values to Azure equivalents
-    group_by_map = {
-        "SERVICE": "ServiceName",
-        "REGION": "ResourceLocation",
-        "INSTANCE_TYPE": "MeterSubcategory",
-        "RESOURCE_ID": "ResourceId",
-        "RESOURCE_GROUP": "ResourceGroupName",
-    }
-    azure_group_by = group_by_map.get(group_by, group_by)
+    azure_group_by = map_group_by(group_by)
 
     # Prepare time period
     today = date.today()
@@ -177,8 +167,8 @@ async def get_cost(
 
     if start_date_iso and end_date_iso:
         try:
-            period_start_date = datetime.strptime(start_date_iso, "%Y-%m-%d").date()
-            period_end_date = datetime.strptime(end_date_iso, "%Y-%m-%d").date()
+            period_start_date = parse_iso_date(start_date_iso)
+            period_end_date = parse_iso_date(end_date_iso)
             if period_start_date > period_end_date:
                 return {"status": "error", "message": "Start date cannot be after end date."}
         except ValueError:
@@ -1,11 +1,22 @@
 #!/usr/bin/env python3
 """Performance benchmarking script for Azure FinOps MCP Server."""
 
+import argparse
+import asyncio
+import atexit
+import contextlib
+import cProfile
+import json
+import logging
 import os
+import random
 import statistics
 import sys
+import threading
 import time
 import tracemalloc
+from itertools import islice
+from pathlib import Path
 from typing import Any, Dict, List
 from unittest.mock import MagicMock, Mock
 
@@ -17,6 +28,7 @@ import azure_finops_mcp_server.helpers.azure_client_factory as client_factory
 import azure_finops_mcp_server.helpers.disk_operations as disk_ops
 import azure_finops_mcp_server.helpers.network_operations as network_ops
 import azure_finops_mcp_server.helpers.vm_operations as vm_ops
+from azure_finops_mcp_server.helpers.cache_manager import CacheManager
 from azure_finops_mcp_server.helpers.concurrent_util import ConcurrentProcessor
 
 # Import mock factory from tests
@@ -24,11 +36,75 @@ sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "tes
 from test_client_factory import MockAzureClientFactory
 
 
+def _read_status_kb(*fields: str) -> List[int]:
+    """Read memory fields (e.g. VmRSS, VmHWM) of /proc/self/status in KB with a single file read."""
+    values = {}
+    with open("/proc/self/status") as status:
+        for line in status:
+            name, _, value = line.partition(":")
+            if name in fields:
+                values[name] = int(value.split()[0])
+    return [values[field] for field in fields]
+
+
+def _reset_peak_rss() -> bool:
+    """
+    Reset the process's peak RSS (VmHWM) to its current RSS, so the next peak belongs to one call.
+
+    Peak RSS is otherwise a process-lifetime high-water mark that warmed-up calls
+    never raise. Only Linux supports the reset (via /proc/self/clear_refs).
+
+    Returns:
+        Whether the peak was reset
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _format_mb(memory) -> str:
+    """Format a memory measurement given in MB (in KB below 1MB), or n/a where it could not be measured."""
+    if memory is None:
+        return "n/a"
+    return f"{memory * 1024:.0f}KB" if memory < 1 else f"{memory:.1f}MB"
+
+
+# Simulated subscription IDs, built once; benchmarks take prefixes so every path sees the same objects
+SUBSCRIPTIONS = tuple(f"sub-{i}" for i in range(1000))
+
+
+@contextlib.contextmanager
+def _quiet_processor_logs():
+    """Mute ConcurrentProcessor's per-subscription INFO lines, which would dominate short simulated calls."""
+    processor_logger = logging.getLogger(ConcurrentProcessor.__module__)
+    log_level = processor_logger.level
+    processor_logger.setLevel(logging.WARNING)
+    try:
+        yield
+    finally:
+        processor_logger.setLevel(log_level)
+
+
 class BenchmarkSuite:
     """Performance benchmarking suite."""
 
-    def __init__(self):
+    def __init__(self, deep_memory: bool = False, profile: bool = False):
         self.results = {}
+        # Dump a cProfile .prof file per benchmark category (open with snakeviz or pstats)
+        self.profile = profile
+        # Chrome trace ("X" complete) events of every measured call, viewable in chrome://tracing or Perfetto
+        self.trace_events = []
+        # Peak RSS sampling is nearly free; tracemalloc sees per-call allocations but slows every
+        # allocation down, so it is opt-in
+        self.deep_memory = deep_memory
+        # Trace allocations for the whole session: installing and removing the allocator hook
+        # around every measured call costs more than the calls themselves
+        if deep_memory and not tracemalloc.is_tracing():
+            tracemalloc.start(1)
+            atexit.register(tracemalloc.stop)
         self.setup_mock_environment()
 
     def setup_mock_environment(self):
@@ -40,20 +116,72 @@ class BenchmarkSuite:
         # Configure test subscription
         os.environ["AZURE_SUBSCRIPTION_ID"] = "bench-sub-123"
 
+    def _trace(self, func, start_ns, elapsed_ns):
+        """Record a measured call (timed in integer nanoseconds) as a Chrome trace event."""
+        self.trace_events.append(
+            {
+                "name": getattr(func, "__name__", repr(func)),
+                "cat": "bench",
+                "ph": "X",
+                "ts": start_ns // 1000,
+                "dur": elapsed_ns // 1000,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+            }
+        )
+
     def measure_time(self, func, *args, **kwargs):
-        """Measure execution time of a function."""
-        start = time.perf_counter()
+        """Measure execution time of a function, in seconds."""
+        # Integer nanoseconds keep sub-microsecond calls exact; convert to seconds only once
+        start = time.perf_counter_ns()
         result = func(*args, **kwargs)
-        end = time.perf_counter()
-        return end - start, result
+        elapsed_ns = time.perf_counter_ns() - start
+        self._trace(func, start, elapsed_ns)
+        return elapsed_ns / 1e9, result
 
     def measure_memory(self, func, *args, **kwargs):
-        """Measure memory usage of a function."""
-        tracemalloc.start()
+        """Measure how much a function raises the process's peak memory, in MB (None if unmeasurable)."""
+        _, memory, result = self.measure(func, *args, **kwargs)
+        return memory, result
+
+    def measure(self, func, *args, **kwargs):
+        """
+        Measure execution time and peak memory growth (MB) of a single call.
+
+        Without --deep, memory is the call's peak RSS above the RSS it started
+        at, or None where the peak cannot be reset (anywhere but Linux).
+        """
+        if not self.deep_memory:
+            before = _read_status_kb("VmRSS")[0] if _reset_peak_rss() else None
+            start = time.perf_counter_ns()
+            result = func(*args, **kwargs)
+            elapsed_ns = time.perf_counter_ns() - start
+            self._trace(func, start, elapsed_ns)
+            memory = None if before is None else (_read_status_kb("VmHWM")[0] - before) / 1024
+            return elapsed_ns / 1e9, memory, result
+
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        start = time.perf_counter_ns()
         result = func(*args, **kwargs)
-        current, peak = tracemalloc.get_traced_memory()
-        tracemalloc.stop()
-        return peak / 1024 / 1024, result  # Convert to MB
+        elapsed_ns = time.perf_counter_ns() - start
+        _, peak = tracemalloc.get_traced_memory()
+        self._trace(func, start, elapsed_ns)
+        return elapsed_ns / 1e9, (peak - baseline) / 1024 / 1024, result  # Convert to MB
+
+    def _bench(self, func, *args, warmup=1, repeats=5):
+        """
+        Time a function over several runs after warming it up.
+
+        Returns:
+            Tuple of (median seconds, stdev seconds, largest memory growth in MB across the runs or None)
+        """
+        for _ in range(warmup):
+            func(*args)
+        samples = [self.measure(func, *args)[:2] for _ in range(repeats)]
+        times = [elapsed for elapsed, _ in samples]
+        memory = None if samples[0][1] is None else max(memory for _, memory in samples)
+        return statistics.median(times), statistics.stdev(times), memory
 
     def benchmark_vm_operations(self):
         """Benchmark VM operations."""
@@ -62,14 +190,24 @@ class BenchmarkSuite:
         # Test with different VM counts
         vm_counts = [10, 50, 100, 500]
         times = []
+        stdevs = []
+        memory_usage = []
 
         for count in vm_counts:
             # Create mock VMs
-            elapsed, _ = self.measure_time(vm_ops.get_stopped_vms, None, "bench-sub-123")
+            elapsed, stdev, memory = self._bench(vm_ops.get_stopped_vms, None, "bench-sub-123")
             times.append(elapsed)
-            print(f"  {count} VMs: {elapsed:.3f}s")
+            stdevs.append(stdev)
+            memory_usage.append(memory)
+            print(f"  {count} VMs: {elapsed:.3f}s ± {stdev * 1000:.1f}ms, {_format_mb(memory)}")
 
-        self.results["vm_operations"] = {"counts": vm_counts, "times": times, "avg_time": statistics.mean(times)}
+        self.results["vm_operations"] = {
+            "counts": vm_counts,
+            "times": times,
+            "stdevs": stdevs,
+            "memory_mb": memory_usage,
+            "avg_time": statistics.mean(times),
+        }
 
     def benchmark_disk_operations(self):
         """Benchmark disk operations."""
@@ -77,29 +215,33 @@ class BenchmarkSuite:
 
         disk_counts = [20, 100, 200, 1000]
         times = []
+        stdevs = []
         memory_usage = []
 
         for count in disk_counts:
-            elapsed, _ = self.measure_time(disk_ops.get_unattached_disks, None, "bench-sub-123")
-            memory, _ = self.measure_memory(disk_ops.get_unattached_disks, None, "bench-sub-123")
+            elapsed, stdev, memory = self._bench(disk_ops.get_unattached_disks, None, "bench-sub-123")
             times.append(elapsed)
+            stdevs.append(stdev)
             memory_usage.append(memory)
-            print(f"  {count} disks: {elapsed:.3f}s, {memory:.1f}MB")
+            print(f"  {count} disks: {elapsed:.3f}s ± {stdev * 1000:.1f}ms, {_format_mb(memory)}")
 
         self.results["disk_operations"] = {
             "counts": disk_counts,
             "times": times,
+            "stdevs": stdevs,
             "memory_mb": memory_usage,
             "avg_time": statistics.mean(times),
-            "avg_memory": statistics.mean(memory_usage),
+            "avg_memory": None if None in memory_usage else statistics.mean(memory_usage),
         }
 
-    def benchmark_parallel_processing(self):
-        """Benchmark parallel vs sequential processing."""
+    def benchmark_parallel_processing(self, n: int = 10):
+        """Benchmark parallel vs sequential processing of n simulated subscriptions."""
         print("\n📊 Benchmarking Parallel Processing...")
 
-        processor = ConcurrentProcessor(max_workers=5)
-        subscriptions = [f"sub-{i}" for i in range(10)]
+        # The calls are I/O-bound, so size the pool from the core count like ThreadPoolExecutor does
+        cpu_count = os.cpu_count() or 4
+        worker_count = min(32, cpu_count * 4)
+        subscriptions = SUBSCRIPTIONS[:n]
 
         def mock_process(sub_id):
             time.sleep(0.1)  # Simulate API call
@@ -112,21 +254,94 @@ class BenchmarkSuite:
             sequential_results.append(mock_process(sub))
         sequential_time = time.perf_counter() - start
 
-        # Parallel processing
-        start = time.perf_counter()
-        parallel_results = processor.process_subscriptions_parallel(subscriptions, mock_process)
-        parallel_time = time.perf_counter() - start
-
-        speedup = sequential_time / parallel_time
+        # Thread pool processing, swept over multiples of the core count
+        worker_sweep = sorted({min(32, n) for n in (1, cpu_count, cpu_count * 2, worker_count, cpu_count * 8)})
+        by_workers = {}
+        with _quiet_processor_logs():
+            for workers in worker_sweep:
+                processor = ConcurrentProcessor(max_workers=workers)
+                start = time.perf_counter()
+                processor.process_subscriptions_parallel(subscriptions, mock_process)
+                by_workers[workers] = time.perf_counter() - start
+                print(f"  Thread pool ({workers} workers): {by_workers[workers]:.2f}s")
+        threadpool_time = by_workers[worker_count]
+
+        speedup = sequential_time / threadpool_time
         print(f"  Sequential: {sequential_time:.2f}s")
-        print(f"  Parallel (5 workers): {parallel_time:.2f}s")
+        print(f"  Thread pool ({worker_count} workers): {threadpool_time:.2f}s")
         print(f"  Speedup: {speedup:.1f}x")
 
         self.results["parallel_processing"] = {
+            "subscription_count": len(subscriptions),
             "sequential_time": sequential_time,
-            "parallel_time": parallel_time,
+            "threadpool_time": threadpool_time,
             "speedup": speedup,
-            "worker_count": 5,
+            "worker_count": worker_count,
+            "by_workers": by_workers,
+        }
+
+    def benchmark_async_processing(self):
+        """Benchmark asyncio processing of the same simulated API calls as benchmark_parallel_processing."""
+        print("\n📊 Benchmarking Async Processing...")
+
+        subscriptions = SUBSCRIPTIONS[: self.results["parallel_processing"]["subscription_count"]]
+
+        async def mock_process(sub_id):
+            await asyncio.sleep(0.1)  # Simulate API call
+            return {"subscription": sub_id, "resources": 10}
+
+        async def process_all():
+            return await asyncio.gather(*(mock_process(sub) for sub in subscriptions))
+
+        async_time, _ = self.measure_time(asyncio.run, process_all())
+
+        parallel = self.results["parallel_processing"]
+        speedup = parallel["sequential_time"] / async_time
+        print(f"  Sequential: {parallel['sequential_time']:.2f}s")
+        print(f"  Thread pool ({parallel['worker_count']} workers): {parallel['threadpool_time']:.2f}s")
+        print(f"  asyncio.gather: {async_time:.2f}s")
+        print(f"  Speedup: {speedup:.1f}x")
+
+        self.results["async_processing"] = {"async_time": async_time, "speedup": speedup}
+
+    def benchmark_batch_sweep(self):
+        """Sweep batch size against worker count to find where concurrency stops paying off."""
+        print("\n📊 Benchmarking Batch Size x Workers...")
+
+        batch_sizes = [1, 4, 8, 16, 32]
+        worker_counts = [1, 2, 5, 10]
+        repeats = 3
+        subscriptions = SUBSCRIPTIONS[:32]
+
+        def mock_process(sub_id):
+            time.sleep(0.01)  # Simulate API call
+            return {"subscription": sub_id, "resources": 10}
+
+        def process_in_batches(processor, batch_size):
+            pending = iter(subscriptions)
+            while batch := list(islice(pending, batch_size)):
+                processor.process_subscriptions_parallel(batch, mock_process)
+
+        cells = []
+        with _quiet_processor_logs():
+            for workers in worker_counts:
+                processor = ConcurrentProcessor(max_workers=workers)
+                for batch_size in batch_sizes:
+                    times = [self.measure_time(process_in_batches, processor, batch_size)[0] for _ in range(repeats)]
+                    cell = {
+                        "batch_size": batch_size,
+                        "workers": workers,
+                        "mean": statistics.mean(times),
+                        "stdev": statistics.stdev(times),
+                    }
+                    cells.append(cell)
+                    print(f"  batch={batch_size:>2} workers={workers:>2}: {cell['mean']:.3f}s ± {cell['stdev']:.3f}s")
+
+        self.results["batch_sweep"] = {
+            "batch_sizes": batch_sizes,
+            "worker_counts": worker_counts,
+            "cells": cells,
+            "best": min(cells, key=lambda cell: cell["mean"]),
         }
 
     def benchmark_network_operations(self):
@@ -135,44 +350,65 @@ class BenchmarkSuite:
 
         ip_counts = [10, 50, 100, 500]
         times = []
+        stdevs = []
+        memory_usage = []
 
         for count in ip_counts:
-            elapsed, _ = self.measure_time(network_ops.get_unassociated_public_ips, None, "bench-sub-123")
+            elapsed, stdev, memory = self._bench(network_ops.get_unassociated_public_ips, None, "bench-sub-123")
             times.append(elapsed)
-            print(f"  {count} IPs: {elapsed:.3f}s")
+            stdevs.append(stdev)
+            memory_usage.append(memory)
+            print(f"  {count} IPs: {elapsed:.3f}s ± {stdev * 1000:.1f}ms, {_format_mb(memory)}")
 
-        self.results["network_operations"] = {"counts": ip_counts, "times": times, "avg_time": statistics.mean(times)}
+        self.results["network_operations"] = {
+            "counts": ip_counts,
+            "times": times,
+            "stdevs": stdevs,
+            "memory_mb": memory_usage,
+            "avg_time": statistics.mean(times),
+        }
 
     def benchmark_cache_performance(self):
-        """Benchmark cache hit/miss performance."""
+        """Benchmark lookups in the production CacheManager under a realistic hit/miss mix."""
         print("\n📊 Benchmarking Cache Performance...")
 
-        # Simple cache simulation since we don't have a cache module yet
-        cache = {}
-
-        # Measure cache write
-        data = {"large": "x" * 10000}
+        # 1024 cached keys, looked up from a pool of 1280 so about 80% of lookups hit
+        cache = CacheManager(ttl_seconds=300)
+        cache.enabled = True
+        for i in range(1024):
+            cache.set(f"key-{i}", {"subscription": f"sub-{i}", "cost": float(i)})
+        pattern = [f"key-{i}" for i in random.Random(42).choices(range(1280), k=10_000)]
 
-        def cache_set(key, value):
-            cache[key] = value
-            return value
+        samples = []
+        hits = 0
+        for key in pattern:
+            start = time.perf_counter_ns()
+            value = cache.get(key)
+            samples.append(time.perf_counter_ns() - start)
+            hits += value is not None
 
-        def cache_get(key):
-            return cache.get(key)
+        quantiles = statistics.quantiles(samples, n=20)
+        p50_ns, p95_ns = statistics.median(samples), quantiles[18]
+        hit_ratio = hits / len(pattern)
 
-        write_time, _ = self.measure_time(cache_set, "test_key", data)
+        # Per-lookup samples include the clock reads, which cost about as much as a lookup, so the
+        # mean is taken the timeit way: replay the pattern inside one timed region and divide
+        replays = 10
 
-        # Measure cache hit
-        hit_time, _ = self.measure_time(cache_get, "test_key")
+        def replay_lookups():
+            get = cache.get
+            for _ in range(replays):
+                for key in pattern:
+                    get(key)
 
-        # Measure cache miss
-        miss_time, _ = self.measure_time(cache_get, "nonexistent")
+        elapsed, _ = self.measure_time(replay_lookups)
+        mean_ns = elapsed * 1e9 / (replays * len(pattern))
 
-        print(f"  Write time: {write_time*1000:.3f}ms")
-        print(f"  Hit time: {hit_time*1000:.3f}ms")
-        print(f"  Miss time: {miss_time*1000:.3f}ms")
+        print(f"  Lookups: {len(pattern)} over {cache.get_stats()['current_entries']} entries")
+        print(f"  p50: {p50_ns:.0f}ns, p95: {p95_ns:.0f}ns, mean (amortized): {mean_ns:.0f}ns")
+        print(f"  Hit ratio: {hit_ratio:.1%}")
 
-        self.results["cache"] = {"write_ms": write_time * 1000, "hit_ms": hit_time * 1000, "miss_ms": miss_time * 1000}
+        self.results["cache"] = {"p50_ns": p50_ns, "p95_ns": p95_ns, "mean_ns": mean_ns, "hit_ratio": hit_ratio}
 
     def generate_report(self):
         """Generate performance report."""
@@ -185,10 +421,25 @@ class BenchmarkSuite:
         print(f"- Disk Operations Avg: {self.results['disk_operations']['avg_time']:.3f}s")
         print(f"- Network Operations Avg: {self.results['network_operations']['avg_time']:.3f}s")
         print(f"- Parallel Processing Speedup: {self.results['parallel_processing']['speedup']:.1f}x")
-        print(f"- Cache Hit Time: {self.results['cache']['hit_ms']:.3f}ms")
+        print(f"- Async Processing Speedup: {self.results['async_processing']['speedup']:.1f}x")
+        cache = self.results["cache"]
+        print(
+            f"- Cache Lookup p50/p95: {cache['p50_ns']:.0f}ns / {cache['p95_ns']:.0f}ns ({cache['hit_ratio']:.0%} hits)"
+        )
+
+        sweep = self.results["batch_sweep"]
+        cells = {(cell["batch_size"], cell["workers"]): cell for cell in sweep["cells"]}
+        print("\n### Batch Size x Workers (mean ± stdev seconds)")
+        print("| batch \\ workers | " + " | ".join(str(workers) for workers in sweep["worker_counts"]) + " |")
+        print("|---" * (len(sweep["worker_counts"]) + 1) + "|")
+        for batch_size in sweep["batch_sizes"]:
+            row = (cells[(batch_size, workers)] for workers in sweep["worker_counts"])
+            print(f"| {batch_size} | " + " | ".join(f"{cell['mean']:.3f} ± {cell['stdev']:.3f}" for cell in row) + " |")
+        best = sweep["best"]
+        print(f"- Fastest: batch={best['batch_size']}, workers={best['workers']} ({best['mean']:.3f}s)")
 
         print("\n### Memory Usage")
-        print(f"- Disk Operations Avg: {self.results['disk_operations']['avg_memory']:.1f}MB")
+        print(f"- Disk Operations Avg: {_format_mb(self.results['disk_operations']['avg_memory'])}")
 
         print("\n### Scalability")
         vm_results = self.results["vm_operations"]
@@ -208,19 +459,48 @@ class BenchmarkSuite:
         print("✅ Benchmarking Complete")
         print("=" * 60)
 
-    def run(self):
+    def write_results(self, output_dir: Path):
+        """Write the results as JSON and the measured calls as a Chrome trace, for comparing runs."""
+        output_dir.mkdir(parents=True, exist_ok=True)
+        (output_dir / "bench_results.json").write_text(json.dumps(self.results, indent=2, default=str))
+        (output_dir / "bench_trace.json").write_text(json.dumps({"traceEvents": self.trace_events}))
+        print(f"📁 Results written to {output_dir / 'bench_results.json'} and {output_dir / 'bench_trace.json'}")
+
+    def _run_benchmark(self, benchmark, output_dir: Path):
+        """Run one benchmark method, profiling it into <category>.prof when profiling is on."""
+        if not self.profile:
+            benchmark()
+            return
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            benchmark()
+        finally:
+            profiler.disable()
+            output_dir.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(output_dir / f"{benchmark.__name__.removeprefix('benchmark_')}.prof")
+
+    def run(self, output_dir: Path = Path(".")):
         """Run all benchmarks."""
         print("=" * 60)
         print("🚀 Starting Performance Benchmarks")
         print("=" * 60)
 
+        benchmarks = (
+            self.benchmark_vm_operations,
+            self.benchmark_disk_operations,
+            self.benchmark_parallel_processing,
+            self.benchmark_async_processing,
+            self.benchmark_batch_sweep,
+            self.benchmark_network_operations,
+            self.benchmark_cache_performance,
+        )
         try:
-            self.benchmark_vm_operations()
-            self.benchmark_disk_operations()
-            self.benchmark_parallel_processing()
-            self.benchmark_network_operations()
-            self.benchmark_cache_performance()
+            for benchmark in benchmarks:
+                self._run_benchmark(benchmark, output_dir)
             self.generate_report()
+            self.write_results(output_dir)
             return 0
         except Exception as e:
             print(f"\n❌ Benchmark failed: {e}")
@@ -232,8 +512,20 @@ class BenchmarkSuite:
 
 def main():
     """Run benchmark suite."""
-    suite = BenchmarkSuite()
-    return suite.run()
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--deep", action="store_true", help="measure memory with tracemalloc instead of peak RSS (much slower)"
+    )
+    parser.add_argument(
+        "--output-dir", type=Path, default=Path("."), help="directory for bench_results.json and bench_trace.json"
+    )
+    parser.add_argument(
+        "--profile", action="store_true", help="write a cProfile <category>.prof per benchmark (view with snakeviz)"
+    )
+    args = parser.parse_args()
+
+    suite = BenchmarkSuite(deep_memory=args.deep, profile=args.profile)
+    return suite.run(args.output_dir)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,36 @@
+"""Shared pytest fixtures for the integration tests at the repository root."""
+
+from unittest.mock import patch
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def credential():
+    """One DefaultAzureCredential built for the whole test run, caching its tokens across tests."""
+    from azure.identity import DefaultAzureCredential
+
+    from azure_finops_mcp_server.helpers.subscription_manager import CachingCredential
+
+    credential = CachingCredential(DefaultAzureCredential())
+    yield credential
+    credential.close()
+
+
+@pytest.fixture(scope="session")
+def session_credential(credential):
+    """Make every get_credential() call during the run return the session credential."""
+    from azure_finops_mcp_server.helpers.subscription_manager import reset_credential
+
+    reset_credential()
+    with patch("azure_finops_mcp_server.helpers.subscription_manager._create_credential", return_value=credential):
+        yield credential
+    reset_credential()
+
+
+@pytest.fixture(scope="session")
+def mcp_server():
+    """The FastMCP server, imported once per run."""
+    from azure_finops_mcp_server.main import mcp
+
+    return mcp
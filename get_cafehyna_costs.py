@@ -1,8 +1,13 @@
 #!/usr/bin/env python3
 """Get costs for RS_Hypera_Cafehyna resource group."""
 
+import argparse
+import hashlib
 import json
 import os
+import tempfile
+import time
+from collections import Counter
 from datetime import datetime, timedelta
 
 from azure.identity import DefaultAzureCredential
@@ -17,9 +22,93 @@ from azure.mgmt.costmanagement.models import (
     QueryTimePeriod,
 )
 
+# Cost Management data only refreshes every few hours, so results are reused for this long
+CACHE_TTL_SECONDS = 4 * 60 * 60
+CACHE_DIR = "~/.cache/azure_finops_mcp"
 
-def get_cafehyna_costs():
-    """Get costs for RS_Hypera_Cafehyna resource group."""
+
+def _cache_path(subscription_id, start_date, end_date, rg_variations):
+    """Build the cache file path for one query's parameters."""
+    key = json.dumps([subscription_id, start_date.date().isoformat(), end_date.date().isoformat(), rg_variations])
+    digest = hashlib.sha256(key.encode()).hexdigest()[:16]
+    return os.path.join(os.path.expanduser(CACHE_DIR), f"costs-{digest}.json")
+
+
+def _read_cache(cache_file):
+    """Load cached costs if the file is younger than CACHE_TTL_SECONDS."""
+    try:
+        if time.time() - os.path.getmtime(cache_file) >= CACHE_TTL_SECONDS:
+            return None
+        with open(cache_file) as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def _write_cache(cache_file, costs):
+    """Write costs atomically, so a concurrent run never reads a partial file."""
+    try:
+        cache_dir = os.path.dirname(cache_file)
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=cache_dir, prefix=".costs-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(costs, f)
+            os.replace(temp_path, cache_file)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+    except OSError as e:
+        print(f"Warning: could not write cost cache {cache_file}: {e}")
+
+
+def _iter_cost_rows(result):
+    """
+    Yield (cost, service, resource group) for each well-formed row of a cost query result.
+
+    Column positions are resolved once from the result's columns, and rows too short to
+    hold them are skipped here so the accumulation loop needs no per-row checks.
+    """
+    columns = {column.name: index for index, column in enumerate(result.columns)}
+    cost_index = columns.get("Cost", 0)
+    service_index = columns.get("ServiceName")
+    rg_index = columns.get("ResourceGroupName")
+    min_length = max(index for index in (cost_index, service_index, rg_index) if index is not None) + 1
+
+    for row in result.rows:
+        if not row or len(row) < min_length:
+            continue
+        yield (
+            float(row[cost_index] or 0),
+            row[service_index] if service_index is not None else "Unknown Service",
+            row[rg_index] if rg_index is not None else None,
+        )
+
+
+def _print_costs(costs):
+    """Print costs by service and the month-to-date total."""
+    print(f"\nFound costs for resource group: {', '.join(costs['resource_groups'])}")
+    print("-" * 70)
+
+    # Display costs by service
+    print("\nCosts by Service:")
+    for service, cost in Counter(costs["service_costs"]).most_common():
+        if cost <= 0:
+            break  # most_common is ordered, so only zero or negative costs remain
+        print(f"  {service}: ${cost:.2f}")
+
+    print("-" * 70)
+    print(f"TOTAL COST (Month-to-Date): ${costs['total_cost']:.2f}")
+    print("=" * 70)
+
+
+def get_cafehyna_costs(use_cache=True):
+    """
+    Get costs for RS_Hypera_Cafehyna resource group.
+
+    Args:
+        use_cache: Serve results younger than CACHE_TTL_SECONDS from disk; False forces a fresh query
+    """
 
     credential = DefaultAzureCredential()
     subscription_id = os.environ.get("AZURE_SUBSCRIPTION_ID")
@@ -43,58 +132,59 @@ def get_cafehyna_costs():
     print(f'Period: {start_date.strftime("%Y-%m-%d")} to {end_date.strftime("%Y-%m-%d")}')
     print("=" * 70)
 
-    # Try multiple resource group name variations
+    # Cost Management matches resource group names case-sensitively, so ask for every known
+    # capitalization in one query rather than one query per variation
     rg_variations = ["RS_Hypera_Cafehyna", "RS_HYPERA_CAFEHYNA", "rs_hypera_cafehyna", "Rs_Hypera_Cafehyna"]
 
-    for rg_name in rg_variations:
-        try:
-            # Create query
-            query = QueryDefinition(
-                type="Usage",
-                timeframe="Custom",
-                time_period=QueryTimePeriod(from_property=start_date, to=end_date),
-                dataset=QueryDataset(
-                    granularity="Daily",
-                    aggregation={"totalCost": QueryAggregation(name="Cost", function="Sum")},
-                    grouping=[QueryGrouping(type="Dimension", name="ServiceName")],
-                    filter=QueryFilter(
-                        dimensions=QueryComparisonExpression(name="ResourceGroupName", operator="In", values=[rg_name])
-                    ),
-                ),
-            )
-
-            result = cost_client.query.usage(scope=scope, parameters=query)
+    cache_file = _cache_path(subscription_id, start_date, end_date, rg_variations)
+    costs = _read_cache(cache_file) if use_cache else None
+    if costs is not None:
+        print("(cached results, run with --no-cache to refresh)")
+        _print_costs(costs)
+        return costs["total_cost"]
 
-            if result.rows and len(result.rows) > 0:
-                print(f"\nFound costs for resource group: {rg_name}")
-                print("-" * 70)
-
-                service_costs = {}
-                total_cost = 0
+    try:
+        query = QueryDefinition(
+            type="Usage",
+            timeframe="Custom",
+            time_period=QueryTimePeriod(from_property=start_date, to=end_date),
+            dataset=QueryDataset(
+                granularity="None",
+                aggregation={"totalCost": QueryAggregation(name="Cost", function="Sum")},
+                grouping=[
+                    QueryGrouping(type="Dimension", name="ServiceName"),
+                    QueryGrouping(type="Dimension", name="ResourceGroupName"),
+                ],
+                filter=QueryFilter(
+                    dimensions=QueryComparisonExpression(name="ResourceGroupName", operator="In", values=rg_variations)
+                ),
+            ),
+        )
 
-                for row in result.rows:
-                    if row and len(row) >= 2:
-                        cost = float(row[0]) if row[0] else 0
-                        service = row[2] if len(row) > 2 else "Unknown Service"
+        result = cost_client.query.usage(scope=scope, parameters=query)
 
-                        if service not in service_costs:
-                            service_costs[service] = 0
-                        service_costs[service] += cost
-                        total_cost += cost
+        if result.rows:
+            service_costs = Counter()
+            matched_groups = set()
+            total_cost = 0
 
-                # Display costs by service
-                print("\nCosts by Service:")
-                for service, cost in sorted(service_costs.items(), key=lambda x: x[1], reverse=True):
-                    if cost > 0:
-                        print(f"  {service}: ${cost:.2f}")
+            for cost, service, resource_group in _iter_cost_rows(result):
+                service_costs[service] += cost
+                matched_groups.add(resource_group)
+                total_cost += cost
 
-                print("-" * 70)
-                print(f"TOTAL COST (Month-to-Date): ${total_cost:.2f}")
-                print("=" * 70)
-                return total_cost
+            matched_groups.discard(None)
+            costs = {
+                "resource_groups": sorted(matched_groups) or rg_variations[:1],
+                "service_costs": service_costs,
+                "total_cost": total_cost,
+            }
+            _write_cache(cache_file, costs)
+            _print_costs(costs)
+            return total_cost
 
-        except Exception as e:
-            continue
+    except Exception as e:
+        print(f"\nError querying resource group costs: {e}")
 
     # If no data found with any variation
     print("\nNo cost data found for RS_Hypera_Cafehyna resource group.")
@@ -142,4 +232,7 @@ def get_cafehyna_costs():
 
 
 if __name__ == "__main__":
-    get_cafehyna_costs()
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--no-cache", action="store_true", help="ignore cached results and query Azure again")
+    args = parser.parse_args()
+    get_cafehyna_costs(use_cache=not args.no_cache)
@@ -20,7 +20,7 @@ COMPAT_RESULT=$?
 echo ""
 echo "🧪 Running integration tests..."
 echo "----------------------------------------"
-python test_integration.py
+python -m pytest -q test_integration.py
 INTEGRATION_RESULT=$?
 
 # Summary
@@ -36,6 +36,9 @@ setup(
         "azure-mgmt-resource",
         "mcp",
     ],
+    extras_require={
+        "resourcegraph": ["azure-mgmt-resourcegraph>=8.0.0"],
+    },
     entry_points={
         "console_scripts": [
             "azure-finops-mcp-server=azure_finops_mcp_server.main:run_server",
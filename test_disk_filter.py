@@ -4,6 +4,7 @@
 import json
 import os
 import sys
+from itertools import islice
 
 from azure.identity import DefaultAzureCredential
 
@@ -38,7 +39,7 @@ def test_disk_filtering():
             print(f"Found {sum(len(v) for v in orphaned_disks.values())} truly orphaned disks:")
             for region, disks in orphaned_disks.items():
                 print(f"\n  Region: {region}")
-                for disk in disks[:3]:  # Show first 3
+                for disk in islice(disks, 3):  # Show first 3
                     print(f"    - {disk['DiskName']} ({disk['DiskSize']}) in {disk['ResourceGroup']}")
         else:
             print("No truly orphaned disks found (good!)")
@@ -72,7 +73,7 @@ def test_disk_filtering():
             for region, disks in audit_result["truly_orphaned"].items():
                 if disks:
                     print(f"  Region: {region}")
-                    for disk in disks[:2]:  # Show first 2
+                    for disk in islice(disks, 2):  # Show first 2
                         print(f"    - {disk['DiskName']} ({disk['DiskSize']}, {disk['EstimatedMonthlyCost']})")
 
         # Show PVC disk info
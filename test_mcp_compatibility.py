@@ -4,43 +4,20 @@ Test script to verify MCP protocol compatibility after Azure migration.
 This ensures that the tool interfaces remain unchanged.
 """
 
+import asyncio
+import inspect
 import json
 import sys
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any, Dict
+from unittest.mock import Mock, patch
 
+from azure_finops_mcp_server.main import get_cost, run_finops_audit
 
-def test_tool_signatures():
-    """
-    Verify that the MCP tool signatures match the original AWS implementation.
-    """
-    expected_tools = {
-        "get_cost": {
-            "parameters": [
-                "profiles",
-                "all_profiles",
-                "time_range_days",
-                "start_date_iso",
-                "end_date_iso",
-                "tags",
-                "dimensions",
-                "group_by",
-            ],
-            "returns": "Dict[str, Any]",
-        },
-        "run_finops_audit": {"parameters": ["regions", "profiles", "all_profiles"], "returns": "Dict[Any, Any]"},
-    }
-
-    print("✅ MCP Tool Signatures Test:")
-    print("  - get_cost: Parameters match ✓")
-    print("  - run_finops_audit: Parameters match ✓")
-    print("  - Return types: Compatible ✓")
-    return True
-
-
-def test_response_format():
-    """
-    Verify that response formats match the expected structure.
-    """
-    expected_cost_response = {
+# Golden response shapes of the MCP tools, built once and read-only
+EXPECTED_COST_RESPONSE = MappingProxyType(
+    {
         "accounts_cost_data": {
             "Subscription: Name": {
                 "Subscription ID": "string",
@@ -53,8 +30,10 @@ def test_response_format():
         },
         "errors_for_profiles": {},
     }
+)
 
-    expected_audit_response = {
+EXPECTED_AUDIT_RESPONSE = MappingProxyType(
+    {
         "Audit Report": {
             "Subscription: Name": [
                 {
@@ -72,12 +51,99 @@ def test_response_format():
         },
         "Error processing subscriptions": {},
     }
+)
+
+
+def test_tool_signatures():
+    """
+    Verify that the MCP tool signatures match the original AWS implementation.
+    """
+    expected_tools = {
+        "get_cost": {
+            "parameters": [
+                "profiles",
+                "all_profiles",
+                "time_range_days",
+                "start_date_iso",
+                "end_date_iso",
+                "tags",
+                "dimensions",
+                "group_by",
+            ],
+            "returns": Dict[str, Any],
+        },
+        "run_finops_audit": {"parameters": ["regions", "profiles", "all_profiles"], "returns": Dict[Any, Any]},
+    }
+
+    tools = {"get_cost": get_cost, "run_finops_audit": run_finops_audit}
+
+    print("✅ MCP Tool Signatures Test:")
+    for name, spec in expected_tools.items():
+        signature = inspect.signature(tools[name])
+        parameters = list(signature.parameters)
+        assert parameters == spec["parameters"], f"{name} parameters drifted: {parameters}"
+        assert signature.return_annotation == spec["returns"], f"{name} return type drifted"
+        print(f"  - {name}: Parameters match ✓")
+    print("  - Return types: Compatible ✓")
+
+
+def _assert_same_keys(actual, expected, path="response"):
+    """
+    Assert that a response has the keys of a golden shape, level by level.
+
+    An empty dict or list in the golden shape accepts any contents, and each
+    item of a list is checked against the golden list's first item.
+    """
+    if isinstance(expected, Mapping) and expected:
+        assert isinstance(actual, Mapping), f"{path} is not a dict"
+        assert set(actual) == set(expected), f"{path} keys drifted: {sorted(actual)}"
+        for key, value in expected.items():
+            _assert_same_keys(actual[key], value, f"{path}[{key!r}]")
+    elif isinstance(expected, list) and expected:
+        assert isinstance(actual, list) and actual, f"{path} is not a non-empty list"
+        for index, item in enumerate(actual):
+            _assert_same_keys(item, expected[0], f"{path}[{index}]")
+
+
+def test_response_format():
+    """
+    Verify that response formats match the expected structure.
+    """
+    # A subscription named "Name" yields the golden "Subscription: Name" keys
+    subscriptions = ({"sub-1": ["Name"]}, {})
+    with (
+        patch("azure_finops_mcp_server.main.profiles_to_use", return_value=subscriptions),
+        patch("azure_finops_mcp_server.main.get_credential"),
+        patch("azure_finops_mcp_server.main.CostManagementClient") as mock_cost_client,
+        patch("azure_finops_mcp_server.main.is_resource_graph_enabled", return_value=False),
+        patch.multiple(
+            "azure_finops_mcp_server.main",
+            **{
+                name: Mock(return_value=({}, {}))
+                for name in (
+                    "get_stopped_vms",
+                    "get_unattached_disks",
+                    "get_unassociated_public_ips",
+                    "get_budget_data",
+                )
+            },
+        ),
+    ):
+        mock_cost_client.return_value.query.usage.return_value = Mock(rows=[[1.5, "Storage"]])
+        cost_response = asyncio.run(get_cost(profiles=["Name"], time_range_days=3, group_by="ServiceName"))
+        audit_response = asyncio.run(run_finops_audit(profiles=["Name"]))
+
+    expected_cost = dict(EXPECTED_COST_RESPONSE)
+    expected_cost["accounts_cost_data"] = {
+        name: {key.replace("[Dimension]", "ServiceName"): value for key, value in data.items()}
+        for name, data in expected_cost["accounts_cost_data"].items()
+    }
 
     print("\n✅ Response Format Test:")
+    _assert_same_keys(cost_response, expected_cost)
     print("  - Cost response structure: Compatible ✓")
+    _assert_same_keys(audit_response, EXPECTED_AUDIT_RESPONSE)
     print("  - Audit response structure: Compatible ✓")
-    print("  - Error handling: Maintained ✓")
-    return True
 
 
 def test_mcp_server_config():
@@ -102,8 +168,12 @@ def main():
     all_tests_pass = True
 
     # Run tests
-    all_tests_pass &= test_tool_signatures()
-    all_tests_pass &= test_response_format()
+    for test in (test_tool_signatures, test_response_format):
+        try:
+            test()
+        except AssertionError as e:
+            print(f"  ✗ {e}")
+            all_tests_pass = False
     all_tests_pass &= test_mcp_server_config()
 
     print("\n" + "=" * 60)
@@ -4,6 +4,8 @@
 import os
 import sys
 
+import pytest
+
 # Add the project directory to the path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
@@ -17,6 +19,9 @@ from azure_finops_mcp_server.helpers.azure_utils import (
     format_cost,
     parse_resource_id,
 )
+from azure_finops_mcp_server.helpers.disk_operations import estimate_disk_cost
+from azure_finops_mcp_server.helpers.network_operations import estimate_public_ip_cost
+from azure_finops_mcp_server.helpers.vm_operations import estimate_vm_monthly_cost
 
 
 def test_azure_utils():
@@ -30,10 +35,11 @@ def test_azure_utils():
     assert extract_subscription_id(resource_id) == "12345678-1234-1234-1234-123456789012"
     assert extract_resource_name(resource_id) == "myVM"
 
-    parsed = parse_resource_id(resource_id)
-    assert parsed["resource_group"] == "myRG"
-    assert parsed["subscription_id"] == "12345678-1234-1234-1234-123456789012"
-    assert parsed["resource_name"] == "myVM"
+    assert parse_resource_id(resource_id) == {
+        "subscription_id": "12345678-1234-1234-1234-123456789012",
+        "resource_group": "myRG",
+        "resource_name": "myVM",
+    }
 
     # Test cost formatting
     assert format_cost(1234.567) == "$1,234.57"
@@ -123,42 +129,23 @@ def test_imports():
     return True
 
 
-def test_cost_calculations():
-    """Test cost calculation functions."""
-    print("\nTesting Cost Calculations...")
-
-    from azure_finops_mcp_server.helpers.disk_operations import estimate_disk_cost
-    from azure_finops_mcp_server.helpers.network_operations import estimate_public_ip_cost
-    from azure_finops_mcp_server.helpers.vm_operations import estimate_vm_monthly_cost
-
-    # Test disk cost estimation
-    cost = estimate_disk_cost(100, "Standard_LRS")  # 100GB standard HDD
-    assert cost == 5.0  # 100 * 0.05
-    print(f"✓ 100GB Standard HDD: ${cost}/month")
-
-    cost = estimate_disk_cost(100, "Premium_LRS")  # 100GB premium SSD
-    assert cost == 18.0  # 100 * 0.18
-    print(f"✓ 100GB Premium SSD: ${cost}/month")
+# (estimator, arguments, expected monthly cost in USD)
+COST_CASES = [
+    (estimate_disk_cost, (100, "Standard_LRS"), 5.0),  # 100GB standard HDD: 100 * 0.05
+    (estimate_disk_cost, (100, "Premium_LRS"), 18.0),  # 100GB premium SSD: 100 * 0.18
+    (estimate_vm_monthly_cost, ("Standard_B1s",), 7.59),  # 0.0104 * 730, rounded to cents
+    (estimate_vm_monthly_cost, ("UnknownSize",), 73.0),  # default 0.10 * 730
+    (estimate_public_ip_cost, ("Standard", "Static"), 4.38),
+    (estimate_public_ip_cost, ("Basic", "Dynamic"), 2.88),
+]
 
-    # Test VM cost estimation
-    cost = estimate_vm_monthly_cost("Standard_B1s")
-    assert abs(cost - 7.59) < 0.01  # 0.0104 * 730
-    print(f"✓ Standard_B1s VM: ${cost}/month")
 
-    cost = estimate_vm_monthly_cost("UnknownSize")
-    assert abs(cost - 73.0) < 0.01  # default 0.10 * 730
-    print(f"✓ Unknown VM size (default): ${cost}/month")
-
-    # Test public IP cost estimation
-    cost = estimate_public_ip_cost("Standard", "Static")
-    assert cost == 4.38
-    print(f"✓ Standard Static IP: ${cost}/month")
-
-    cost = estimate_public_ip_cost("Basic", "Dynamic")
-    assert cost == 2.88
-    print(f"✓ Basic Dynamic IP: ${cost}/month")
-
-    print("✓ All cost calculations passed")
+@pytest.mark.parametrize(
+    "estimator,args,expected", COST_CASES, ids=[f"{case[0].__name__}{case[1]}" for case in COST_CASES]
+)
+def test_cost_calculations(estimator, args, expected):
+    """Test a cost calculation function."""
+    assert estimator(*args) == pytest.approx(expected)
 
 
 def main():
@@ -172,7 +159,10 @@ def main():
         test_config()
 
         if test_imports():
-            test_cost_calculations()
+            print("\nTesting Cost Calculations...")
+            for estimator, args, expected in COST_CASES:
+                test_cost_calculations(estimator, args, expected)
+            print(f"✓ All {len(COST_CASES)} cost calculations passed")
 
             print("\n" + "=" * 50)
             print("✅ All tests passed successfully!")
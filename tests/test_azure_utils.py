@@ -1,8 +1,11 @@
 """Unit tests for azure_utils module."""
 
+from datetime import date
+
 import pytest
 
 from azure_finops_mcp_server.helpers.azure_utils import (
+    aggregate_cost_rows,
     calculate_monthly_cost,
     calculate_yearly_cost,
     extract_resource_group,
@@ -10,6 +13,7 @@ from azure_finops_mcp_server.helpers.azure_utils import (
     extract_subscription_id,
     format_cost,
     is_orphaned_disk,
+    parse_iso_date,
     parse_resource_id,
 )
 
@@ -22,6 +26,10 @@ class TestResourceIdParsing:
         resource_id = "/subscriptions/12345/resourceGroups/myRG/providers/Microsoft.Compute/virtualMachines/myVM"
         assert extract_resource_group(resource_id) == "myRG"
 
+    def test_extract_resource_group_bare_resource_group_id(self):
+        """Test extracting resource group from a resource group ID with no provider segment."""
+        assert extract_resource_group("/subscriptions/12345/resourceGroups/myRG") == "myRG"
+
     def test_extract_resource_group_invalid(self):
         """Test extracting resource group from invalid resource ID."""
         with pytest.raises(ValueError):
@@ -37,6 +45,11 @@ class TestResourceIdParsing:
         resource_id = "/subscriptions/12345/resourceGroups/myRG/providers/Microsoft.Compute/virtualMachines/myVM"
         assert extract_resource_name(resource_id) == "myVM"
 
+    def test_extract_resource_name_trailing_slash(self):
+        """Test extracting resource name ignores a trailing slash and bare names."""
+        assert extract_resource_name("/subscriptions/12345/resourceGroups/myRG/") == "myRG"
+        assert extract_resource_name("myVM") == "myVM"
+
     def test_parse_resource_id_complete(self):
         """Test parsing complete resource ID."""
         resource_id = "/subscriptions/sub123/resourceGroups/testRG/providers/Microsoft.Network/publicIPAddresses/myIP"
@@ -46,6 +59,25 @@ class TestResourceIdParsing:
         assert result["resource_group"] == "testRG"
         assert result["resource_name"] == "myIP"
 
+    def test_parse_resource_id_matches_extractors(self):
+        """Test that the single-pass parse agrees with the individual extractors."""
+        for resource_id in (
+            "/subscriptions/sub123/resourceGroups/testRG/providers/Microsoft.Compute/disks/myDisk",
+            "/subscriptions/sub123/resourceGroups/testRG/",
+        ):
+            assert parse_resource_id(resource_id) == {
+                "subscription_id": extract_subscription_id(resource_id),
+                "resource_group": extract_resource_group(resource_id),
+                "resource_name": extract_resource_name(resource_id),
+            }
+
+    def test_parse_resource_id_invalid(self):
+        """Test that IDs without subscription and resource group segments are rejected."""
+        with pytest.raises(ValueError):
+            parse_resource_id("/subscriptions/sub123")
+        with pytest.raises(ValueError):
+            parse_resource_id(None)
+
 
 class TestCostFormatting:
     """Test cost formatting functions."""
@@ -62,6 +94,20 @@ class TestCostFormatting:
         assert format_cost(999.999, "GBP") == "1,000.00 GBP"
 
 
+class TestDateParsing:
+    """Test date parsing functions."""
+
+    def test_parse_iso_date_valid(self):
+        """Test parsing a YYYY-MM-DD date."""
+        assert parse_iso_date("2024-02-29") == date(2024, 2, 29)
+
+    @pytest.mark.parametrize("value", ["2024-02-30", "20240229", "2024-2-9", "not-a-date", "2024-W05-3", "2024-031", "2024-0031", "2024-01-3a"])
+    def test_parse_iso_date_invalid(self, value):
+        """Test that malformed or impossible dates are rejected."""
+        with pytest.raises(ValueError):
+            parse_iso_date(value)
+
+
 class TestCostCalculations:
     """Test cost calculation functions."""
 
@@ -78,6 +124,30 @@ class TestCostCalculations:
         assert yearly == 1200.0  # 100 * 12
 
 
+class TestCostAggregation:
+    """Test cost row aggregation."""
+
+    def test_aggregate_cost_rows_groups_and_totals(self):
+        """Test summing rows by dimension value."""
+        rows = [[10.0, "Storage", "USD"], [5.5, "Storage", "USD"], [2.0, "Network", "USD"]]
+        total, grouped = aggregate_cost_rows(rows)
+
+        assert total == 17.5
+        assert grouped == {"Storage": 15.5, "Network": 2.0}
+
+    def test_aggregate_cost_rows_handles_missing_values(self):
+        """Test empty costs, empty dimensions, and short rows."""
+        total, grouped = aggregate_cost_rows([[None, "Storage"], [3.0, None], [1.0]])
+
+        assert total == 3.0
+        assert grouped == {"Storage": 0.0, "Unknown": 3.0}
+
+    def test_aggregate_cost_rows_empty(self):
+        """Test that no rows yields an empty result."""
+        assert aggregate_cost_rows(None) == (0.0, {})
+        assert aggregate_cost_rows([]) == (0.0, {})
+
+
 class TestDiskIdentification:
     """Test disk identification functions."""
 
@@ -74,8 +74,8 @@ class TestBudgetProcessing:
         assert result["amount"] == 500.50
         assert result["unit"] == "USD"
 
-        # Budget without current spend
-        budget_no_spend = Mock(spec=[])
+        # Budget without current spend (the SDK model reports it as None)
+        budget_no_spend = Mock(current_spend=None)
         result = extract_current_spend(budget_no_spend)
         assert result["amount"] == 0
         assert result["unit"] == "USD"
@@ -92,8 +92,8 @@ class TestBudgetProcessing:
         assert result["amount"] == 1200.75
         assert result["unit"] == "USD"
 
-        # Budget without forecast
-        budget_no_forecast = Mock(spec=[])
+        # Budget without forecast (the SDK model reports it as None)
+        budget_no_forecast = Mock(forecast_spend=None)
         result = extract_forecast_spend(budget_no_forecast)
         assert result is None
 
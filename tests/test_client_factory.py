@@ -10,7 +10,9 @@ from azure_finops_mcp_server.helpers.azure_client_factory import (
     DefaultAzureClientFactory,
     NetworkClientAdapter,
     get_client_factory,
+    get_shared_transport,
     reset_client_factory,
+    reset_shared_transport,
     set_client_factory,
 )
 
@@ -89,6 +91,93 @@ class TestAzureClientFactory:
         assert isinstance(factory, DefaultAzureClientFactory)
 
 
+class TestDefaultAzureClientFactory:
+    """Test client reuse in the default factory."""
+
+    @patch("azure_finops_mcp_server.helpers.azure_client_factory.NetworkManagementClient")
+    @patch("azure_finops_mcp_server.helpers.azure_client_factory.ComputeManagementClient")
+    def test_clients_are_reused_per_subscription_and_credential(self, mock_compute_cls, mock_network_cls):
+        """Test that repeated requests share a client until the subscription or credential changes."""
+        credential = Mock()
+        factory = DefaultAzureClientFactory(credential)
+
+        compute = factory.create_compute_client("sub1")
+        assert factory.create_compute_client("sub1") is compute
+        assert factory.create_network_client("sub1") is mock_network_cls.return_value
+        mock_compute_cls.assert_called_once_with(credential, "sub1", transport=get_shared_transport())
+
+        factory.create_compute_client("sub2")
+        mock_compute_cls.assert_called_with(credential, "sub2", transport=get_shared_transport())
+
+        other_credential = Mock()
+        factory.credential = other_credential
+        factory.create_compute_client("sub1")
+        mock_compute_cls.assert_called_with(other_credential, "sub1", transport=get_shared_transport())
+        assert mock_compute_cls.call_count == 3
+
+    @patch("azure_finops_mcp_server.helpers.azure_client_factory.ComputeManagementClient")
+    @patch("azure_finops_mcp_server.helpers.azure_client_factory.get_credential")
+    def test_default_credential_is_the_shared_one(self, mock_get_credential, mock_compute_cls):
+        """Test that a factory without a credential uses the cached get_credential() credential."""
+        factory = DefaultAzureClientFactory()
+        mock_get_credential.assert_not_called()
+
+        factory.create_compute_client("sub1")
+        factory.create_compute_client("sub1")
+
+        mock_compute_cls.assert_called_once_with(
+            mock_get_credential.return_value, "sub1", transport=get_shared_transport()
+        )
+
+    def test_shared_transport_is_a_pooled_singleton(self):
+        """Test that every caller gets one transport whose session outlives client closes."""
+        reset_shared_transport()
+        try:
+            transport = get_shared_transport()
+
+            assert get_shared_transport() is transport
+            transport.close()  # what closing a client does to its transport
+            assert transport.session is not None
+        finally:
+            reset_shared_transport()
+
+        assert get_shared_transport() is not transport
+
+    @patch("azure_finops_mcp_server.helpers.azure_client_factory.ComputeManagementClient")
+    @patch("azure_finops_mcp_server.helpers.azure_client_factory.get_credential")
+    def test_rotated_credential_replaces_cached_clients(self, mock_get_credential, mock_compute_cls):
+        """Test that clients built with an expired credential are closed instead of accumulating."""
+        mock_compute_cls.side_effect = lambda *args, **kwargs: Mock()
+        factory = DefaultAzureClientFactory()
+
+        previous = []
+        for _ in range(5):
+            mock_get_credential.return_value = Mock()  # get_credential() rebuilt after its TTL
+            clients = [factory.create_compute_client(sub_id) for sub_id in ("sub1", "sub2")]
+
+            assert len(factory._clients) == 2
+            for client in previous:
+                client.close.assert_called_once()
+            for client in clients:
+                client.close.assert_not_called()
+            previous = clients
+
+    @patch("azure_finops_mcp_server.helpers.azure_client_factory.CostManagementClient")
+    def test_clear_clients(self, mock_cost_cls):
+        """Test that clearing the cache builds fresh clients."""
+        factory = DefaultAzureClientFactory(Mock())
+
+        factory.create_cost_client()
+        factory.create_cost_client()
+        factory.clear_clients()
+        factory.create_cost_client()
+
+        assert mock_cost_cls.call_count == 2
+        mock_cost_cls.assert_called_with(
+            factory.credential, transport=get_shared_transport(), base_url=factory.config.azure_management_url
+        )
+
+
 class TestComputeClientAdapter:
     """Test compute client adapter."""
 
@@ -103,6 +192,16 @@ class TestComputeClientAdapter:
         assert result == ["vm1", "vm2"]
         mock_client.virtual_machines.list_all.assert_called_once()
 
+    def test_list_all_vms_with_instance_view(self):
+        """Test that the listing can return power states without per-VM calls."""
+        mock_client = Mock()
+
+        adapter = ComputeClientAdapter(mock_client)
+        adapter.list_all_vms(expand="instanceView")
+
+        mock_client.virtual_machines.list_all.assert_called_once_with(expand="instanceView")
+        mock_client.virtual_machines.instance_view.assert_not_called()
+
     def test_get_instance_view(self):
         """Test getting VM instance view through adapter."""
         mock_client = Mock()
@@ -0,0 +1,51 @@
+"""Unit tests for concurrent utilities."""
+
+import threading
+
+import pytest
+from azure.core.paging import ItemPaged
+
+from azure_finops_mcp_server.helpers.concurrent_util import iter_prefetched
+
+
+class TestIterPrefetched:
+    """Test prefetching iteration over paged listings."""
+
+    def test_plain_iterables_pass_through(self):
+        """Test that a materialized listing is iterated as-is."""
+        assert list(iter_prefetched(["a", "b"])) == ["a", "b"]
+
+    def test_next_page_fetched_while_current_is_consumed(self):
+        """Test that page N+1 is requested before the caller finishes page N."""
+        pages = {None: ("page2", ["a", "b"]), "page2": ("page3", ["c"]), "page3": (None, ["d"])}
+        fetched = []
+        page2_fetched = threading.Event()
+
+        def get_next(continuation_token):
+            fetched.append(continuation_token)
+            if continuation_token == "page2":
+                page2_fetched.set()
+            return continuation_token
+
+        items = iter_prefetched(ItemPaged(get_next, pages.__getitem__))
+
+        assert next(items) == "a"
+        # Still on the first page, but the second is already on its way
+        assert page2_fetched.wait(timeout=5)
+        assert list(items) == ["b", "c", "d"]
+        assert fetched == [None, "page2", "page3"]
+
+    def test_fetch_errors_reach_the_caller(self):
+        """Test that a failed page fetch is raised from the iterator."""
+
+        def get_next(continuation_token):
+            if continuation_token == "page2":
+                raise RuntimeError("API Error")
+            return continuation_token
+
+        pages = {None: ("page2", ["a"])}
+        items = iter_prefetched(ItemPaged(get_next, pages.__getitem__))
+
+        assert next(items) == "a"
+        with pytest.raises(RuntimeError, match="API Error"):
+            next(items)
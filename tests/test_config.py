@@ -0,0 +1,91 @@
+"""Unit tests for configuration management."""
+
+from dataclasses import FrozenInstanceError
+
+import pytest
+
+from azure_finops_mcp_server.config import AzureFinOpsConfig, get_config, reset_config, set_config
+
+
+class TestAzureFinOpsConfig:
+    """Test the configuration dataclass."""
+
+    def setup_method(self):
+        """Start each test from a fresh global configuration."""
+        reset_config()
+
+    def teardown_method(self):
+        """Clean up after tests."""
+        reset_config()
+
+    def test_config_is_frozen(self):
+        """Test that configuration fields cannot be reassigned."""
+        config = AzureFinOpsConfig(subscription_id="sub-1")
+
+        with pytest.raises(FrozenInstanceError):
+            config.max_parallel_workers = 10
+
+    def test_cached_dict_and_validation(self):
+        """Test that the dict form and validation result are computed once."""
+        config = AzureFinOpsConfig(max_parallel_workers=0)
+
+        assert config.as_dict is config.as_dict
+        assert config.validation_errors is config.validation_errors
+        assert "max_parallel_workers must be at least 1" in config.validate()
+
+        # to_dict hands out a copy so callers cannot corrupt the cache
+        config.to_dict()["max_parallel_workers"] = 99
+        assert config.as_dict["max_parallel_workers"] == 0
+
+    def test_from_environment(self, monkeypatch):
+        """Test that environment variables are parsed into the frozen instance."""
+        monkeypatch.setenv("AZURE_SUBSCRIPTION_IDS", "sub-1, sub-2")
+        monkeypatch.setenv("AZURE_MAX_WORKERS", "8")
+        monkeypatch.setenv("AZURE_ENABLE_CACHE", "false")
+
+        config = get_config()
+
+        assert config.subscription_ids == ["sub-1", "sub-2"]
+        assert config.max_parallel_workers == 8
+        assert config.enable_caching is False
+        assert config.disk_cost_rates["premium_ssd"] == 0.18
+
+    def test_from_environment_keeps_defaults(self, monkeypatch):
+        """Test that unset or empty variables fall back to dataclass defaults."""
+        for name in ("AZURE_MAX_WORKERS", "AZURE_LOG_LEVEL", "AZURE_ENABLE_CACHE"):
+            monkeypatch.delenv(name, raising=False)
+        monkeypatch.setenv("AZURE_DEFAULT_REGIONS", "")
+
+        config = AzureFinOpsConfig.from_environment()
+
+        assert config.max_parallel_workers == 5
+        assert config.log_level == "INFO"
+        assert config.enable_caching is True
+        assert config.default_regions is None
+
+    def test_set_config_rejects_invalid(self):
+        """Test that set_config raises for invalid configuration."""
+        with pytest.raises(ValueError, match="request_timeout"):
+            set_config(AzureFinOpsConfig(subscription_id="sub-1", request_timeout=0))
+
+    def test_get_config_is_memoized(self, monkeypatch):
+        """Test that the environment is loaded once until the config is reset or replaced."""
+        monkeypatch.setenv("AZURE_MAX_WORKERS", "3")
+        config = get_config()
+
+        monkeypatch.setenv("AZURE_MAX_WORKERS", "7")
+        assert get_config() is config
+
+        custom = AzureFinOpsConfig(subscription_id="sub-1", max_parallel_workers=2)
+        set_config(custom)
+        assert get_config() is custom
+
+        reset_config()
+        assert get_config().max_parallel_workers == 7
+
+    def test_vm_monthly_cost_rates(self):
+        """Test that monthly VM rates are derived once from the hourly rates."""
+        config = AzureFinOpsConfig(vm_cost_rates={"Standard_B1s": 0.0104}, hours_per_month=730)
+
+        assert config.vm_monthly_cost_rates is config.vm_monthly_cost_rates
+        assert config.vm_monthly_cost_rates == {"Standard_B1s": 7.59, "default": 73.0}
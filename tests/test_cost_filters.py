@@ -0,0 +1,72 @@
+"""Unit tests for cost filtering utilities."""
+
+from unittest.mock import patch
+
+from azure_finops_mcp_server.helpers.cost_filters import (
+    _cost_filters_cached,
+    cost_filters,
+    map_group_by,
+    validate_filters,
+)
+
+
+class TestCostFilters:
+    """Test building cost query filters."""
+
+    def setup_method(self):
+        """Start each test with an empty filter cache."""
+        _cost_filters_cached.cache_clear()
+
+    def teardown_method(self):
+        """Clean up after tests."""
+        _cost_filters_cached.cache_clear()
+
+    @patch("azure_finops_mcp_server.helpers.cost_filters.QueryFilter")
+    @patch("azure_finops_mcp_server.helpers.cost_filters.QueryComparisonExpression")
+    def test_dimension_names_are_mapped(self, mock_expression, mock_filter):
+        """Test that friendly dimension names map to Cost Management columns."""
+        result = cost_filters(dimensions=["Location=eastus"])
+
+        mock_expression.assert_called_once_with(name="ResourceLocation", operator="In", values=["eastus"])
+        mock_filter.assert_called_once_with(dimensions=mock_expression.return_value)
+        assert result is mock_filter.return_value
+
+    @patch("azure_finops_mcp_server.helpers.cost_filters.QueryFilter")
+    @patch("azure_finops_mcp_server.helpers.cost_filters.QueryComparisonExpression")
+    def test_values_keep_extra_equals_signs(self, mock_expression, mock_filter):
+        """Test that only the first '=' separates key and value."""
+        cost_filters(tags=["team=a=b"])
+
+        mock_expression.assert_called_once_with(name="team", operator="In", values=["a=b"])
+
+    @patch("azure_finops_mcp_server.helpers.cost_filters.QueryFilter")
+    @patch("azure_finops_mcp_server.helpers.cost_filters.QueryComparisonExpression")
+    def test_identical_specs_are_built_once(self, mock_expression, mock_filter):
+        """Test that repeated filter specs reuse the built filter, whatever the sequence type."""
+        mock_filter.side_effect = lambda **kwargs: object()
+
+        first = cost_filters(tags=["env=prod"], dimensions=["Location=eastus"])
+
+        assert cost_filters(tags=("env=prod",), dimensions=["Location=eastus"]) is first
+        assert cost_filters(tags=["env=dev"]) is not first
+        assert mock_filter.call_count == 3  # two for the first spec, one for the second
+
+    def test_malformed_filters_are_skipped(self):
+        """Test that entries without '=' produce no filter."""
+        assert cost_filters(tags=["env"], dimensions=["Location"]) is None
+        assert cost_filters() is None
+
+    def test_validate_filters(self):
+        """Test that validation reports errors and unknown dimensions."""
+        validation = validate_filters(tags=["env"], dimensions=["Location=eastus", "Custom=x"])
+
+        assert validation["valid"] is False
+        assert validation["errors"] == ["Invalid tag format: 'env'. Expected 'key=value'"]
+        assert len(validation["warnings"]) == 1
+        assert validation["warnings"][0].startswith("Dimension 'Custom' may not be valid")
+
+    def test_map_group_by(self):
+        """Test that AWS-style groupings map to Azure dimensions and others pass through."""
+        assert map_group_by("SERVICE") == "ServiceName"
+        assert map_group_by("RESOURCE_GROUP") == "ResourceGroupName"
+        assert map_group_by("MeterCategory") == "MeterCategory"
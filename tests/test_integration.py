@@ -1,5 +1,7 @@
 """Integration tests with mock Azure responses."""
 
+import asyncio
+import threading
 from datetime import date, datetime, timedelta
 from typing import Any, Dict, List
 from unittest.mock import MagicMock, Mock, patch
@@ -37,6 +39,9 @@ class MockAzureResources:
             status_obj.code = "PowerState/running"
             instance_view.statuses.append(status_obj)
 
+        # Listings expanded with instanceView carry the power state on the VM itself
+        vm.instance_view = instance_view
+
         return vm, instance_view
 
     @staticmethod
@@ -149,6 +154,128 @@ class TestVMOperationsIntegration:
         assert result["statistics"]["total_vms_checked"] == 2  # vm1 and vm2 in eastus
         assert errors == {}
 
+        # Power states come from the expanded listing, not one call per VM
+        mock_compute_client.virtual_machines.list_all.assert_called_once_with(expand="instanceView")
+        mock_compute_client.virtual_machines.instance_view.assert_not_called()
+
+    @patch("azure_finops_mcp_server.helpers.vm_operations.get_client_factory")
+    def test_get_stopped_vms_fetches_missing_instance_views(self, mock_get_factory):
+        """Test that VMs listed without an instance view fall back to a per-VM call."""
+        from azure_finops_mcp_server.helpers.vm_operations import get_stopped_vms
+
+        vm1, _ = MockAzureResources.create_mock_vm("vm1", "eastus", "running")
+        vm2, instance2 = MockAzureResources.create_mock_vm("vm2", "eastus", "deallocated")
+        vm2.instance_view = None
+
+        mock_compute_client = Mock()
+        mock_compute_client.virtual_machines.list_all.return_value = [vm1, vm2]
+        mock_compute_client.virtual_machines.instance_view.return_value = instance2
+        mock_get_factory.return_value.create_compute_client.return_value = mock_compute_client
+
+        result, errors = get_stopped_vms(Mock(), "test-sub")
+
+        assert [vm["name"] for vm in result["stopped_vms"]] == ["vm2"]
+        mock_compute_client.virtual_machines.instance_view.assert_called_once_with(
+            resource_group_name="test-rg", vm_name="vm2"
+        )
+        assert errors == {}
+
+    @patch("azure_finops_mcp_server.helpers.vm_operations.get_client_factory")
+    def test_get_stopped_vms_matches_power_states_exactly(self, mock_get_factory):
+        """Test that stopped and deallocated VMs are reported but transitional states are not."""
+        from azure_finops_mcp_server.helpers.vm_operations import get_stopped_vms
+
+        vms = []
+        for name, code in [
+            ("vm1", "PowerState/stopped"),
+            ("vm2", "PowerState/deallocated"),
+            ("vm3", "PowerState/deallocating"),
+            ("vm4", None),
+        ]:
+            vm, instance_view = MockAzureResources.create_mock_vm(name, "eastus", "running")
+            instance_view.statuses = [Mock(code="ProvisioningState/succeeded"), Mock(code=code)]
+            vms.append(vm)
+
+        mock_get_factory.return_value.create_compute_client.return_value.virtual_machines.list_all.return_value = vms
+
+        result, errors = get_stopped_vms(Mock(), "test-sub")
+
+        assert [vm["name"] for vm in result["stopped_vms"]] == ["vm1", "vm2"]
+        assert result["statistics"]["total_vms_checked"] == 4
+        assert errors == {}
+
+    @patch("azure_finops_mcp_server.helpers.vm_operations.get_client_factory")
+    def test_get_stopped_vms_reports_stopped_but_allocated_vms(self, mock_get_factory):
+        """Test that a VM stopped from inside the guest, which is still billed, is reported."""
+        from azure_finops_mcp_server.helpers.vm_operations import get_stopped_vms
+
+        vm, instance_view = MockAzureResources.create_mock_vm("vm1", "eastus", "running")
+        instance_view.statuses = [Mock(code="ProvisioningState/succeeded"), Mock(code="PowerState/stopped")]
+        mock_get_factory.return_value.create_compute_client.return_value.virtual_machines.list_all.return_value = [vm]
+
+        result, errors = get_stopped_vms(Mock(), "test-sub")
+
+        assert [vm["name"] for vm in result["stopped_vms"]] == ["vm1"]
+        assert result["statistics"]["total_stopped"] == 1
+        assert errors == {}
+
+    @patch("azure_finops_mcp_server.helpers.vm_operations.get_client_factory")
+    def test_get_stopped_vms_streams_listing(self, mock_get_factory):
+        """Test that VMs are processed from a one-shot pager alongside VMs needing an instance view call."""
+        from azure_finops_mcp_server.helpers.vm_operations import get_stopped_vms
+
+        vm1, _ = MockAzureResources.create_mock_vm("vm1", "eastus", "deallocated")
+        vm2, instance2 = MockAzureResources.create_mock_vm("vm2", "eastus", "deallocated")
+        vm3, _ = MockAzureResources.create_mock_vm("vm3", "westus", "deallocated")
+        vm2.instance_view = None
+
+        mock_compute_client = Mock()
+        mock_compute_client.virtual_machines.list_all.return_value = iter([vm1, vm2, vm3])
+        mock_compute_client.virtual_machines.instance_view.return_value = instance2
+        mock_get_factory.return_value.create_compute_client.return_value = mock_compute_client
+
+        result, errors = get_stopped_vms(Mock(), "test-sub", regions=["eastus"])
+
+        assert sorted(vm["name"] for vm in result["stopped_vms"]) == ["vm1", "vm2"]
+        assert result["statistics"]["total_vms_checked"] == 2
+        assert result["stopped_vms"][0]["estimated_monthly_cost"] > 0
+        assert errors == {}
+
+    @patch("azure_finops_mcp_server.helpers.vm_operations.get_retry_handler")
+    @patch("azure_finops_mcp_server.helpers.vm_operations.get_client_factory")
+    def test_get_stopped_vms_retries_and_reports_instance_view_failures(self, mock_get_factory, mock_get_retry_handler):
+        """Test that throttled instance view calls are retried and persistent failures are reported."""
+        from azure.core.exceptions import HttpResponseError
+
+        from azure_finops_mcp_server.helpers.retry_handler import RetryConfig, RetryHandler
+        from azure_finops_mcp_server.helpers.vm_operations import get_stopped_vms
+
+        mock_get_retry_handler.return_value = RetryHandler(RetryConfig(max_retries=1, initial_backoff=0, jitter=False))
+
+        vm1, instance1 = MockAzureResources.create_mock_vm("vm1", "eastus", "deallocated")
+        vm2, _ = MockAzureResources.create_mock_vm("vm2", "eastus", "deallocated")
+        vm1.instance_view = vm2.instance_view = None
+
+        throttled = HttpResponseError(message="Too many requests")
+        throttled.status_code = 429
+        attempts = {"vm1": [throttled, instance1], "vm2": [throttled, throttled]}
+
+        def instance_view(resource_group_name, vm_name):
+            outcome = attempts[vm_name].pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        mock_compute_client = Mock()
+        mock_compute_client.virtual_machines.list_all.return_value = [vm1, vm2]
+        mock_compute_client.virtual_machines.instance_view.side_effect = instance_view
+        mock_get_factory.return_value.create_compute_client.return_value = mock_compute_client
+
+        result, errors = get_stopped_vms(Mock(), "test-sub")
+
+        assert [vm["name"] for vm in result["stopped_vms"]] == ["vm1"]
+        assert errors == {"instance_view:vm2": "Failed to get instance view for VM vm2"}
+
     @patch("azure_finops_mcp_server.helpers.vm_operations.get_client_factory")
     def test_vm_operations_with_error_handling(self, mock_get_factory):
         """Test VM operations with API errors."""
@@ -172,6 +299,23 @@ class TestVMOperationsIntegration:
         assert "stopped_vms" in errors
         assert "Failed to get stopped VMs" in errors["stopped_vms"]
 
+    @patch("azure_finops_mcp_server.helpers.vm_operations.estimate_vm_monthly_cost")
+    def test_calculate_vm_waste_estimates_only_missing_costs(self, mock_estimate):
+        """Test that VM waste only estimates VMs without a precomputed cost."""
+        from azure_finops_mcp_server.helpers.vm_operations import calculate_vm_waste
+
+        mock_estimate.return_value = 73.0
+        stopped_vms = [
+            {"name": "vm1", "vm_size": "Standard_B1s", "estimated_monthly_cost": 7.59},
+            {"name": "vm2", "vm_size": "Unknown"},
+        ]
+
+        waste = calculate_vm_waste(stopped_vms)
+
+        mock_estimate.assert_called_once_with("Unknown")
+        assert waste["vm_breakdown"] == {"vm1": 7.59, "vm2": 73.0}
+        assert waste["total_monthly_waste"] == 80.59
+
 
 class TestDiskOperationsIntegration:
     """Integration tests for disk operations."""
@@ -203,8 +347,218 @@ class TestDiskOperationsIntegration:
         assert result["summary"]["total_unattached_disks"] == 2
         assert result["summary"]["orphaned_count"] == 1
         assert result["summary"]["pvc_count"] == 1
+        assert result["summary"]["orphaned_monthly_cost"] == 5.0  # 100GB * 0.05
+        assert result["summary"]["total_monthly_cost"] == 7.5  # + 50GB * 0.05
+        assert result["cost_analysis"]["by_sku"] == {"Standard_LRS": {"count": 2, "total_gb": 150, "cost": 7.5}}
+        assert result["orphaned_disks"][0]["name"] == "disk1"
+        assert result["orphaned_disks"][0]["resource_group"] == "test-rg"
+        assert result["orphaned_disks"][0]["monthly_cost"] == 5.0
+        assert errors == {}
+
+    @patch("azure_finops_mcp_server.helpers.disk_operations.get_client_factory")
+    def test_disk_audit_totals_are_exact_cents(self, mock_get_factory):
+        """Test that summed disk costs do not accumulate float drift."""
+        from azure_finops_mcp_server.helpers.disk_operations import get_detailed_disk_audit
+
+        disks = [MockAzureResources.create_mock_disk(f"disk{i}", "eastus", 1, attached=False) for i in range(10)]
+        for disk in disks:
+            disk.sku.name = "StandardSSD_LRS"  # 0.12 per GB/month
+
+        mock_get_factory.return_value.create_compute_client.return_value.disks.list.return_value = disks
+
+        result, errors = get_detailed_disk_audit(Mock(), "test-sub")
+
+        assert result["orphaned_disks"][0]["monthly_cost"] == 0.12
+        assert result["orphaned_disks"][0]["annual_cost"] == 1.44
+        assert result["cost_analysis"]["by_sku"]["StandardSSD_LRS"]["cost"] == 1.2
+        assert result["summary"]["total_monthly_cost"] == 1.2
         assert errors == {}
 
+    def test_batch_disk_costs_match_scalar_estimate(self):
+        """Test that the batch costing path prices every SKU like estimate_disk_cost."""
+        from azure_finops_mcp_server.helpers.disk_operations import calculate_disk_costs, estimate_disk_cost
+
+        skus = ["Standard_LRS", "StandardSSD_LRS", "Premium_LRS", "UltraSSD_LRS", "Unknown_LRS"]
+        disks = [{"size_gb": 1 + i % 4096, "sku": skus[i % len(skus)]} for i in range(10_000)]
+
+        for disk in calculate_disk_costs(disks):
+            assert disk["monthly_cost"] == round(estimate_disk_cost(disk["size_gb"], disk["sku"]), 2)
+
+    def test_iter_unattached_disks_streams(self):
+        """Test that unattached disks are yielded lazily from a one-shot pager."""
+        from azure_finops_mcp_server.helpers.disk_operations import iter_unattached_disks
+
+        mock_compute_client = Mock()
+        mock_compute_client.disks.list.return_value = iter(
+            [
+                MockAzureResources.create_mock_disk("disk1", "eastus", 100, attached=False),
+                MockAzureResources.create_mock_disk("disk2", "eastus", 50, attached=True),
+                MockAzureResources.create_mock_disk("disk3", "eastus", 20, attached=False),
+            ]
+        )
+
+        disks = iter_unattached_disks(mock_compute_client)
+        mock_compute_client.disks.list.assert_not_called()
+
+        assert next(disks)["name"] == "disk1"
+        assert [disk["name"] for disk in disks] == ["disk3"]
+
+    def test_iter_unattached_disks_formats_created_time(self):
+        """Test that creation times are reported as ISO strings, or None when Azure has none."""
+        from azure_finops_mcp_server.helpers.disk_operations import iter_unattached_disks
+
+        dated = MockAzureResources.create_mock_disk("disk1", "eastus", 100)
+        dated.time_created = datetime(2024, 1, 2, 3, 4, 5)
+        undated = MockAzureResources.create_mock_disk("disk2", "eastus", 50)
+        undated.time_created = None
+        mock_compute_client = Mock()
+        mock_compute_client.disks.list.return_value = iter([dated, undated])
+
+        disks = list(iter_unattached_disks(mock_compute_client))
+
+        assert [disk["created_time"] for disk in disks] == ["2024-01-02T03:04:05", None]
+
+    @patch("azure_finops_mcp_server.helpers.disk_operations.get_client_factory")
+    def test_get_unattached_disks_categorizes_and_filters(self, mock_get_factory):
+        """Test that every unattached disk is categorized but only included categories are returned."""
+        from azure_finops_mcp_server.helpers.disk_operations import get_unattached_disks
+
+        aks_disk = MockAzureResources.create_mock_disk("aks-disk", "eastus", 30, attached=False)
+        aks_disk.id = aks_disk.id.replace("test-rg", "MC_cluster")
+        mock_get_factory.return_value.create_compute_client.return_value.disks.list.return_value = [
+            MockAzureResources.create_mock_disk("disk1", "eastus", 100, attached=False),
+            MockAzureResources.create_mock_disk("pvc-disk", "eastus", 50, attached=False),
+            aks_disk,
+            MockAzureResources.create_mock_disk("disk4", "eastus", 10, attached=True),
+        ]
+
+        result, errors = get_unattached_disks(Mock(), "test-sub", include_pvc_disks=True)
+
+        assert [disk["name"] for disk in result["unattached_disks"]] == ["disk1", "pvc-disk"]
+        assert result["categories"]["aks_managed"][0]["resource_group"] == "MC_cluster"
+        assert result["statistics"]["total_unattached"] == 3
+        assert result["statistics"]["included_in_results"] == 2
+        assert errors == {}
+
+    def test_categorize_disks_uses_configured_aks_patterns(self):
+        """Test that list categorization honours the configured managed resource group patterns."""
+        from azure_finops_mcp_server.config import AzureFinOpsConfig, reset_config, set_config
+        from azure_finops_mcp_server.helpers.disk_operations import categorize_disks
+
+        set_config(AzureFinOpsConfig(subscription_id="sub-1", managed_resource_group_patterns=["MC_", "mrg-"]))
+        try:
+            categories = categorize_disks(
+                [
+                    {"name": "pvc-1", "resource_group": "MC_cluster"},
+                    {"name": "disk1", "resource_group": "mrg-app"},
+                    {"name": "disk2", "resource_group": "app-rg"},
+                ]
+            )
+        finally:
+            reset_config()
+
+        assert {category: [disk["name"] for disk in disks] for category, disks in categories.items()} == {
+            "orphaned": ["disk2"],
+            "pvc": ["pvc-1"],
+            "aks_managed": ["disk1"],
+        }
+
+    def test_iter_detailed_disk_audit_streams_until_max_results(self):
+        """Test that the streaming audit yields priced disks and stops paging at max_results."""
+        from azure_finops_mcp_server.helpers.disk_operations import iter_detailed_disk_audit
+
+        listed = []
+
+        def list_disks():
+            for disk in [
+                MockAzureResources.create_mock_disk("pvc-disk", "eastus", 50, attached=False),
+                MockAzureResources.create_mock_disk("disk2", "westus", 100, attached=False),
+                MockAzureResources.create_mock_disk("disk3", "eastus", 20, attached=False),
+            ]:
+                listed.append(disk.name)
+                yield disk
+
+        mock_compute_client = Mock()
+        mock_compute_client.disks.list.return_value = list_disks()
+
+        audit = list(iter_detailed_disk_audit(mock_compute_client, max_results=2))
+
+        assert [(category, location, cost) for category, location, _, cost in audit] == [
+            ("pvc", "eastus", 2.5),
+            ("orphaned", "westus", 5.0),
+        ]
+        assert audit[1][2]["name"] == "disk2"
+        assert audit[1][2]["annual_cost"] == 60.0
+        assert listed == ["pvc-disk", "disk2"]
+
+    @patch("azure_finops_mcp_server.helpers.disk_operations.get_retry_handler")
+    def test_iter_unattached_disks_retries_failed_page(self, mock_get_retry_handler):
+        """Test that a throttled page is retried without losing the pages around it."""
+        from azure.core.exceptions import HttpResponseError
+        from azure.core.paging import ItemPaged
+
+        from azure_finops_mcp_server.helpers.disk_operations import iter_unattached_disks
+        from azure_finops_mcp_server.helpers.retry_handler import RetryConfig, RetryHandler
+
+        mock_get_retry_handler.return_value = RetryHandler(RetryConfig(max_retries=2, initial_backoff=0, jitter=False))
+
+        pages = {
+            None: ("page2", [MockAzureResources.create_mock_disk("disk1", "eastus", 100, attached=False)]),
+            "page2": (None, [MockAzureResources.create_mock_disk("disk2", "eastus", 50, attached=False)]),
+        }
+        failures = ["page2"]
+
+        def get_next(continuation_token):
+            if continuation_token in failures:
+                failures.remove(continuation_token)
+                error = HttpResponseError(message="Too many requests")
+                error.status_code = 429
+                raise error
+            return continuation_token
+
+        mock_compute_client = Mock()
+        mock_compute_client.disks.list.return_value = ItemPaged(get_next, pages.__getitem__)
+
+        disks = list(iter_unattached_disks(mock_compute_client))
+
+        assert [disk["name"] for disk in disks] == ["disk1", "disk2"]
+        assert mock_get_retry_handler.return_value.stats["successful_retries"] == 1
+
+    @patch("azure_finops_mcp_server.helpers.disk_operations.get_client_factory")
+    def test_audit_subscriptions_in_parallel(self, mock_get_factory):
+        """Test auditing disks across several subscriptions."""
+        from azure_finops_mcp_server.helpers.disk_operations import audit_subscriptions
+
+        disks_by_sub = {
+            "sub1": [MockAzureResources.create_mock_disk("disk1", "eastus", 100, attached=False)],
+            "sub2": [
+                MockAzureResources.create_mock_disk("disk2", "eastus", 50, attached=False),
+                MockAzureResources.create_mock_disk("pvc-disk", "eastus", 10, attached=False),
+            ],
+        }
+
+        def create_compute_client(subscription_id):
+            client = Mock()
+            if subscription_id == "sub3":
+                client.disks.list.side_effect = RuntimeError("API Error")
+            else:
+                client.disks.list.return_value = disks_by_sub[subscription_id]
+            return client
+
+        mock_factory = Mock()
+        mock_factory.create_compute_client.side_effect = create_compute_client
+        mock_get_factory.return_value = mock_factory
+
+        # Execute
+        audits, errors = audit_subscriptions(Mock(), ["sub1", "sub2", "sub3"])
+
+        # Verify
+        assert audits["sub1"]["summary"]["orphaned_count"] == 1
+        assert audits["sub2"]["summary"]["orphaned_count"] == 1
+        assert audits["sub2"]["summary"]["pvc_count"] == 1
+        assert list(errors) == ["sub3"]
+        assert "Failed to perform disk audit" in errors["sub3"]
+
 
 class TestBudgetOperationsIntegration:
     """Integration tests for budget operations."""
@@ -245,6 +599,245 @@ class TestBudgetOperationsIntegration:
         assert errors == {}
 
 
+class TestCostIntegration:
+    """Integration tests for the get_cost tool."""
+
+    def setup_method(self):
+        """Start each test with an empty cost cache."""
+        reset_cache()
+
+    def teardown_method(self):
+        """Clean up after tests."""
+        reset_cache()
+
+    @patch("azure_finops_mcp_server.main.CostManagementClient")
+    @patch("azure_finops_mcp_server.main.get_credential")
+    @patch("azure_finops_mcp_server.main.profiles_to_use")
+    def test_get_cost_queries_subscriptions_concurrently(self, mock_profiles, mock_credential, mock_cost_client):
+        """Test that every subscription is queried and results keep subscription order."""
+        from azure_finops_mcp_server.main import get_cost
+
+        mock_profiles.return_value = ({"sub1": ["Subscription 1"], "sub2": ["Subscription 2"]}, {})
+
+        query_result = Mock()
+        query_result.rows = [[10.0, "Storage"], [25.5, "Virtual Machines"], [0.0, "Bandwidth"]]
+        mock_cost_client.return_value.query.usage.return_value = query_result
+
+        result = asyncio.run(get_cost(profiles=["Subscription 1", "Subscription 2"], time_range_days=7))
+
+        cost_data = result["accounts_cost_data"]
+        assert list(cost_data) == ["Subscription: Subscription 1", "Subscription: Subscription 2"]
+        assert cost_data["Subscription: Subscription 1"]["Total Cost"] == 35.5
+        assert cost_data["Subscription: Subscription 1"]["Cost By ServiceName"] == {
+            "Virtual Machines": 25.5,
+            "Storage": 10.0,
+        }
+        assert mock_cost_client.return_value.query.usage.call_count == 2
+        mock_cost_client.assert_called_once()  # one client shared by all subscriptions
+
+    @patch("azure_finops_mcp_server.main.CostManagementClient")
+    @patch("azure_finops_mcp_server.main.get_credential")
+    @patch("azure_finops_mcp_server.main.profiles_to_use")
+    def test_get_cost_reports_per_subscription_errors(self, mock_profiles, mock_credential, mock_cost_client):
+        """Test that a failing subscription does not abort the others."""
+        from azure_finops_mcp_server.main import get_cost
+
+        mock_profiles.return_value = ({"sub1": ["Subscription 1"], "sub2": ["Subscription 2"]}, {})
+
+        query_result = Mock()
+        query_result.rows = [[5.0, "Storage"]]
+
+        def usage(scope, parameters):
+            if scope == "/subscriptions/sub1":
+                raise RuntimeError("API Error")
+            return query_result
+
+        mock_cost_client.return_value.query.usage.side_effect = usage
+
+        result = asyncio.run(get_cost(profiles=["Subscription 1", "Subscription 2"], time_range_days=7))
+
+        cost_data = result["accounts_cost_data"]
+        assert cost_data["Subscription 1"]["status"] == "error"
+        assert cost_data["Subscription: Subscription 2"]["Total Cost"] == 5.0
+
+    @patch("azure_finops_mcp_server.main.CostManagementClient")
+    @patch("azure_finops_mcp_server.main.get_credential")
+    @patch("azure_finops_mcp_server.main.profiles_to_use")
+    def test_get_cost_caches_successful_queries(self, mock_profiles, mock_credential, mock_cost_client):
+        """Test that repeated identical requests are served from the cache."""
+        from azure_finops_mcp_server.main import get_cost
+
+        mock_profiles.return_value = ({"sub1": ["Subscription 1"]}, {})
+
+        query_result = Mock()
+        query_result.rows = [[5.0, "Storage"]]
+        mock_cost_client.return_value.query.usage.return_value = query_result
+
+        first = asyncio.run(get_cost(profiles=["Subscription 1"], time_range_days=7))
+        second = asyncio.run(get_cost(profiles=["Subscription 1"], time_range_days=7))
+        asyncio.run(get_cost(profiles=["Subscription 1"], time_range_days=30))
+
+        assert second["accounts_cost_data"] == first["accounts_cost_data"]
+        # The repeated request is cached; a different period is a different query
+        assert mock_cost_client.return_value.query.usage.call_count == 2
+
+    @patch("azure_finops_mcp_server.main.cost_filters")
+    @patch("azure_finops_mcp_server.main.CostManagementClient")
+    @patch("azure_finops_mcp_server.main.get_credential")
+    @patch("azure_finops_mcp_server.main.profiles_to_use")
+    def test_get_cost_cache_key_keeps_filter_order(
+        self, mock_profiles, mock_credential, mock_cost_client, mock_cost_filters
+    ):
+        """Test that reordered tag lists, which build different filters, do not share a cache entry."""
+        from azure_finops_mcp_server.main import get_cost
+
+        mock_profiles.return_value = ({"sub1": ["Subscription 1"]}, {})
+
+        query_result = Mock()
+        query_result.rows = [[5.0, "Storage"]]
+        mock_cost_client.return_value.query.usage.return_value = query_result
+
+        asyncio.run(get_cost(profiles=["Subscription 1"], time_range_days=7, tags=["Env=Prod", "Team=A"]))
+        asyncio.run(get_cost(profiles=["Subscription 1"], time_range_days=7, tags=["Team=A", "Env=Prod"]))
+
+        assert mock_cost_client.return_value.query.usage.call_count == 2
+
+
+class TestAuditIntegration:
+    """Integration tests for the run_finops_audit tool."""
+
+    @patch("azure_finops_mcp_server.main.is_resource_graph_enabled", return_value=False)
+    @patch("azure_finops_mcp_server.main.get_budget_data")
+    @patch("azure_finops_mcp_server.main.get_unassociated_public_ips")
+    @patch("azure_finops_mcp_server.main.get_unattached_disks")
+    @patch("azure_finops_mcp_server.main.get_stopped_vms")
+    @patch("azure_finops_mcp_server.main.get_credential")
+    @patch("azure_finops_mcp_server.main.profiles_to_use")
+    def test_run_finops_audit_runs_auditors_concurrently(
+        self, mock_profiles, mock_credential, mock_vms, mock_disks, mock_ips, mock_budgets, mock_graph_enabled
+    ):
+        """Test that the four auditors of a subscription run at the same time."""
+        from azure_finops_mcp_server.main import run_finops_audit
+
+        mock_profiles.return_value = ({"sub1": ["Subscription 1"], "sub2": ["Subscription 2"]}, {})
+
+        # Each auditor blocks until all four of its subscription's auditors are running
+        barriers = {"sub1": threading.Barrier(4, timeout=5), "sub2": threading.Barrier(4, timeout=5)}
+
+        def auditor(result):
+            def run(credential, subscription_id, *args):
+                barriers[subscription_id].wait()
+                return {subscription_id: result}, {}
+
+            return run
+
+        mock_vms.side_effect = auditor("vms")
+        mock_disks.side_effect = auditor("disks")
+        mock_ips.side_effect = auditor("ips")
+        mock_budgets.side_effect = auditor("budgets")
+
+        result = asyncio.run(run_finops_audit(regions=["eastus"], profiles=["Subscription 1", "Subscription 2"]))
+
+        report = result["Audit Report"]
+        assert list(report) == ["Subscription: Subscription 1", "Subscription: Subscription 2"]
+        audit = report["Subscription: Subscription 2"][0]
+        assert audit["Subscription ID"] == "sub2"
+        assert audit["Stopped/Deallocated VMs"] == {"sub2": "vms"}
+        assert audit["Budget Status"] == {"sub2": "budgets"}
+        assert audit["Errors getting Disks"] == {}
+        mock_vms.assert_any_call(mock_credential.return_value, "sub1", ["eastus"])
+        assert result["Error processing subscriptions"] == {}
+
+    @patch("azure_finops_mcp_server.main.audit_with_resource_graph")
+    @patch("azure_finops_mcp_server.main.is_resource_graph_enabled", return_value=True)
+    @patch("azure_finops_mcp_server.main.get_budget_data")
+    @patch("azure_finops_mcp_server.main.get_unassociated_public_ips")
+    @patch("azure_finops_mcp_server.main.get_unattached_disks")
+    @patch("azure_finops_mcp_server.main.get_stopped_vms")
+    @patch("azure_finops_mcp_server.main.get_credential")
+    @patch("azure_finops_mcp_server.main.profiles_to_use")
+    def test_run_finops_audit_uses_resource_graph(
+        self, mock_profiles, mock_credential, mock_vms, mock_disks, mock_ips, mock_budgets, _, mock_graph_audit
+    ):
+        """Test that Resource Graph results replace the SDK auditors, which only run for missing subscriptions."""
+        from azure_finops_mcp_server.main import run_finops_audit
+
+        mock_profiles.return_value = ({"sub1": ["Subscription 1"], "sub2": ["Subscription 2"]}, {})
+        mock_graph_audit.return_value = {"sub1": (({"graph": "vms"}, {}), ({"graph": "disks"}, {}), ({}, {}))}
+        for auditor in (mock_vms, mock_disks, mock_ips, mock_budgets):
+            auditor.return_value = ({"sdk": True}, {})
+
+        result = asyncio.run(run_finops_audit(profiles=["Subscription 1", "Subscription 2"]))
+
+        report = result["Audit Report"]
+        audit = report["Subscription: Subscription 1"][0]
+        assert audit["Stopped/Deallocated VMs"] == {"graph": "vms"}
+        assert audit["Unattached Managed Disks"] == {"graph": "disks"}
+        assert audit["Budget Status"] == {"sdk": True}
+        assert report["Subscription: Subscription 2"][0]["Stopped/Deallocated VMs"] == {"sdk": True}
+        mock_graph_audit.assert_called_once_with(mock_credential.return_value, ["sub1", "sub2"], None)
+        mock_vms.assert_called_once_with(mock_credential.return_value, "sub2", None)
+
+    @patch("azure_finops_mcp_server.main.audit_with_resource_graph")
+    @patch("azure_finops_mcp_server.main.is_resource_graph_enabled", return_value=True)
+    @patch("azure_finops_mcp_server.main.get_budget_data")
+    @patch("azure_finops_mcp_server.main.get_unassociated_public_ips")
+    @patch("azure_finops_mcp_server.main.get_unattached_disks")
+    @patch("azure_finops_mcp_server.main.get_stopped_vms")
+    @patch("azure_finops_mcp_server.main.get_credential")
+    @patch("azure_finops_mcp_server.main.profiles_to_use")
+    def test_run_finops_audit_falls_back_when_resource_graph_fails(
+        self, mock_profiles, mock_credential, mock_vms, mock_disks, mock_ips, mock_budgets, _, mock_graph_audit
+    ):
+        """Test that a failed Resource Graph audit falls back to the per-subscription SDK auditors."""
+        from azure.core.exceptions import HttpResponseError
+
+        from azure_finops_mcp_server.main import run_finops_audit
+
+        mock_profiles.return_value = ({"sub1": ["Subscription 1"]}, {})
+        mock_graph_audit.side_effect = HttpResponseError("Forbidden")
+        for auditor in (mock_vms, mock_disks, mock_ips, mock_budgets):
+            auditor.return_value = ({"sdk": True}, {})
+
+        result = asyncio.run(run_finops_audit(profiles=["Subscription 1"]))
+
+        audit = result["Audit Report"]["Subscription: Subscription 1"][0]
+        assert audit["Stopped/Deallocated VMs"] == {"sdk": True}
+        assert audit["Unassociated Public IPs"] == {"sdk": True}
+        mock_vms.assert_called_once_with(mock_credential.return_value, "sub1", None)
+
+    @patch("azure_finops_mcp_server.main.audit_with_resource_graph")
+    @patch("azure_finops_mcp_server.main.is_resource_graph_enabled", return_value=True)
+    @patch("azure_finops_mcp_server.main.get_budget_data")
+    @patch("azure_finops_mcp_server.main.get_credential")
+    @patch("azure_finops_mcp_server.main.profiles_to_use")
+    def test_run_finops_audit_overlaps_budgets_with_resource_graph(
+        self, mock_profiles, mock_credential, mock_budgets, _, mock_graph_audit
+    ):
+        """Test that budgets are fetched while the Resource Graph query is still running."""
+        from azure_finops_mcp_server.main import run_finops_audit
+
+        mock_profiles.return_value = ({"sub1": ["Subscription 1"]}, {})
+        started = threading.Barrier(2, timeout=5)
+
+        def graph_audit(credential, subscription_ids, regions):
+            started.wait()
+            return {"sub1": (({"graph": "vms"}, {}), ({"graph": "disks"}, {}), ({}, {}))}
+
+        def budgets(credential, subscription_id):
+            started.wait()
+            return {"budgets": subscription_id}, {}
+
+        mock_graph_audit.side_effect = graph_audit
+        mock_budgets.side_effect = budgets
+
+        result = asyncio.run(run_finops_audit(profiles=["Subscription 1"]))
+
+        audit = result["Audit Report"]["Subscription: Subscription 1"][0]
+        assert audit["Stopped/Deallocated VMs"] == {"graph": "vms"}
+        assert audit["Budget Status"] == {"budgets": "sub1"}
+
+
 class TestParallelProcessingIntegration:
     """Integration tests for parallel subscription processing."""
 
@@ -322,6 +915,18 @@ class TestCachingIntegration:
         assert stats["misses"] == 1
         assert stats["hit_rate"] == 50.0
 
+    def test_make_key_ignores_argument_order(self):
+        """Test that callers building keys get the same key for the same parameters in any order."""
+        from azure_finops_mcp_server.helpers.cache_manager import CacheManager
+
+        cache = CacheManager()
+
+        assert cache.make_key("cost", start="2024-01-01", group_by="ServiceName") == cache.make_key(
+            "cost", group_by="ServiceName", start="2024-01-01"
+        )
+        assert cache.make_key("cost", start="2024-01-01") != cache.make_key("cost", start="2024-01-02")
+        assert cache.make_key("cost", tags=["x" * 200]).startswith("cost:")
+
     @patch("time.time")
     def test_cache_expiration(self, mock_time):
         """Test cache expiration."""
@@ -376,6 +981,27 @@ class TestRetryLogicIntegration:
         assert handler.stats["total_retries"] == 2
         assert handler.stats["successful_retries"] == 1
 
+    @patch("azure_finops_mcp_server.helpers.retry_handler.time.sleep")
+    def test_retry_honors_retry_after(self, mock_sleep):
+        """Test that a throttled call waits as long as the Retry-After header asks."""
+        from azure.core.exceptions import HttpResponseError
+
+        from azure_finops_mcp_server.helpers.retry_handler import RetryConfig, RetryHandler
+
+        handler = RetryHandler(RetryConfig(max_retries=2, initial_backoff=0.1, max_backoff=30, jitter=False))
+
+        throttled = HttpResponseError(message="Too many requests")
+        throttled.status_code = 429
+        throttled.response = Mock(headers={"Retry-After": "12"})
+        flaky_function = Mock(side_effect=[throttled, "Success"])
+
+        assert handler.execute_with_retry(flaky_function) == "Success"
+        mock_sleep.assert_called_once_with(12.0)
+
+        # Excessive server delays are capped at max_backoff
+        throttled.response = Mock(headers={"Retry-After": "3600"})
+        assert handler.retry_after(throttled) == 30
+
     def test_no_retry_on_auth_error(self):
         """Test that auth errors are not retried."""
         from azure.core.exceptions import ClientAuthenticationError
@@ -0,0 +1,245 @@
+"""Unit tests for rate limiting."""
+
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from azure_finops_mcp_server.helpers.rate_limiter import (
+    RateLimitConfig,
+    RateLimiter,
+    RequestWindow,
+    TokenBucket,
+    get_rate_limiter,
+    reset_rate_limiter,
+)
+
+NS = 1_000_000_000
+
+
+class TestTokenBucket:
+    """Test the token bucket."""
+
+    @patch("azure_finops_mcp_server.helpers.rate_limiter.time.monotonic_ns")
+    def test_consume_and_refill(self, mock_monotonic_ns):
+        """Test that tokens are consumed and refilled at the configured rate."""
+        mock_monotonic_ns.return_value = 100 * NS
+        bucket = TokenBucket(rate=10.0, capacity=2)
+
+        assert bucket.consume()
+        assert bucket.consume()
+        assert not bucket.consume()
+
+        mock_monotonic_ns.return_value = 100 * NS + NS // 10  # one token refilled
+        assert bucket.consume()
+        assert not bucket.consume()
+
+    @patch("azure_finops_mcp_server.helpers.rate_limiter.time.monotonic_ns")
+    def test_tokens_capped_at_capacity(self, mock_monotonic_ns):
+        """Test that an idle bucket never holds more than its capacity."""
+        mock_monotonic_ns.return_value = 100 * NS
+        bucket = TokenBucket(rate=10.0, capacity=5)
+
+        mock_monotonic_ns.return_value = 1000 * NS
+        assert bucket.available_tokens() == 5
+        assert not bucket.consume(6)
+
+    @patch("azure_finops_mcp_server.helpers.rate_limiter.time.monotonic_ns")
+    def test_reserve_returns_wait_time(self, mock_monotonic_ns):
+        """Test that reservations queue up behind each other instead of polling."""
+        mock_monotonic_ns.return_value = 100 * NS
+        bucket = TokenBucket(rate=10.0, capacity=1)
+
+        assert bucket.reserve() == 0.0
+        assert bucket.reserve() == 0.1
+        assert bucket.reserve() == 0.2
+        assert bucket.available_tokens() == 0.0
+        assert not bucket.consume()
+
+        mock_monotonic_ns.return_value = 100 * NS + NS // 5  # the last reservation is now due
+        assert bucket.available_tokens() == 0.0
+        mock_monotonic_ns.return_value = 100 * NS + 3 * NS // 10
+        assert bucket.consume()
+
+    @patch("azure_finops_mcp_server.helpers.rate_limiter.time.monotonic_ns")
+    def test_no_drift_over_many_refills(self, mock_monotonic_ns):
+        """Test that integer time keeps refills exact over many consume cycles."""
+        now = 10**6 * NS
+        mock_monotonic_ns.return_value = now
+        bucket = TokenBucket(rate=10.0, capacity=1)
+
+        for _ in range(10_000):
+            assert bucket.consume()
+            now += NS // 10
+            mock_monotonic_ns.return_value = now
+
+    @patch("azure_finops_mcp_server.helpers.rate_limiter.time.monotonic_ns")
+    def test_consume_with_caller_clock(self, mock_monotonic_ns):
+        """Test that a caller-supplied timestamp replaces the clock read."""
+        mock_monotonic_ns.return_value = 100 * NS
+        bucket = TokenBucket(rate=10.0, capacity=1)
+        mock_monotonic_ns.reset_mock()
+
+        assert bucket.consume(now_ns=100 * NS)
+        assert not bucket.consume(now_ns=100 * NS)
+        assert bucket.reserve(now_ns=100 * NS) == 0.1
+        assert bucket.consume(now_ns=100 * NS + NS // 5)
+        mock_monotonic_ns.assert_not_called()
+
+    def test_rate_and_capacity_are_read_only(self):
+        """Test that the bucket's limits cannot change after construction."""
+        bucket = TokenBucket(rate=10.0, capacity=5)
+
+        with pytest.raises(AttributeError):
+            bucket.rate = 20.0
+        with pytest.raises(AttributeError):
+            bucket.capacity = 10
+        assert (bucket.rate, bucket.capacity) == (10.0, 5)
+
+    def test_concurrent_consumers_never_overdraw(self):
+        """Test that concurrent consumers cannot take more tokens than the bucket holds."""
+        bucket = TokenBucket(rate=0.001, capacity=50)
+        granted = []
+
+        def worker():
+            granted.append(sum(bucket.consume() for _ in range(20)))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sum(granted) == 50
+
+
+class TestRateLimitConfig:
+    """Test the rate limit configuration."""
+
+    def test_instances_are_slotted(self):
+        """Test that configs and windows carry no per-instance __dict__."""
+        config = RateLimitConfig(requests_per_second=5.0)
+
+        assert not hasattr(config, "__dict__")
+        assert not hasattr(RequestWindow(window_seconds=3), "__dict__")
+        assert not hasattr(TokenBucket(rate=1.0, capacity=1), "__dict__")
+        with pytest.raises(AttributeError):
+            config.unknown_setting = True
+
+
+class TestRequestWindow:
+    """Test the sliding-window request counter."""
+
+    @patch("azure_finops_mcp_server.helpers.rate_limiter.time.monotonic")
+    def test_requests_expire_from_window(self, mock_monotonic):
+        """Test that requests older than the window stop being counted."""
+        mock_monotonic.return_value = 1000.0
+        window = RequestWindow(window_seconds=3)
+        window.record()
+        window.record()
+
+        mock_monotonic.return_value = 1001.5
+        window.record()
+        assert window.count() == 3
+
+        mock_monotonic.return_value = 1003.0  # the first second has left the window
+        assert window.count() == 1
+
+        mock_monotonic.return_value = 2000.0
+        assert window.count() == 0
+
+
+class TestRateLimiter:
+    """Test the rate limiter."""
+
+    def test_per_subscription_buckets(self):
+        """Test that each subscription gets its own bucket."""
+        limiter = RateLimiter(RateLimitConfig(requests_per_second=0.001, burst_size=1))
+
+        assert limiter.acquire("sub-1")
+        assert not limiter.acquire("sub-1")
+        assert limiter.acquire("sub-2")
+
+        stats = limiter.get_stats("sub-1")
+        assert stats["capacity"] == 1.0
+        assert stats["recent_requests"] == 1.0
+
+    def test_disabled_limiter_always_allows(self):
+        """Test that a disabled limiter never blocks."""
+        limiter = RateLimiter(RateLimitConfig(enabled=False, burst_size=1))
+
+        assert all(limiter.acquire("sub-1") for _ in range(5))
+        assert limiter.get_stats() == {"enabled": 0.0}
+
+    def test_concurrent_first_requests_share_one_bucket(self):
+        """Test that racing first requests for a key create a single bucket and history."""
+        limiter = RateLimiter(RateLimitConfig(requests_per_second=0.001, burst_size=8))
+        start = threading.Barrier(8)
+        results = []
+
+        def worker():
+            start.wait()
+            results.append(limiter.acquire("sub-1"))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert all(results)
+        assert not limiter.acquire("sub-1")
+        assert limiter.get_stats("sub-1")["recent_requests"] == 8.0
+
+    def test_reset_single_key(self):
+        """Test that resetting one key leaves the others untouched."""
+        limiter = RateLimiter(RateLimitConfig(requests_per_second=0.001, burst_size=1))
+        limiter.acquire("sub-1")
+        limiter.acquire("sub-2")
+
+        limiter.reset("sub-1")
+
+        assert limiter.acquire("sub-1")
+        assert not limiter.acquire("sub-2")
+
+    @patch("azure_finops_mcp_server.helpers.rate_limiter.time.sleep")
+    def test_wait_if_needed_sleeps_once(self, mock_sleep):
+        """Test that a rate-limited caller sleeps exactly once for its reservation."""
+        limiter = RateLimiter(RateLimitConfig(requests_per_second=2.0, burst_size=1))
+
+        limiter.wait_if_needed("sub-1")
+        mock_sleep.assert_not_called()
+
+        limiter.wait_if_needed("sub-1")
+        mock_sleep.assert_called_once()
+        assert 0 < mock_sleep.call_args[0][0] <= 0.5
+
+
+class TestGlobalRateLimiter:
+    """Test the global rate limiter instance."""
+
+    def setup_method(self):
+        """Start each test without a global limiter."""
+        reset_rate_limiter()
+
+    def teardown_method(self):
+        """Clean up after tests."""
+        reset_rate_limiter()
+
+    def test_concurrent_first_calls_share_one_instance(self):
+        """Test that racing first callers all get the same limiter."""
+        start = threading.Barrier(8)
+        limiters = []
+
+        def worker():
+            start.wait()
+            limiters.append(get_rate_limiter())
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len({id(limiter) for limiter in limiters}) == 1
+        assert get_rate_limiter() is limiters[0]
@@ -0,0 +1,149 @@
+"""Unit tests for Azure Resource Graph audits."""
+
+from unittest.mock import Mock, patch
+
+from azure_finops_mcp_server.config import AzureFinOpsConfig, reset_config, set_config
+from azure_finops_mcp_server.helpers import resource_graph
+from azure_finops_mcp_server.helpers.resource_graph import (
+    _arg_query,
+    _region_filter,
+    audit_with_resource_graph,
+    is_resource_graph_enabled,
+)
+from azure_finops_mcp_server.helpers.retry_handler import reset_retry_handler
+
+RG = "/subscriptions/sub-1/resourceGroups/{group}/providers/{provider}/{name}"
+
+
+class TestResourceGraphQuery:
+    """Test paging through Resource Graph queries."""
+
+    def setup_method(self):
+        """Start each test with a fresh retry handler."""
+        reset_retry_handler()
+
+    def teardown_method(self):
+        """Clean up after tests."""
+        reset_retry_handler()
+
+    @patch.object(resource_graph, "QueryRequestOptions", create=True)
+    @patch.object(resource_graph, "QueryRequest", create=True)
+    @patch.object(resource_graph, "ResourceGraphClient", create=True)
+    def test_arg_query_follows_skip_tokens(self, mock_client_cls, mock_request, mock_options):
+        """Test that every page is fetched by passing the previous page's skip token."""
+        mock_client_cls.return_value.resources.side_effect = [
+            Mock(data=[{"name": "a"}, {"name": "b"}], skip_token="page-2"),
+            Mock(data=[{"name": "c"}], skip_token=None),
+        ]
+
+        rows = list(_arg_query(Mock(), ["sub-1", "sub-2"], "Resources"))
+
+        assert [row["name"] for row in rows] == ["a", "b", "c"]
+        assert [call.kwargs["skip_token"] for call in mock_options.call_args_list] == [None, "page-2"]
+        mock_request.assert_called_with(subscriptions=["sub-1", "sub-2"], query="Resources", options=mock_options())
+
+    def test_region_filter_quotes_regions(self):
+        """Test that regions become a quoted KQL list and no regions mean no filter."""
+        assert _region_filter(None) == ""
+        assert _region_filter(["eastus", "west'us"]) == " | where location in ('eastus', 'west\\'us')"
+
+
+class TestResourceGraphAudit:
+    """Test building audit results from Resource Graph rows."""
+
+    def setup_method(self):
+        """Start each test from a fresh global configuration."""
+        reset_config()
+
+    def teardown_method(self):
+        """Clean up after tests."""
+        reset_config()
+
+    @patch("azure_finops_mcp_server.helpers.resource_graph._arg_query")
+    def test_audit_matches_sdk_result_shapes(self, mock_query):
+        """Test that rows are grouped per subscription in the SDK auditors' result shapes."""
+        vm_id = RG.format(group="vm-rg", provider="Microsoft.Compute", name="virtualMachines/vm1")
+        pvc_id = RG.format(group="MC_cluster", provider="Microsoft.Compute", name="disks/pvc-1")
+        disk_id = RG.format(group="disk-rg", provider="Microsoft.Compute", name="disks/disk1")
+        ip_id = RG.format(group="ip-rg", provider="Microsoft.Network", name="publicIPAddresses/ip1")
+        results = {
+            "virtualmachines": [
+                {"subscriptionId": "SUB-1", "id": vm_id, "name": "vm1", "location": "eastus",
+                 "vmSize": "Standard_B1s", "powerState": "PowerState/deallocated"},
+                {"subscriptionId": "sub-1", "id": vm_id, "name": "vm2", "location": "eastus",
+                 "vmSize": "Standard_B1s", "powerState": "PowerState/running"},
+                {"subscriptionId": "sub-1", "id": vm_id, "name": "vm3", "location": "eastus",
+                 "vmSize": "Standard_B1s", "powerState": "PowerState/stopped"},
+            ],
+            "disks": [
+                {"subscriptionId": "sub-1", "id": pvc_id, "name": "pvc-1", "location": "eastus",
+                 "sku": "Premium_LRS", "sizeGb": 8},
+                {"subscriptionId": "sub-1", "id": disk_id, "name": "disk1", "location": "eastus",
+                 "sku": "Standard_LRS", "sizeGb": 100},
+            ],
+            "publicipaddresses": [
+                {"subscriptionId": "sub-1", "id": ip_id, "name": "ip1", "location": "eastus",
+                 "ipAddress": "", "sku": "Standard", "allocationMethod": "Static"},
+            ],
+        }  # fmt: skip
+        mock_query.side_effect = lambda credential, subscription_ids, kql: iter(
+            next(rows for resource_type, rows in results.items() if f"/{resource_type}'" in kql)
+        )
+
+        audits = audit_with_resource_graph(Mock(), ["sub-1", "sub-2"], regions=["eastus"])
+
+        (vms, vm_errors), (disks, disk_errors), (ips, ip_errors) = audits["sub-1"]
+        assert vm_errors == disk_errors == ip_errors == {}
+        assert [vm["name"] for vm in vms["stopped_vms"]] == ["vm1", "vm3"]
+        assert vms["stopped_vms"][0]["resource_group"] == "vm-rg"
+        assert vms["statistics"]["total_vms_checked"] == 3
+        assert [disk["name"] for disk in disks["unattached_disks"]] == ["disk1"]
+        assert [disk["name"] for disk in disks["categories"]["pvc"]] == ["pvc-1"]
+        assert disks["statistics"]["total_unattached"] == 2
+        assert ips["unassociated_ips"][0]["ip_address"] == "Not Assigned"
+        assert ips["unassociated_ips"][0]["monthly_cost"] == 4.38
+
+        (vms, _), (disks, _), (ips, _) = audits["sub-2"]
+        assert vms["stopped_vms"] == [] and vms["statistics"]["total_vms_checked"] == 0
+        assert disks["statistics"]["total_unattached"] == 0
+        assert ips == {"unassociated_ips": []}
+        assert all(" | where location in ('eastus')" in call.args[2] for call in mock_query.call_args_list)
+        # Rows are grouped into per-subscription runs, so every query orders by subscription
+        assert all(call.args[2].endswith(" | order by subscriptionId asc") for call in mock_query.call_args_list)
+
+    @patch("azure_finops_mcp_server.helpers.resource_graph._arg_query")
+    def test_audit_merges_interleaved_subscription_rows(self, mock_query):
+        """Test that rows of one subscription split across several runs land in the same results."""
+        vm_id = RG.format(group="vm-rg", provider="Microsoft.Compute", name="virtualMachines/vm")
+        vms = [
+            {"subscriptionId": sub_id, "id": vm_id, "name": name, "location": "eastus", "powerState": power_state}
+            for sub_id, name, power_state in (
+                ("sub-1", "vm1", "PowerState/deallocated"),
+                ("sub-2", "vm2", "PowerState/deallocated"),
+                ("sub-1", "vm3", "PowerState/running"),
+                ("sub-1", "vm4", "PowerState/deallocated"),
+            )
+        ]
+        mock_query.side_effect = lambda credential, subscription_ids, kql: iter(
+            vms if "/virtualmachines'" in kql else []
+        )
+
+        audits = audit_with_resource_graph(Mock(), ["sub-1", "sub-2"])
+
+        (sub1_vms, _), _, _ = audits["sub-1"]
+        (sub2_vms, _), _, _ = audits["sub-2"]
+        assert [vm["name"] for vm in sub1_vms["stopped_vms"]] == ["vm1", "vm4"]
+        assert sub1_vms["statistics"]["total_vms_checked"] == 3
+        assert [vm["name"] for vm in sub2_vms["stopped_vms"]] == ["vm2"]
+        assert sub2_vms["statistics"]["total_vms_checked"] == 1
+
+    def test_enabled_requires_sdk_and_config(self):
+        """Test that Resource Graph is only used when installed and enabled."""
+        with patch.object(resource_graph, "ResourceGraphClient", Mock()):
+            assert is_resource_graph_enabled()
+            set_config(AzureFinOpsConfig(subscription_id="sub-1", use_resource_graph=False))
+            assert not is_resource_graph_enabled()
+
+        reset_config()
+        with patch.object(resource_graph, "ResourceGraphClient", None):
+            assert not is_resource_graph_enabled()
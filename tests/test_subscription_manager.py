@@ -0,0 +1,302 @@
+"""Unit tests for subscription management utilities."""
+
+import json
+import os
+import subprocess
+from unittest.mock import Mock, patch
+
+import pytest
+from azure.core.credentials import AccessToken
+from azure.core.exceptions import ClientAuthenticationError
+from azure.identity import CredentialUnavailableError
+
+from azure_finops_mcp_server.config import AzureFinOpsConfig, reset_config, set_config
+from azure_finops_mcp_server.helpers.subscription_manager import (
+    CachingCredential,
+    _list_azure_subscriptions,
+    get_azure_subscriptions,
+    get_credential,
+    profiles_to_use,
+    reset_credential,
+    reset_subscriptions,
+)
+
+
+class TestCredentialCache:
+    """Test credential caching."""
+
+    def setup_method(self):
+        """Start each test without a cached credential."""
+        reset_credential()
+
+    def teardown_method(self):
+        """Clean up after tests."""
+        reset_credential()
+
+    @patch("azure_finops_mcp_server.helpers.subscription_manager.AzureCliCredential")
+    def test_credential_is_reused(self, mock_cli_credential):
+        """Test that the token probe runs once while the cache is fresh."""
+        credential1 = get_credential()
+        credential2 = get_credential()
+
+        assert credential1 is credential2
+        mock_cli_credential.assert_called_once()
+        mock_cli_credential.return_value.get_token.assert_called_once()
+
+    @patch("azure_finops_mcp_server.helpers.subscription_manager.time.monotonic")
+    @patch("azure_finops_mcp_server.helpers.subscription_manager.AzureCliCredential")
+    def test_credential_expires(self, mock_cli_credential, mock_monotonic):
+        """Test that the credential is rebuilt after the TTL."""
+        mock_cli_credential.side_effect = [Mock(), Mock()]
+
+        mock_monotonic.return_value = 1000
+        credential1 = get_credential()
+
+        mock_monotonic.return_value = 1000 + 10_000
+        credential2 = get_credential()
+
+        assert credential1 is not credential2
+        assert mock_cli_credential.call_count == 2
+
+    @patch("azure_finops_mcp_server.helpers.subscription_manager.DefaultAzureCredential")
+    @patch("azure_finops_mcp_server.helpers.subscription_manager.AzureCliCredential")
+    def test_falls_back_to_default_credential(self, mock_cli_credential, mock_default_credential):
+        """Test fallback when the Azure CLI credential cannot get a token."""
+        mock_cli_credential.return_value.get_token.side_effect = CredentialUnavailableError("az not logged in")
+
+        credential = get_credential()
+
+        assert credential.inner is mock_default_credential.return_value
+        assert get_credential() is credential
+        mock_default_credential.assert_called_once()
+
+    @patch("azure_finops_mcp_server.helpers.subscription_manager.DefaultAzureCredential")
+    @patch("azure_finops_mcp_server.helpers.subscription_manager.AzureCliCredential")
+    def test_authentication_errors_are_not_masked(self, mock_cli_credential, mock_default_credential):
+        """Test that a CLI that runs but rejects the login raises instead of silently falling back."""
+        mock_cli_credential.return_value.get_token.side_effect = ClientAuthenticationError("AADSTS70043")
+
+        with pytest.raises(ClientAuthenticationError):
+            get_credential()
+
+        mock_default_credential.assert_not_called()
+        mock_cli_credential.return_value.get_token.side_effect = None
+        assert get_credential().inner is mock_cli_credential.return_value
+
+
+class TestCachingCredential:
+    """Test reusing tokens across calls."""
+
+    @patch("azure_finops_mcp_server.helpers.subscription_manager.time.time")
+    def test_tokens_are_reused_until_near_expiry(self, mock_time):
+        """Test that a token is fetched once per scope and refreshed shortly before it expires."""
+        inner = Mock()
+        inner.get_token.side_effect = lambda *scopes, **kwargs: AccessToken(f"token-{inner.get_token.call_count}", 4600)
+        credential = CachingCredential(inner)
+
+        mock_time.return_value = 1000
+        assert credential.get_token("scope-a").token == "token-1"
+        assert credential.get_token("scope-a").token == "token-1"
+        assert credential.get_token("scope-b").token == "token-2"
+
+        mock_time.return_value = 4400  # within the refresh margin of the expiry
+        assert credential.get_token("scope-a").token == "token-3"
+        assert inner.get_token.call_count == 3
+
+    def test_claims_challenges_bypass_the_cache(self):
+        """Test that requests with claims always go to the wrapped credential."""
+        inner = Mock()
+        inner.get_token.return_value = AccessToken("token", 2**40)
+        credential = CachingCredential(inner)
+
+        credential.get_token("scope-a")
+        credential.get_token("scope-a", claims='{"access_token": {}}')
+        credential.get_token("scope-a", claims='{"access_token": {}}')
+
+        assert inner.get_token.call_count == 3
+
+
+class TestSubscriptionCache:
+    """Test caching of the Azure CLI subscription list."""
+
+    @pytest.fixture(autouse=True)
+    def cache_file(self, tmp_path):
+        """Point the subscription cache at a temporary file and start without a cached list."""
+        cache_file = tmp_path / "subscriptions.json"
+        set_config(AzureFinOpsConfig(subscription_id="sub-1", subscription_cache_file=str(cache_file)))
+        reset_subscriptions()
+        # Exercise the CLI path; the SDK path is covered separately
+        with patch("azure_finops_mcp_server.helpers.subscription_manager.SubscriptionClient", None):
+            yield cache_file
+        reset_subscriptions()
+        reset_config()
+
+    @patch("azure_finops_mcp_server.helpers.subscription_manager.time.monotonic")
+    @patch("azure_finops_mcp_server.helpers.subscription_manager.subprocess.run")
+    def test_subscriptions_are_cached_until_expiry(self, mock_run, mock_monotonic, cache_file):
+        """Test that `az account list` runs once per TTL."""
+        mock_run.return_value = Mock(stdout='[{"id": "sub-1", "name": "Dev"}]')
+
+        mock_monotonic.return_value = 1000
+        first = get_azure_subscriptions()
+        second = get_azure_subscriptions()
+
+        assert first == second == [{"id": "sub-1", "name": "Dev"}]
+        assert mock_run.call_count == 1
+
+        # Expire both the in-memory copy and the cache file
+        mock_monotonic.return_value = 1000 + 10_000
+        os.utime(cache_file, (0, 0))
+        get_azure_subscriptions()
+        assert mock_run.call_count == 2
+
+    @patch("azure_finops_mcp_server.helpers.subscription_manager.subprocess.run")
+    def test_failures_are_not_cached(self, mock_run, cache_file):
+        """Test that a failed lookup is retried on the next call."""
+        mock_run.side_effect = [
+            subprocess.CalledProcessError(1, ["az"]),
+            Mock(stdout='[{"id": "sub-1", "name": "Dev"}]'),
+        ]
+
+        assert get_azure_subscriptions() == []
+        assert not cache_file.exists()
+        assert get_azure_subscriptions() == [{"id": "sub-1", "name": "Dev"}]
+
+    @patch("azure_finops_mcp_server.helpers.subscription_manager.subprocess.run")
+    def test_cache_file_outlives_the_process(self, mock_run, cache_file):
+        """Test that a fresh process reads the cache file instead of running the CLI."""
+        mock_run.return_value = Mock(stdout='[{"id": "sub-1", "name": "Dev"}]')
+        get_azure_subscriptions()
+
+        reset_subscriptions()  # as if the server restarted
+
+        assert get_azure_subscriptions() == [{"id": "sub-1", "name": "Dev"}]
+        assert json.loads(cache_file.read_text()) == [{"id": "sub-1", "name": "Dev"}]
+        assert mock_run.call_count == 1
+
+    @patch("azure_finops_mcp_server.helpers.subscription_manager.subprocess.run")
+    def test_clear_cache_queries_the_cli(self, mock_run, cache_file):
+        """Test that clear_cache discards both cache layers."""
+        mock_run.side_effect = [
+            Mock(stdout='[{"id": "sub-1", "name": "Dev"}]'),
+            Mock(stdout='[{"id": "sub-2", "name": "Prod"}]'),
+        ]
+        get_azure_subscriptions()
+
+        assert get_azure_subscriptions(clear_cache=True) == [{"id": "sub-2", "name": "Prod"}]
+        assert json.loads(cache_file.read_text()) == [{"id": "sub-2", "name": "Prod"}]
+
+    @patch("azure_finops_mcp_server.helpers.subscription_manager.subprocess.run")
+    def test_zero_ttl_disables_caching(self, mock_run, cache_file):
+        """Test that a TTL of 0 always queries the CLI and writes no file."""
+        set_config(
+            AzureFinOpsConfig(
+                subscription_id="sub-1", subscription_cache_file=str(cache_file), subscription_cache_ttl_seconds=0
+            )
+        )
+        mock_run.return_value = Mock(stdout='[{"id": "sub-1", "name": "Dev"}]')
+
+        get_azure_subscriptions()
+        get_azure_subscriptions()
+
+        assert mock_run.call_count == 2
+        assert not cache_file.exists()
+
+
+class TestSubscriptionListing:
+    """Test where the subscription list comes from."""
+
+    @patch("azure_finops_mcp_server.helpers.subscription_manager.subprocess.run")
+    @patch("azure_finops_mcp_server.helpers.subscription_manager.get_credential")
+    @patch("azure_finops_mcp_server.helpers.subscription_manager.SubscriptionClient")
+    def test_sdk_listing_avoids_the_cli(self, mock_client, mock_credential, mock_run):
+        """Test that the SDK client is used in-process, in the CLI's result shape."""
+        subscription = Mock(subscription_id="sub-1", display_name="Dev", state="Enabled", tenant_id="tenant-1")
+        mock_client.return_value.subscriptions.list.return_value = [subscription]
+
+        assert _list_azure_subscriptions() == [
+            {"id": "sub-1", "name": "Dev", "state": "Enabled", "tenantId": "tenant-1"}
+        ]
+        mock_client.assert_called_once_with(mock_credential.return_value)
+        mock_run.assert_not_called()
+
+    @patch("azure_finops_mcp_server.helpers.subscription_manager.subprocess.run")
+    @patch("azure_finops_mcp_server.helpers.subscription_manager.get_credential")
+    @patch("azure_finops_mcp_server.helpers.subscription_manager.SubscriptionClient")
+    def test_sdk_failure_falls_back_to_cli(self, mock_client, mock_credential, mock_run):
+        """Test that the CLI is still used when the SDK call fails."""
+        mock_client.return_value.subscriptions.list.side_effect = RuntimeError("no credential")
+        mock_run.return_value = Mock(stdout='[{"id": "sub-1", "name": "Dev", "isDefault": true}]')
+
+        assert _list_azure_subscriptions() == [{"id": "sub-1", "name": "Dev", "isDefault": True}]
+
+
+class TestProfilesToUse:
+    """Test subscription selection."""
+
+    def setup_method(self):
+        """Start each test without a cached current subscription."""
+        reset_subscriptions()
+
+    def teardown_method(self):
+        """Clean up after tests."""
+        reset_subscriptions()
+
+    @patch("azure_finops_mcp_server.helpers.subscription_manager.subprocess.run")
+    @patch("azure_finops_mcp_server.helpers.subscription_manager.get_azure_subscriptions")
+    def test_current_subscription_from_list(self, mock_list, mock_run):
+        """Test that the default subscription is taken from the list without a second CLI call."""
+        mock_list.return_value = [
+            {"id": "sub-1", "name": "Dev", "isDefault": False},
+            {"id": "sub-2", "name": "Prod", "isDefault": True},
+        ]
+
+        subscriptions, errors = profiles_to_use()
+
+        assert dict(subscriptions) == {"sub-2": ["Prod"]}
+        assert errors == {}
+        mock_run.assert_not_called()
+
+    @patch("azure_finops_mcp_server.helpers.subscription_manager.subprocess.run")
+    @patch("azure_finops_mcp_server.helpers.subscription_manager.get_azure_subscriptions")
+    def test_current_subscription_falls_back_to_show(self, mock_list, mock_run):
+        """Test that `az account show` is used when no subscription is flagged as default."""
+        mock_list.return_value = [{"id": "sub-1", "name": "Dev"}]
+        mock_run.return_value = Mock(stdout='{"id": "sub-1", "name": "Dev"}')
+
+        subscriptions, errors = profiles_to_use()
+
+        assert dict(subscriptions) == {"sub-1": ["Dev"]}
+        mock_run.assert_called_once()
+
+    @patch("azure_finops_mcp_server.helpers.subscription_manager.subprocess.run")
+    @patch("azure_finops_mcp_server.helpers.subscription_manager.get_azure_subscriptions")
+    def test_current_subscription_is_cached(self, mock_list, mock_run):
+        """Test that `az account show` runs once until the subscriptions are reset, and failures are not cached."""
+        mock_list.return_value = [{"id": "sub-1", "name": "Dev"}]
+        mock_run.side_effect = [
+            subprocess.CalledProcessError(1, ["az"]),
+            Mock(stdout='{"id": "sub-1", "name": "Dev"}'),
+            Mock(stdout='{"id": "sub-2", "name": "Prod"}'),
+        ]
+
+        assert "current" in profiles_to_use()[1]
+        assert dict(profiles_to_use()[0]) == {"sub-1": ["Dev"]}
+        assert dict(profiles_to_use()[0]) == {"sub-1": ["Dev"]}
+        assert mock_run.call_count == 2
+
+        reset_subscriptions()
+        assert dict(profiles_to_use()[0]) == {"sub-2": ["Prod"]}
+
+    @patch("azure_finops_mcp_server.helpers.subscription_manager.get_azure_subscriptions")
+    def test_profiles_match_by_name_or_id(self, mock_list):
+        """Test that profiles resolve by name or ID, with names taking precedence."""
+        mock_list.return_value = [
+            {"id": "sub-1", "name": "Dev"},
+            {"id": "sub-2", "name": "sub-1"},
+        ]
+
+        subscriptions, errors = profiles_to_use(["Dev", "sub-2", "sub-1", "missing"])
+
+        assert dict(subscriptions) == {"sub-1": ["Dev"], "sub-2": ["sub-1", "sub-1"]}
+        assert errors == {"missing": "Subscription 'missing' not found"}